@@ -0,0 +1,138 @@
+import hashlib, json, os, shutil, tempfile
+import numpy as np
+from .generator import generate_tasks, iter_task_chunks_np
+from .taskio import ColumnarTaskWriter, task_columns
+
+# Content-addressed start-up cache (config cache_dir): generated workloads as columnar task
+# directories keyed by the generator parameters, parsed topologies as adjacency arrays keyed
+# by the topology file's bytes. Entries are written to a temp name and renamed into place,
+# so concurrent runs (sweep workers, shards, CI jobs) can share one cache directory.
+
+# config keys the generated workload is built from; runs that agree on them share one task file.
+# (task_chunk_size only sets the generator's memory use; the python generator ignores task_seed.)
+WORKLOAD_KEYS = ["generator", "task_seed", "num_tasks", "num_devices", "simulation_horizon_s",
+                 "mean_task_size_kb", "std_task_size_kb"]
+# bump when the generators or the cached layouts change, so old entries are not reused
+CACHE_VERSION = 3
+
+
+def workload_key(config):
+    key = {k: config.get(k) for k in WORKLOAD_KEYS}
+    key["generator"] = config.get("generator", "python")
+    if key["generator"] == "python":
+        del key["task_seed"]
+    return json.dumps(key, sort_keys=True)
+
+
+def content_hash(*parts):
+    h = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for p in parts:
+        h.update(p if isinstance(p, bytes) else str(p).encode())
+    return h.hexdigest()[:20]
+
+
+def build_workload(config, path):
+    """Generate config's workload once into a memory-mappable columnar directory."""
+    writer = ColumnarTaskWriter(path, meta={"workload": json.loads(workload_key(config))})
+    if config.get("generator", "python") == "numpy":
+        for chunk in iter_task_chunks_np(config, chunk_size=config.get("task_chunk_size", 100000)):
+            writer.write(chunk)
+    else:
+        writer.write(task_columns(generate_tasks(dict(config, generator="python"), out_path=None)))
+    writer.close()
+    return path
+
+
+def _publish(tmp, path):
+    # another process may have published the same entry first; both are identical
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        if not os.path.exists(path):
+            raise
+        if os.path.isdir(tmp):
+            shutil.rmtree(tmp, ignore_errors=True)
+        else:
+            os.remove(tmp)
+    return path
+
+
+def workload_path(config, cache_dir=None):
+    """Cache directory config's workload is stored under (whether or not it exists yet)."""
+    return os.path.join(cache_dir or config["cache_dir"], "workload_" + content_hash(workload_key(config)))
+
+
+def cached_workload(config, cache_dir=None):
+    """Columnar workload directory for config under cache_dir, generated on the first request only."""
+    cache_dir = cache_dir or config["cache_dir"]
+    path = workload_path(config, cache_dir)
+    if os.path.exists(os.path.join(path, "meta.json")):
+        return path
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".workload_", dir=cache_dir)
+    try:
+        build_workload(config, tmp)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return _publish(tmp, path)
+
+
+def topology_arrays(topo):
+    """
+    Node-link dict -> arrays: node_id, link_u / link_v (in file order), node_attrs (JSON of
+    the non-id node attributes) and a CSR adjacency with one row per node_id entry,
+    indptr / nbr / nbr_link (neighbour node and link index), each row in link file order.
+    """
+    nodes = topo.get("nodes", [])
+    node_id = np.array([int(n["id"]) for n in nodes], dtype=np.int64)
+    attrs = {int(n["id"]): {k: v for k, v in n.items() if k != "id"} for n in nodes}
+    links = topo.get("links", [])
+    u = np.array([int(l["source"]) for l in links], dtype=np.int64)
+    v = np.array([int(l["target"]) for l in links], dtype=np.int64)
+    # each link once from each end (u -> v, then v -> u), grouped by node row, file order kept within a node
+    src = np.column_stack([u, v]).ravel()
+    dst = np.column_stack([v, u]).ravel()
+    link_of = np.repeat(np.arange(len(u)), 2)
+    sorter = np.argsort(node_id, kind="stable")
+    row = sorter[np.minimum(np.searchsorted(node_id, src, sorter=sorter), max(len(node_id) - 1, 0))] if len(src) else src
+    if len(src) and not np.array_equal(node_id[row], src):
+        raise ValueError("topology links reference nodes missing from its node list")
+    order = np.argsort(row, kind="stable")
+    indptr = np.zeros(len(node_id) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row, minlength=len(node_id)), out=indptr[1:])
+    return {
+        "node_id": node_id,
+        "node_attrs": np.array(json.dumps({str(k): a for k, a in attrs.items() if a}, sort_keys=True)),
+        "link_u": u,
+        "link_v": v,
+        "indptr": indptr,
+        "nbr": dst[order],
+        "nbr_link": link_of[order],
+    }
+
+
+def cached_topology(topology_path, cache_dir):
+    """Adjacency arrays (see topology_arrays) of a topology file, cached by the file's contents."""
+    with open(topology_path, "rb") as f:
+        raw = f.read()
+    path = os.path.join(cache_dir, "topology_" + content_hash(raw) + ".npz")
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".topology_", suffix=".npz", dir=cache_dir)
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **topology_arrays(json.loads(raw)))
+        _publish(tmp, path)
+    with np.load(path) as z:
+        return {k: z[k] for k in z.files}
+
+
+def read_topology(config):
+    """config's topology_path as cached arrays (with cache_dir) or a parsed node-link dict; None if unset."""
+    path = config.get("topology_path")
+    if not isinstance(path, str):
+        return path
+    if config.get("cache_dir"):
+        return cached_topology(path, config["cache_dir"])
+    with open(path, "r") as f:
+        return json.load(f)
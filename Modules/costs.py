@@ -0,0 +1,79 @@
+import itertools
+import numpy as np
+from .maths import processing_ticks, processing_ticks_np
+from .utils import RESOLUTION
+
+# Per-task cost columns, computed with NumPy for a block of arrivals at a time and stored
+# on the task dicts, so decide() and the event handlers look them up instead of redoing
+# the arithmetic per task. Route-dependent costs use Route.tx_s_per_bit (network.py).
+COST_COLUMNS = ["size_bits", "cycles", "local_ticks", "local_ms", "local_norm", "local_energy_j",
+                "fog_ticks", "fog_ms", "cloud_ticks", "cloud_ms"]
+
+
+class CostModel:
+    """
+    Cost columns of tasks from their size_kb / deadline_ms:
+    size_bits, cycles, processing ticks and ms on the device / fog / cloud CPUs (same
+    rounding as maths.processing_ticks), local_norm = local_ms / deadline_ms (inf for
+    deadline <= 0) and local_energy_j. cloud_* are None without cloud_spillover.
+    """
+    def __init__(self, config, block_size=4096):
+        self.cycles_per_byte = config["cycles_per_byte"]
+        self.energy_per_cycle = config["energy_per_cycle"]
+        self.cpu_hz = {"local": config["device_cpu_hz"], "fog": config["fog_cpu_hz"]}
+        if config.get("cloud_spillover", False):
+            self.cpu_hz["cloud"] = config["cloud_cpu_hz"]
+        self.block_size = block_size
+
+    def columns(self, size_kb, deadline_ms):
+        """dict column -> array for arrays of task sizes and deadlines."""
+        size_kb = np.asarray(size_kb, dtype=np.float64)
+        deadline_ms = np.asarray(deadline_ms, dtype=np.float64)
+        n = len(size_kb)
+        cycles = size_kb * 1024.0 * self.cycles_per_byte
+        out = {"size_bits": size_kb * 1024.0 * 8.0, "cycles": cycles, "local_energy_j": cycles * self.energy_per_cycle}
+        for tier in ("local", "fog", "cloud"):
+            if tier in self.cpu_hz:
+                ticks, _ = processing_ticks_np(size_kb, self.cpu_hz[tier], self.cycles_per_byte)
+                out[tier + "_ticks"] = ticks
+                out[tier + "_ms"] = ticks * RESOLUTION * 1000.0
+            else:
+                out[tier + "_ticks"] = out[tier + "_ms"] = np.full(n, None, dtype=object)
+        positive = deadline_ms > 0
+        out["local_norm"] = np.where(positive, out["local_ms"] / np.where(positive, deadline_ms, 1.0), np.inf)
+        return out
+
+    def annotate(self, tasks):
+        """Add the cost columns to a list of task dicts in place; returns tasks."""
+        n = len(tasks)
+        if n == 0:
+            return tasks
+        cols = self.columns(np.fromiter((t["size_kb"] for t in tasks), dtype=np.float64, count=n),
+                            np.fromiter((t["deadline_ms"] for t in tasks), dtype=np.float64, count=n))
+        for task, values in zip(tasks, zip(*(cols[c].tolist() for c in COST_COLUMNS))):
+            task.update(zip(COST_COLUMNS, values))
+        return tasks
+
+    def annotate_one(self, task):
+        """annotate() for a single task in plain Python (same values; NumPy set-up would cost more)."""
+        size_kb = task["size_kb"]
+        cycles = size_kb * 1024.0 * self.cycles_per_byte
+        task.update(size_bits=size_kb * 1024.0 * 8.0, cycles=cycles, local_energy_j=cycles * self.energy_per_cycle)
+        for tier in ("local", "fog", "cloud"):
+            if tier in self.cpu_hz:
+                ticks, _ = processing_ticks(size_kb, self.cpu_hz[tier], self.cycles_per_byte)
+                task[tier + "_ticks"] = ticks
+                task[tier + "_ms"] = ticks * RESOLUTION * 1000.0
+            else:
+                task[tier + "_ticks"] = task[tier + "_ms"] = None
+        task["local_norm"] = task["local_ms"] / task["deadline_ms"] if task["deadline_ms"] > 0 else float("inf")
+        return task
+
+    def stream(self, tasks):
+        """Iterator over tasks, annotated block_size tasks at a time (order kept, stays lazy)."""
+        tasks = iter(tasks)
+        while True:
+            block = list(itertools.islice(tasks, self.block_size))
+            if not block:
+                return
+            yield from self.annotate(block)
@@ -0,0 +1,435 @@
+import os, math, heapq, itertools, logging, pickle, yaml
+from .generator import generate_tasks
+from .taskio import iter_tasks
+from .cache import cached_workload, read_topology
+from .scheduler import Scheduler
+from .sdn_controller import SDNController, DeviceWeights
+from .costs import CostModel
+from .network import Network
+from .metrics import summarize, save_logs_and_metrics
+from .online_metrics import OnlineMetrics
+from .tasklog import TaskLog
+from .weight_history import WeightHistory
+from .profiling import Profiler, profiled
+from .simlog import get_logger
+from .utils import to_ticks, RESOLUTION
+
+log = get_logger("engine")
+
+FLOAT_KEYS = ["device_cpu_hz", "fog_cpu_hz", "cloud_cpu_hz", "cycles_per_byte", "p_tx", "energy_per_cycle",
+              "default_link_bw_bps", "device_access_bw_bytes_per_s", "cloud_bw_bps", "cloud_rtt_s"]
+
+def load_config(path="config.yml", overrides=None):
+    with open(path, "r", encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    return with_overrides(config, overrides)
+
+def with_overrides(config, overrides=None):
+    """Copy of config with top-level overrides applied and numeric keys coerced to float."""
+    config = dict(config, **(overrides or {}))
+    for k in FLOAT_KEYS:
+        if k in config:
+            config[k] = float(config[k])
+    return config
+
+def task_stream(config):
+    """
+    Generate the workload for config and return an iterator over its (time-sorted) tasks.
+    With cache_dir set the workload is streamed from the cached columnar copy instead
+    (generated there on the first run; tasks_path is then not written).
+    """
+    if config.get("cache_dir"):
+        return iter_tasks(cached_workload(config), "columnar")
+    tasks_path = config.get("tasks_path", "Data/generated/tasks.json")
+    tasks = generate_tasks(config, out_path=tasks_path)
+    if config.get("generator", "python") == "numpy":
+        # stream arrivals back from disk instead of holding the whole workload
+        tasks = iter_tasks(tasks_path, config.get("task_format", "jsonl"))
+    return iter(tasks)
+
+
+def build_network(config, topology=None):
+    """
+    Network from config; topology may be a parsed node-link dict or cached arrays
+    (defaults to config topology_path, through the cache when cache_dir is set).
+    """
+    if topology is None:
+        topology = read_topology(config) if config.get("cache_dir") else config.get("topology_path")
+    return Network(topology_path=topology,
+                   default_link_bw_bps=config.get("default_link_bw_bps"),
+                   device_access_bw_bytes_per_s=config.get("device_access_bw_bytes_per_s"),
+                   default_rtt_s=config.get("default_rtt_s"),
+                   route_cache_size=config.get("route_cache_size", 65536),
+                   compact=config.get("network_compact", False))
+
+
+class Simulator:
+    """
+    Discrete-event offloading simulation.
+    Owns the event queue and clock, device busy state, per-server fog worker pools and the
+    cloud pool, network, scheduler, controller and logs. The clock, heap keys, busy-until
+    times and worker pools are integer ticks of RESOLUTION (self.tick); self.now is the same
+    time in seconds for the scheduler, reservations and logs. Arrivals are pulled lazily
+    from the time-sorted task stream, with their costs.CostModel columns added block by
+    block; the heap only holds future internal events (schedule()). run() returns the
+    summary metrics.
+    With config profile: true (or a Profiler passed in) per-phase timers are collected
+    and save() also writes profile.csv.
+    """
+    def __init__(self, config, tasks=None, network=None, profiler=None):
+        self.config = config
+        self.debug = log.isEnabledFor(logging.DEBUG)
+        n_dev = config["num_devices"]
+
+        self.network = network if network is not None else build_network(config)
+        self.network.attach_devices(n_dev)
+        if config.get("util_bucket_s") and self.network.utilization is None:
+            self.network.enable_utilization(config["util_bucket_s"], config.get("util_max_buckets", 4096),
+                                            horizon_s=config.get("simulation_horizon_s"))
+        self.device_weights = DeviceWeights(n_dev, config["initial_weights"])
+        self.scheduler = Scheduler(self.device_weights, config, self.network)
+        self.controller = SDNController(self.device_weights, config)
+
+        self.device_busy_until = {f"dev_{i}": 0 for i in range(n_dev)}
+        # worker pools are min-heaps of worker free ticks: heap[0] is the next free worker
+        self.fog_pools = {s: [0] * config["fog_workers"] for s in self.scheduler.server_nodes}
+        self.cloud_pool = [0] * config.get("cloud_workers", 0) if config.get("cloud_spillover", False) else []
+
+        self.task_log = TaskLog(flush_path=config.get("task_log_flush_path"))
+        self.flush_rows = config.get("task_log_flush_rows", 1000000)
+        self.round_start = 0     # task_log index where the current controller round begins
+        self.weight_history = WeightHistory(self.device_weights, snapshot_every=config.get("weight_snapshot_every", 0))
+        self.online = OnlineMetrics(config)
+
+        self.costs = CostModel(config)
+        self.arrivals = self.costs.stream(tasks if tasks is not None else task_stream(config))
+        self.next_task = next(self.arrivals, None)
+        self.arrivals_pulled = int(self.next_task is not None)   # stream position, for resume
+        self.next_tick = to_ticks(self.next_task["creation_time_s"]) if self.next_task is not None else None
+        self.events = []
+        self.counter = 0
+        self.tick = 0
+        self.now = 0.0
+        self.events_processed = 0
+        self.batch_arrivals = config.get("batch_arrivals", False)
+        self.handlers = {"arrival": self.on_arrival}
+
+        self.checkpoint_path = config.get("checkpoint_path")
+        self.checkpoint_every_s = config.get("checkpoint_every_s") or 0
+        self.checkpoint_every_events = config.get("checkpoint_every_events") or 0
+        self._next_checkpoint_s = self.checkpoint_every_s
+        self._next_checkpoint_events = self.checkpoint_every_events
+
+        if profiler is None and config.get("profile", False):
+            profiler = Profiler()
+        self.profiler = profiler.attach(self) if profiler is not None else None
+
+    # ---- event queue ----
+    def schedule(self, tick, ev_type, payload):
+        heapq.heappush(self.events, (tick, ev_type, self.counter, payload))
+        self.counter += 1
+
+    def _arrival_due(self, tick=None):
+        """True if the next stream arrival comes before the heap top (and at tick, if given)."""
+        t = self.next_tick
+        if t is None or (tick is not None and t != tick):
+            return False
+        return not self.events or (t, "arrival", self.counter) < self.events[0][:3]
+
+    def _take_arrival(self):
+        nt = self.next_task
+        self.counter += 1
+        self.next_task = next(self.arrivals, None)
+        if self.next_task is None:
+            self.next_tick = None
+            return nt
+        self.arrivals_pulled += 1
+        if self.next_task["creation_time_s"] < nt["creation_time_s"]:
+            raise ValueError(f"task stream not sorted by creation_time_s at {self.next_task['task_id']}")
+        self.next_tick = to_ticks(self.next_task["creation_time_s"])
+        return nt
+
+    def pop_event(self):
+        """Next (tick, ev_type, payload) from the arrival stream or the heap, or None when done."""
+        if self._arrival_due():
+            tick = self.next_tick
+            return tick, "arrival", self._take_arrival()
+        if self.events:
+            tick, ev_type, _, payload = heapq.heappop(self.events)
+            return tick, ev_type, payload
+        return None
+
+    def run(self, until=None):
+        """
+        Process events (up to simulated time `until` if given) and return summary metrics.
+        config profile_cprofile (path) / profile_tracemalloc wrap the run in cProfile / tracemalloc.
+        """
+        with profiled(self.profiler, cprofile_path=self.config.get("profile_cprofile"),
+                      trace_memory=self.config.get("profile_tracemalloc", False)):
+            self._loop(None if until is None else math.floor(until / RESOLUTION + 1e-9))
+        if self.profiler is not None:
+            self.profiler.counters["events"] = self.events_processed
+        return self.metrics()
+
+    def _loop(self, until_tick):
+        while True:
+            if until_tick is not None:
+                t = self.peek_tick()
+                if t is not None and t > until_tick:
+                    break
+            ev = self.pop_event()
+            if ev is None:
+                break
+            tick, ev_type, payload = ev
+            self.tick = tick
+            self.now = tick * RESOLUTION
+            if ev_type == "arrival" and self.batch_arrivals:
+                batch = self.drain_tick(payload)
+                for task, decision in zip(batch, self.scheduler.decide_batch(batch, self.now)):
+                    self.events_processed += 1
+                    if self.apply_decision(task, decision) is not False:
+                        self.maybe_end_round()
+            else:
+                self.events_processed += 1
+                # deadline drops skip the round check until the next event (as the original loop's `continue`)
+                if self.handlers[ev_type](payload) is not False:
+                    self.maybe_end_round()
+            if self.checkpoint_path is not None:
+                self.maybe_checkpoint()
+
+    def drain_tick(self, first):
+        """
+        first + the following arrivals at the same tick. The batch never crosses a controller
+        round boundary (weights change there), so batched decisions equal sequential ones.
+        """
+        batch = [first]
+        limit = max(1, self.config["round_size"] - (len(self.task_log) - self.round_start))
+        while len(batch) < limit and self._arrival_due(self.tick):
+            batch.append(self._take_arrival())
+        return batch
+
+    def peek_tick(self):
+        ticks = [t for t in (self.next_tick, self.events[0][0] if self.events else None) if t is not None]
+        return min(ticks) if ticks else None
+
+    def peek_time(self):
+        tick = self.peek_tick()
+        return None if tick is None else tick * RESOLUTION
+
+    # ---- handlers ----
+    def on_arrival(self, task):
+        return self.apply_decision(task, self.scheduler.decide(task, self.now))
+
+    def apply_decision(self, task, scheduled):
+        decision, path_nodes, path_links, meta = scheduled
+        if decision == "local":
+            return self.run_local(task)
+        if decision == "offload":
+            return self.run_offload(task, path_nodes, path_links, meta)
+        if decision == "drop_by_capacity":
+            return self.drop_by_capacity(task, meta)
+
+    def run_local(self, task):
+        time_now = self.now
+        proc_time_ms = task["local_ms"]
+        start = max(self.tick, self.device_busy_until[task["device_id"]])
+        queue_delay = (start * RESOLUTION - task["creation_time_s"]) * 1000
+
+        if (queue_delay + proc_time_ms) > task["deadline_ms"]:
+            # drop because even with immediate start it won't meet deadline
+            self.task_log.append(task["task_id"], task["device_id"], "local",
+                                 task["creation_time_s"], time_now,
+                                 queue_delay_ms=queue_delay, proc_delay_ms=0.0, tx_delay_ms=0.0,
+                                 energy_j=0.0, deadline_ms=task["deadline_ms"], status="drop")
+            return False
+
+        end = start + task["local_ticks"]
+        self.device_busy_until[task["device_id"]] = end
+        total_latency = (end * RESOLUTION - task["creation_time_s"]) * 1000
+        energy = task["local_energy_j"]
+        status = "hit" if total_latency <= task["deadline_ms"] else "miss"
+
+        self.task_log.append(task["task_id"], task["device_id"], "local",
+                             task["creation_time_s"], time_now, start * RESOLUTION, end * RESOLUTION,
+                             queue_delay_ms=queue_delay, proc_delay_ms=proc_time_ms, tx_delay_ms=0.0,
+                             total_latency_ms=total_latency, energy_j=energy,
+                             deadline_ms=task["deadline_ms"], status=status, tier="local")
+
+    def run_offload(self, task, path_nodes, path_links, meta):
+        config = self.config
+        time_now = self.now
+        server = path_nodes[-1]
+        pool = self.fog_pools[server]
+        # meta contains reservations and the transmit time over path_links
+        reservations = meta.get("reservations", [])
+        tx_ms = meta["tx_ms"]
+        arrival_fog = to_ticks(time_now + tx_ms/1000.0)
+
+        # schedule on the earliest free worker of the destination server
+        fog_time_ms = task["fog_ms"]
+        start = max(arrival_fog, pool[0])
+        queue_delay = (start * RESOLUTION - task["creation_time_s"]) * 1000
+        if self.debug:
+            log.debug("offload %s -> %s: queue_delay %.4f + fog_time %.4f = %.4f ms (deadline %.4f ms)",
+                      task["task_id"], server, queue_delay, fog_time_ms, queue_delay + fog_time_ms, task["deadline_ms"])
+        if (queue_delay + fog_time_ms) > task["deadline_ms"]:
+            # fog queue exceeds the deadline budget: spill over to the cloud if it can make it
+            if self.cloud_pool and self.run_cloud(task, server, tx_ms) is not False:
+                return
+            # drop because won't meet deadline; record drop on the reserved path links
+            for r in reservations:
+                if r.get("type")=="link":
+                    r["link"].record_drop(r["bits"])
+            self.task_log.append(task["task_id"], task["device_id"], "offload",
+                                 task["creation_time_s"], time_now,
+                                 queue_delay_ms=queue_delay, proc_delay_ms=0.0, tx_delay_ms=tx_ms,
+                                 energy_j=0.0, deadline_ms=task["deadline_ms"],
+                                 status="drop", drop_reason="deadline_miss")
+            return False
+
+        end = start + task["fog_ticks"]
+        heapq.heapreplace(pool, end)
+        total_latency = (end * RESOLUTION - task["creation_time_s"]) * 1000 + tx_ms
+        energy = config["p_tx"] * (tx_ms/1000.0)
+        status = "hit" if total_latency <= task["deadline_ms"] else "miss"
+
+        self.task_log.append(task["task_id"], task["device_id"], "offload",
+                             task["creation_time_s"], time_now, start * RESOLUTION, end * RESOLUTION,
+                             queue_delay_ms=queue_delay, proc_delay_ms=fog_time_ms, tx_delay_ms=tx_ms,
+                             total_latency_ms=total_latency, energy_j=energy,
+                             deadline_ms=task["deadline_ms"], status=status, tier="fog", server_node=server)
+
+    def run_cloud(self, task, gateway, tx_ms):
+        """
+        Cloud tier: the task continues from the fog server (gateway) over the WAN
+        (cloud_bw_bps + cloud_rtt_s) to the shared cloud pool. Returns False if even the
+        cloud would miss the deadline.
+        """
+        config = self.config
+        wan_ms = (task["size_bits"] / config.get("cloud_bw_bps", 1e9) + config.get("cloud_rtt_s", 0.0)) * 1000.0
+        total_tx_ms = tx_ms + wan_ms
+        arrival_cloud = to_ticks(self.now + total_tx_ms/1000.0)
+        cloud_time_ms = task["cloud_ms"]
+        start = max(arrival_cloud, self.cloud_pool[0])
+        queue_delay = (start * RESOLUTION - task["creation_time_s"]) * 1000
+        if (queue_delay + cloud_time_ms) > task["deadline_ms"]:
+            return False
+
+        end = start + task["cloud_ticks"]
+        heapq.heapreplace(self.cloud_pool, end)
+        total_latency = (end * RESOLUTION - task["creation_time_s"]) * 1000 + total_tx_ms
+        energy = config["p_tx"] * (tx_ms/1000.0)
+        status = "hit" if total_latency <= task["deadline_ms"] else "miss"
+
+        self.task_log.append(task["task_id"], task["device_id"], "offload",
+                             task["creation_time_s"], self.now, start * RESOLUTION, end * RESOLUTION,
+                             queue_delay_ms=queue_delay, proc_delay_ms=cloud_time_ms, tx_delay_ms=total_tx_ms,
+                             total_latency_ms=total_latency, energy_j=energy,
+                             deadline_ms=task["deadline_ms"], status=status, tier="cloud", server_node=gateway)
+
+    def drop_by_capacity(self, task, meta):
+        blocking = meta.get("blocking")
+        # blocking is ("access_link", node) or ("path_link", Link); access drops are not recorded
+        if isinstance(blocking, tuple) and blocking[0]=="path_link":
+            link = blocking[1]
+            if hasattr(link, "record_drop"):
+                link.record_drop(task["size_bits"])
+
+        self.task_log.append(task["task_id"], task["device_id"], "drop",
+                             task["creation_time_s"], self.now,
+                             proc_delay_ms=0.0, energy_j=0.0, deadline_ms=task["deadline_ms"],
+                             status="drop", drop_reason="link_capacity")
+
+    # ---- checkpoints ----
+    def maybe_checkpoint(self):
+        due = False
+        if self.checkpoint_every_events and self.events_processed >= self._next_checkpoint_events:
+            due = True
+        if self.checkpoint_every_s and self.now >= self._next_checkpoint_s:
+            due = True
+        if due:
+            self._next_checkpoint_events = self.events_processed + self.checkpoint_every_events
+            if self.checkpoint_every_s:
+                self._next_checkpoint_s = (self.now // self.checkpoint_every_s + 1) * self.checkpoint_every_s
+            self.checkpoint()
+
+    def checkpoint(self, path=None):
+        """
+        Pickle the whole engine state (event heap, busy times, worker pools, reservations,
+        weights, logs) to path (default checkpoint_path), written atomically.
+        The task stream is stored as its position and re-opened by resume().
+        """
+        path = path or self.checkpoint_path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.detach()
+        try:
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        finally:
+            if profiler is not None:
+                profiler.attach(self)
+        log.info("checkpoint at t=%.4f s, %d events -> %s", self.now, self.events_processed, path)
+        return path
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["arrivals"] = None
+        state["profiler"] = None
+        return state
+
+    @classmethod
+    def resume(cls, path, tasks=None):
+        """
+        Engine restored from a checkpoint, ready for run(). tasks must be the same stream the
+        original run used (default: regenerated from the checkpointed config); the already
+        consumed arrivals are skipped, so the continued run is identical to an uninterrupted one.
+        """
+        with open(path, "rb") as f:
+            sim = pickle.load(f)
+        stream = iter(tasks) if tasks is not None else task_stream(sim.config)
+        sim.arrivals = sim.costs.stream(itertools.islice(stream, sim.arrivals_pulled, None))
+        sim.task_log.truncate_flushed()
+        sim.online.truncate_intervals()
+        sim.debug = sim.scheduler.debug = log.isEnabledFor(logging.DEBUG)
+        if sim.config.get("profile", False):
+            sim.profiler = Profiler().attach(sim)
+        return sim
+
+    # ---- controller rounds / output ----
+    def maybe_end_round(self):
+        log = self.task_log
+        if len(log) - self.round_start >= self.config["round_size"]:
+            self.controller.update_round(log.device_numbers(self.round_start),
+                                         log.codes("decision", self.round_start),
+                                         log.codes("status", self.round_start))
+            self.weight_history.record()
+            self.round_start = len(log)
+            self.online.maybe_feed(log, self.now, self.flush_rows)
+            log.maybe_flush(self.flush_rows)
+
+    def metrics(self):
+        """Summary metrics so far; read-only (interval rows are emitted by the event loop and save())."""
+        _, metrics = summarize(self.task_log, frame=False)
+        metrics.update(self.online.percentiles(self.task_log))
+        return metrics
+
+    def save(self, outdir="Results"):
+        """
+        Write link_utilization.csv, sim_task_logs.csv, sim_metrics_summary.csv (+ percentiles),
+        sim_metrics_groups.csv and weights (+ metrics_intervals.csv, link_utilization_ts.npz /
+        link_utilization_summary.csv, profile.csv); returns the frames.
+        """
+        import pandas as pd
+        os.makedirs(outdir, exist_ok=True)
+        link_rows = self.network.snapshot_link_stats()
+        pd.DataFrame(link_rows).to_csv(os.path.join(outdir, "link_utilization.csv"), index=False)
+        if self.network.utilization is not None:
+            self.network.utilization.save(outdir)
+        if self.profiler is not None:
+            self.profiler.save(outdir)
+        self.online.close(self.task_log, self.now)
+        return save_logs_and_metrics(self.task_log, self.weight_history, outdir, online=self.online)
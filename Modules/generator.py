@@ -1,8 +1,26 @@
-import json, random
-import pandas as pd
-from .utils import snap_time
+import math, os, random
+import numpy as np
+from .utils import snap_time, RESOLUTION, TIME_DECIMALS
+from .taskio import task_columns, task_writer
 
-def generate_tasks(config, out_path="Data/tasks.json"):
+# tracked reference workload; generated workloads go to Data/generated/ (untracked)
+FIXTURE_PATH = os.path.join("Data", "tasks.json")
+
+def _check_out_path(out_path):
+    if os.path.abspath(out_path) == os.path.abspath(FIXTURE_PATH):
+        raise ValueError(f"{FIXTURE_PATH} is the reference fixture; write generated tasks under Data/generated/")
+
+
+def generate_tasks(config, out_path="Data/generated/tasks.json"):
+    """
+    Workload for config: the python generator returns the sorted task dicts (also written to
+    out_path as JSON lines unless out_path is None), the numpy one writes out_path and
+    returns the number of tasks.
+    """
+    if config.get("generator", "python") == "numpy":
+        return generate_tasks_np(config, out_path=out_path,
+                                 fmt=config.get("task_format", "jsonl"),
+                                 chunk_size=config.get("task_chunk_size", 100000))
     random.seed(42)
     n_tasks = config["num_tasks"]
     num_devices = config["num_devices"]
@@ -34,6 +52,146 @@ def generate_tasks(config, out_path="Data/tasks.json"):
             count += 1
 
     tasks = sorted(tasks, key=lambda x: x["creation_time_s"])
-    pd.DataFrame(tasks).to_json(out_path, orient="records", lines=True)
+    if out_path is not None:
+        _check_out_path(out_path)
+        writer = task_writer(out_path, "jsonl")
+        writer.write(task_columns(tasks))
+        writer.close()
     return tasks
 
+
+
+# each device draws from its own Philox stream (key = task_seed, device), one row of
+# uniforms per arrival: gap, size (two, Box-Muller), deadline, priority. Rows are drawn in
+# blocks and consumed in arrival order, so the tasks do not depend on how the run is cut
+# into windows / chunks (task_chunk_size only bounds memory).
+_GAP, _SIZE_A, _SIZE_B, _DEADLINE, _PRIORITY = range(5)
+_BLOCK_ROWS = 16
+
+
+class _DeviceDraws:
+    """Per-device uniform rows; rows[dev][0] belongs to the device's next (pending) arrival."""
+    def __init__(self, seed, num_devices):
+        self.seed = seed
+        self.gens = [None] * num_devices
+        self.rows = [np.zeros((0, 5))] * num_devices
+
+    def peek(self, dev, k):
+        rows = self.rows[dev]
+        if len(rows) < k:
+            gen = self.gens[dev]
+            if gen is None:
+                gen = self.gens[dev] = np.random.Generator(np.random.Philox(key=np.array([dev, self.seed], dtype=np.uint64)))
+            rows = self.rows[dev] = np.concatenate([rows, gen.random((max(k - len(rows), _BLOCK_ROWS), 5))])
+        return rows[:k]
+
+    def consume(self, dev, k):
+        self.rows[dev] = self.rows[dev][k:]
+
+
+def iter_task_chunks_np(config, chunk_size=100000):
+    """
+    Vectorized generator: yields column chunks (dict of arrays, see taskio.TASK_COLUMNS)
+    of exactly chunk_size rows (last one shorter), globally sorted by
+    (creation_time_s, device, seq) - the same order as the sorted python generator.
+    Time is advanced in windows sized for ~chunk_size arrivals, so memory stays
+    bounded by the chunk size whatever num_tasks is; the tasks themselves are the same
+    for every chunk_size (see _DeviceDraws).
+    """
+    seed = int(config.get("task_seed", 42))
+    n_tasks = config["num_tasks"]
+    num_devices = config["num_devices"]
+    horizon = config["simulation_horizon_s"]
+    mean_kb = config["mean_task_size_kb"]
+    std_kb = config["std_task_size_kb"]
+
+    avg_tasks_per_device = n_tasks / num_devices
+    lambda_rate = avg_tasks_per_device / horizon
+    max_count = math.ceil(avg_tasks_per_device)       # python loop: while count < avg_tasks_per_device
+    horizon_tick = math.floor(horizon / RESOLUTION + 1e-9)
+    mean_gap_ticks = 1.0 / (lambda_rate * RESOLUTION)
+    window_ticks = max(1, int(chunk_size / (num_devices * lambda_rate) / RESOLUTION))
+    draws = _DeviceDraws(seed, num_devices)
+
+    def gap_ticks(u):
+        # t = snap(t + gap) on a grid-aligned t == adding round(gap / RESOLUTION) ticks
+        return np.rint(-np.log1p(-u) * mean_gap_ticks).astype(np.int64)
+
+    # pending (already drawn) next arrival per device: the tick of its arrival number count
+    next_tick = gap_ticks(np.array([draws.peek(dev, 1)[0, _GAP] for dev in range(num_devices)]))
+    count = np.zeros(num_devices, dtype=np.int64)
+    alive = (next_tick <= horizon_tick) & (count < max_count)
+
+    pending = []
+    pending_rows = 0
+    window_end = 0
+    while alive.any():
+        window_end += window_ticks
+        parts = []
+        while True:
+            devs = np.flatnonzero(alive & (next_tick <= window_end))
+            if len(devs) == 0:
+                break
+            # expected arrivals per device left in this window (+ the following one), drawn as one block
+            m = int(min(max_count, (window_end - next_tick[devs].min()) / mean_gap_ticks * 1.5 + 4))
+            u = np.stack([draws.peek(dev, m + 1) for dev in devs.tolist()])
+            seq = count[devs, None] + np.arange(m + 1)
+            ticks = np.empty((len(devs), m + 1), dtype=np.int64)
+            ticks[:, 0] = next_tick[devs]
+            ticks[:, 1:] = ticks[:, :1] + np.cumsum(gap_ticks(u[:, 1:, _GAP]), axis=1)
+            ok = (ticks <= window_end) & (ticks <= horizon_tick) & (seq < max_count)
+            ok[:, m] = False
+            n_ok = ok.sum(axis=1)                  # accepted arrivals are a prefix of each row
+            rows, cols = np.nonzero(ok)
+            parts.append((ticks[rows, cols], devs[rows], seq[rows, cols], u[rows, cols]))
+            count[devs] += n_ok
+            for dev, k in zip(devs.tolist(), n_ok.tolist()):
+                draws.consume(dev, k)
+            # first rejected arrival becomes the device's pending one
+            nt = ticks[np.arange(len(devs)), n_ok]
+            next_tick[devs] = nt
+            alive[devs] = (nt <= horizon_tick) & (count[devs] < max_count)
+        if not parts:
+            continue
+        t = np.concatenate([p[0] for p in parts])
+        d = np.concatenate([p[1] for p in parts])
+        q = np.concatenate([p[2] for p in parts])
+        u = np.concatenate([p[3] for p in parts])
+        order = np.lexsort((q, d, t))
+        t, d, q, u = t[order], d[order], q[order], u[order]
+        # Box-Muller normal from two per-task uniforms
+        normal = np.sqrt(-2.0 * np.log1p(-u[:, _SIZE_A])) * np.cos(2.0 * np.pi * u[:, _SIZE_B])
+        chunk = {
+            "device": d.astype(np.int32),
+            "seq": q.astype(np.int32),
+            "creation_time_s": np.round(t * RESOLUTION, TIME_DECIMALS),
+            "size_kb": np.maximum(10.0, mean_kb + std_kb * normal),
+            "deadline_ms": np.round(np.rint((1.0 + 2.0 * u[:, _DEADLINE]) / 1000.0 / RESOLUTION)
+                                    * RESOLUTION * 1000.0, TIME_DECIMALS - 3),
+            "priority": np.where(u[:, _PRIORITY] < 0.8, 1, 2).astype(np.int8),
+        }
+        pending.append(chunk)
+        pending_rows += len(order)
+        while pending_rows >= chunk_size:
+            merged = {c: np.concatenate([p[c] for p in pending]) for c in chunk}
+            yield {c: a[:chunk_size] for c, a in merged.items()}
+            pending = [{c: a[chunk_size:] for c, a in merged.items()}]
+            pending_rows -= chunk_size
+    if pending_rows:
+        yield {c: np.concatenate([p[c] for p in pending]) for c in pending[0]}
+
+
+def generate_tasks_np(config, out_path="Data/generated/tasks.json", fmt="jsonl", chunk_size=100000):
+    """
+    Write the vectorized workload to out_path chunk by chunk
+    (fmt "jsonl": one task per line, "columnar": memory-mappable directory, see taskio).
+    Returns the number of tasks written.
+    """
+    _check_out_path(out_path)
+    writer = task_writer(out_path, fmt)
+    try:
+        for chunk in iter_task_chunks_np(config, chunk_size=chunk_size):
+            writer.write(chunk)
+    finally:
+        writer.close()
+    return writer.n_rows
@@ -1,5 +1,6 @@
 import math
-from .utils import snap_time
+import numpy as np
+from .utils import snap_time, to_ticks, RESOLUTION
 
 def cycles_required(size_kb, cycles_per_byte=100):
     return size_kb * 1024.0 * cycles_per_byte
@@ -7,4 +8,14 @@ def cycles_required(size_kb, cycles_per_byte=100):
 def processing_time_ms(size_kb, cpu_hz, cycles_per_byte=100):
     cycles = cycles_required(size_kb, cycles_per_byte)
     time_s = cycles / cpu_hz
-    return snap_time(time_s) * 1000.0, cycles
\ No newline at end of file
+    return snap_time(time_s) * 1000.0, cycles
+
+def processing_ticks(size_kb, cpu_hz, cycles_per_byte=100):
+    """processing_time_ms in clock ticks: (ticks, cycles), ticks * RESOLUTION * 1000.0 is the same ms value."""
+    cycles = cycles_required(size_kb, cycles_per_byte)
+    return to_ticks(cycles / cpu_hz), cycles
+
+def processing_ticks_np(size_kb, cpu_hz, cycles_per_byte=100):
+    """Array version of processing_ticks (int64 ticks)."""
+    cycles = np.asarray(size_kb, dtype=np.float64) * 1024.0 * cycles_per_byte
+    return np.rint(cycles / cpu_hz / RESOLUTION).astype(np.int64), cycles
@@ -1,9 +1,97 @@
-import pandas as pd
+import numpy as np
 import os
+from .tasklog import TaskLog, CODES
+from .online_metrics import Moments
+from .weight_history import WeightHistory
 
-def save_logs_and_metrics(task_logs, weight_logs, outdir):
+MEAN_COLS = {
+    "avg_latency_ms": "total_latency_ms",
+    "sla_violation_rate": "sla_violation",
+    "avg_queue_delay_ms": "queue_delay_ms",
+    "avg_proc_delay_ms": "proc_delay_ms",
+    "avg_tx_delay_ms": "tx_delay_ms",
+    "avg_energy_j": "energy_j",
+}
+SUMMARY_ORDER = ["num_tasks", "avg_latency_ms", "std_latency_ms", "sla_violation_rate", "drop_rate", "hit_rate",
+                 "avg_queue_delay_ms", "avg_proc_delay_ms", "avg_tx_delay_ms", "avg_energy_j"]
+
+def _nanmean(v):
+    # pandas Series.mean: NaNs filled with 0, summed, divided by the non-NaN count
+    mask = np.isnan(v)
+    count = len(v) - int(mask.sum())
+    return np.where(mask, 0.0, v).sum() / count if count else np.nan
+
+def _nanstd(v, ddof=1):
+    # pandas Series.std (two-pass), so results match the DataFrame path bit for bit
+    mask = np.isnan(v)
+    count = len(v) - int(mask.sum())
+    if count - ddof <= 0:
+        return np.nan
+    v = np.where(mask, 0.0, v)
+    sqr = (v.sum() / count - v) ** 2
+    sqr[mask] = 0.0
+    return np.sqrt(sqr.sum() / (count - ddof))
+
+def _log_metrics(task_log):
+    """Summary metrics straight from an in-memory TaskLog's columns (no DataFrame)."""
+    start = task_log.offset
+    n = len(task_log)
+    status = task_log.codes("status", start)
+    metrics = {"num_tasks": n}
+    for name, c in MEAN_COLS.items():
+        metrics[name] = _nanmean(task_log.codes(c, start))
+    metrics["std_latency_ms"] = _nanstd(task_log.codes("total_latency_ms", start))
+    metrics["drop_rate"] = np.count_nonzero(status == CODES["status"]["drop"]) / n if n else np.nan
+    metrics["hit_rate"] = np.count_nonzero(status == CODES["status"]["hit"]) / n if n else np.nan
+    return {k: metrics[k] for k in SUMMARY_ORDER}
+
+def _streamed_metrics(frames):
+    """Summary metrics accumulated chunk by chunk (for task logs flushed to disk)."""
+    n = 0
+    sums = {c: 0.0 for c in MEAN_COLS.values()}
+    counts = {c: 0 for c in MEAN_COLS.values()}
+    latency = Moments()   # chunk-wise Welford / Chan, no cancellation on large means
+    drops = hits = 0
+    import pandas as pd
+    for df in frames:
+        n += len(df)
+        for c in sums:
+            v = pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float)
+            v = v[~np.isnan(v)]
+            sums[c] += v.sum()
+            counts[c] += len(v)
+            if c == "total_latency_ms" and len(v):
+                latency.add(np.zeros(len(v), dtype=np.int64), v, 1)
+        drops += int((df["status"] == "drop").sum())
+        hits += int((df["status"] == "hit").sum())
+
+    def mean(c):
+        return sums[c] / counts[c] if counts[c] else np.nan
+
+    metrics = {"num_tasks": n}
+    for name, c in MEAN_COLS.items():
+        metrics[name] = mean(c)
+    metrics["std_latency_ms"] = latency.std()[0].item() if len(latency.n) else np.nan
+    metrics["drop_rate"] = drops / n if n else np.nan
+    metrics["hit_rate"] = hits / n if n else np.nan
+    return {k: metrics[k] for k in SUMMARY_ORDER}
+
+def summarize(task_logs, frame=True):
+    """
+    task_logs: TaskLog (preferred) or list of per-task dicts.
+    Returns (task DataFrame, metrics dict). A TaskLog that was flushed to disk is
+    summarized chunk by chunk from its file and None is returned for the DataFrame.
+    An in-memory TaskLog is summarized from its NumPy columns; with frame=False pandas
+    is not needed and None is returned for the DataFrame.
+    """
+    if isinstance(task_logs, TaskLog):
+        if task_logs.flushed:
+            return None, _streamed_metrics(task_logs.iter_frames())
+        return (task_logs.to_frame() if frame else None), _log_metrics(task_logs)
+
+    import pandas as pd
     df = pd.DataFrame(task_logs)
-    
+
     expected_cols = [
         "total_latency_ms", "sla_violation", "decision", "queue_delay_ms",
         "proc_delay_ms", "tx_delay_ms", "energy_j", "status"
@@ -12,8 +100,6 @@ def save_logs_and_metrics(task_logs, weight_logs, outdir):
         if col not in df.columns:
             df[col] = None
 
-    df.to_csv(os.path.join(outdir, "sim_task_logs.csv"), index=False)
-
     metrics = {
         "num_tasks": len(df),
         "avg_latency_ms": df["total_latency_ms"].mean(skipna=True),
@@ -26,11 +112,31 @@ def save_logs_and_metrics(task_logs, weight_logs, outdir):
         "avg_tx_delay_ms": df["tx_delay_ms"].mean(skipna=True),
         "avg_energy_j": df["energy_j"].mean(skipna=True),
     }
+    return df, metrics
+
+def save_logs_and_metrics(task_logs, weight_logs, outdir, online=None):
+    """
+    task_logs: TaskLog (preferred) or list of per-task dicts.
+    weight_logs: WeightHistory (long-format deltas) or list of wide per-round snapshot dicts.
+    online: OnlineMetrics fed with the same log; adds its percentile columns to the summary
+    and writes sim_metrics_groups.csv / metrics_intervals.csv.
+    A flushed TaskLog's file is the task log output; None is returned in place of its DataFrame.
+    """
+    import pandas as pd
+    df, metrics = summarize(task_logs)
+    if online is not None:
+        metrics.update(online.percentiles())
+        online.save(outdir)
+    if df is not None:
+        df.to_csv(os.path.join(outdir, "sim_task_logs.csv"), index=False)
 
     metrics_df = pd.DataFrame([metrics])
     metrics_df.to_csv(os.path.join(outdir, "sim_metrics_summary.csv"), index=False)
 
-    weights_df = pd.DataFrame(weight_logs)
-    weights_df.to_csv(os.path.join(outdir, "weights.csv"), index=False)
+    if isinstance(weight_logs, WeightHistory):
+        weights_df = weight_logs.save(outdir)
+    else:
+        weights_df = pd.DataFrame(weight_logs)
+        weights_df.to_csv(os.path.join(outdir, "weights.csv"), index=False)
 
     return df, metrics_df, weights_df
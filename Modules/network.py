@@ -1,49 +1,334 @@
 import json
 import heapq
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from collections.abc import Mapping
+import numpy as np
+from .reservations import ReservationStore
+from .utilization import NetworkUtilization
 
 class Link:
+    __slots__ = ("u", "v", "on_change", "_bw_bps", "_rtt_s", "reservations",
+                 "total_reserved_bits", "total_dropped_bits", "drop_count")
+
     def __init__(self, u, v, bw_bps=1e9, rtt_s=0.005):
         self.u = int(u)
         self.v = int(v)
+        self.on_change = None         # callback(link) fired when bw_bps / rtt_s is mutated
         self.bw_bps = float(bw_bps)   # bits per second
         self.rtt_s = float(rtt_s)     # seconds (prop/RTT contribution)
-        self.reservations = []        # list of dict: {"start":, "finish":, "bits":, "task_id":}
+        self.reservations = ReservationStore()   # iterates as dicts: {"start":, "finish":, "bits":, "task_id":}
         # stats
         self.total_reserved_bits = 0.0
         self.total_dropped_bits = 0.0
         self.drop_count = 0
 
+    @property
+    def bw_bps(self):
+        return self._bw_bps
+
+    @bw_bps.setter
+    def bw_bps(self, value):
+        self._bw_bps = float(value)
+        if self.on_change is not None:
+            self.on_change(self)
+
+    @property
+    def rtt_s(self):
+        return self._rtt_s
+
+    @rtt_s.setter
+    def rtt_s(self, value):
+        self._rtt_s = float(value)
+        if self.on_change is not None:
+            self.on_change(self)
+
     def cleanup(self, now):
-        before = len(self.reservations)
-        self.reservations = [r for r in self.reservations if r["finish"] > now]
-        return before - len(self.reservations)
+        return self.reservations.cleanup(now)
 
     def reserved_bits_in_window(self, window_start, window_end):
-        s = 0.0
-        for r in self.reservations:
-            if r["finish"] <= window_start or r["start"] >= window_end:
-                continue
-            s += r["bits"]
-        return s
+        return self.reservations.bits_in_window(window_start, window_end)
 
     def add_reservation(self, start, finish, bits, task_id=None):
-        self.reservations.append({"start": start, "finish": finish, "bits": bits, "task_id": task_id})
+        self.reservations.add(start, finish, bits, task_id=task_id)
         self.total_reserved_bits += bits
 
     def record_drop(self, bits):
         self.total_dropped_bits += bits
         self.drop_count += 1
 
+    def active_count(self):
+        return len(self.reservations)
+
+
+class LinkTable:
+    """
+    Per-link fields of a compact Network as NumPy arrays indexed by link id (struct of
+    arrays). The float / count columns are also exposed as memoryviews, which read and
+    write plain Python numbers without NumPy scalar overhead.
+    """
+    FIELDS = {"u": "i8", "v": "i8", "bw_bps": "f8", "rtt_s": "f8",
+              "total_reserved_bits": "f8", "total_dropped_bits": "f8", "drop_count": "i8"}
+
+    def __init__(self, network, u, v, bw_bps, rtt_s):
+        n = len(u)
+        self.network = network
+        self.arrays = {f: np.zeros(n, dtype=dt) for f, dt in self.FIELDS.items()}
+        self.arrays["u"][:] = u
+        self.arrays["v"][:] = v
+        self.arrays["bw_bps"][:] = bw_bps
+        self.arrays["rtt_s"][:] = rtt_s
+        self._views()
+
+    def _views(self):
+        for f, a in self.arrays.items():
+            setattr(self, f, memoryview(a))
+
+    def __len__(self):
+        return len(self.arrays["u"])
+
+    def __getstate__(self):
+        return {"network": self.network, "arrays": self.arrays}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._views()
+
+
+class LinkView:
+    """
+    Link of a compact Network: a __slots__ handle (table, row) with the Link API whose
+    fields live in the LinkTable. The reservation store is created on first use, so idle
+    links cost no more than the handle.
+    """
+    __slots__ = ("table", "i", "_reservations")
+
+    def __init__(self, table, i):
+        self.table = table
+        self.i = i
+        self._reservations = None
+
+    u = property(lambda self: self.table.u[self.i])
+    v = property(lambda self: self.table.v[self.i])
+    total_reserved_bits = property(lambda self: self.table.total_reserved_bits[self.i])
+    total_dropped_bits = property(lambda self: self.table.total_dropped_bits[self.i])
+    drop_count = property(lambda self: self.table.drop_count[self.i])
+
+    @property
+    def bw_bps(self):
+        return self.table.bw_bps[self.i]
+
+    @bw_bps.setter
+    def bw_bps(self, value):
+        self.table.bw_bps[self.i] = float(value)
+        self.table.network._on_link_change(self)
+
+    @property
+    def rtt_s(self):
+        return self.table.rtt_s[self.i]
+
+    @rtt_s.setter
+    def rtt_s(self, value):
+        self.table.rtt_s[self.i] = float(value)
+        self.table.network._on_link_change(self)
+
+    @property
+    def reservations(self):
+        if self._reservations is None:
+            t = self.table
+            self._reservations = ReservationStore(listener=t.network._reservation_listener((t.u[self.i], t.v[self.i])))
+        return self._reservations
+
+    def cleanup(self, now):
+        return self._reservations.cleanup(now) if self._reservations is not None else 0
+
+    def reserved_bits_in_window(self, window_start, window_end):
+        if self._reservations is None:
+            return 0.0
+        return self._reservations.bits_in_window(window_start, window_end)
+
+    def add_reservation(self, start, finish, bits, task_id=None):
+        self.reservations.add(start, finish, bits, task_id=task_id)
+        self.table.total_reserved_bits[self.i] += bits
+
+    def record_drop(self, bits):
+        self.table.total_dropped_bits[self.i] += bits
+        self.table.drop_count[self.i] += 1
+
+    def active_count(self):
+        return len(self._reservations) if self._reservations is not None else 0
+
+
+class CSRAdjacency(Mapping):
+    """
+    node -> [(neighbour, link), ...] over CSR arrays (indptr, nbr, nbr_link) with one row
+    per node in node_ids order; lists are built on access (unknown nodes -> []).
+    """
+    def __init__(self, node_ids, indptr, nbr, nbr_link, links):
+        self.node_ids = np.asarray(node_ids, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.nbr = np.asarray(nbr, dtype=np.int64)
+        self.nbr_link = np.asarray(nbr_link, dtype=np.int64)
+        self.links = links
+        n = len(self.node_ids)
+        # row of a node id: the id itself when ids are 0..n-1, else a lookup table
+        self.rows = None if np.array_equal(self.node_ids, np.arange(n)) else {nid: i for i, nid in enumerate(self.node_ids.tolist())}
+        self._views()
+
+    def _views(self):
+        # memoryviews index / slice to plain ints much faster than NumPy scalars
+        self._indptr, self._nbr, self._nbr_link = memoryview(self.indptr), memoryview(self.nbr), memoryview(self.nbr_link)
+
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if k not in ("_indptr", "_nbr", "_nbr_link")}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._views()
+
+    def _row(self, node):
+        if self.rows is None:
+            return node if isinstance(node, (int, np.integer)) and 0 <= node < len(self.node_ids) else None
+        return self.rows.get(node)
+
+    def __getitem__(self, node):
+        i = self._row(node)
+        if i is None:
+            return []
+        lo, hi = self._indptr[i], self._indptr[i + 1]
+        links = self.links
+        return [(v, links[l]) for v, l in zip(self._nbr[lo:hi].tolist(), self._nbr_link[lo:hi].tolist())]
+
+    def __iter__(self):
+        counts = np.diff(self.indptr)
+        return iter(self.node_ids[counts > 0].tolist())
+
+    def __len__(self):
+        return int((np.diff(self.indptr) > 0).sum())
+
+
+class NodeTable(Mapping):
+    """node id -> attribute dict for a compact Network: ids in an array, attributes only for the nodes that have any."""
+    def __init__(self, node_ids, attrs):
+        self.node_ids = np.asarray(node_ids, dtype=np.int64)
+        self.attrs = attrs
+        self.sorted_ids = np.sort(self.node_ids)
+
+    def __getitem__(self, nid):
+        if nid not in self:
+            raise KeyError(nid)
+        return {"id": nid, **self.attrs.get(nid, {})}
+
+    def __contains__(self, nid):
+        i = np.searchsorted(self.sorted_ids, nid)
+        return i < len(self.sorted_ids) and self.sorted_ids[i] == nid
+
+    def __iter__(self):
+        return iter(self.node_ids.tolist())
+
+    def __len__(self):
+        return len(self.node_ids)
+
+
+class Route:
+    """
+    Cached shortest path between two nodes.
+    nodes / links must be treated as read-only: they are shared by every caller.
+    """
+    def __init__(self, nodes, links):
+        self.nodes = nodes
+        self.links = links
+        self.rtt_s = sum(l.rtt_s for l in links)
+        self.bws = [l.bw_bps for l in links]
+        self.bottleneck_bps = min(self.bws, default=float("inf"))
+        # store-and-forward transmit time per bit over the whole path: tx_s = bits * tx_s_per_bit
+        self.tx_s_per_bit = sum(1.0 / bw for bw in self.bws)
+
+
+# link weight used by the path searches
+LINK_WEIGHTS = {
+    "rtt": lambda link: link.rtt_s,
+    "hops": lambda link: 1.0,
+    "inv_bw": lambda link: 1.0 / link.bw_bps,
+}
+
+class LoadIndex:
+    """
+    Least-loaded lookup over a fixed candidate set: heap of (load, rank, node) with lazy
+    updates. Network pushes a fresh entry whenever a candidate's load changes; stale
+    entries are discarded when they reach the top. Ties go to the earliest candidate.
+    """
+    def __init__(self, candidates, node_load):
+        self.rank = {n: i for i, n in enumerate(candidates)}
+        self.node_load = node_load
+        self.heap = [(node_load[n], i, n) for n, i in self.rank.items()]
+        heapq.heapify(self.heap)
+
+    def update(self, node):
+        heapq.heappush(self.heap, (self.node_load[node], self.rank[node], node))
+        if len(self.heap) > 4 * len(self.rank) + 16:
+            self.heap = [(self.node_load[n], i, n) for n, i in self.rank.items()]
+            heapq.heapify(self.heap)
+
+    def least_loaded(self):
+        heap = self.heap
+        while heap:
+            load, _, node = heap[0]
+            if load == self.node_load[node]:
+                return node
+            heapq.heappop(heap)
+        return None
+
+
+class LoadListener:
+    """
+    ReservationStore listener of a link / access link touching `nodes`: keeps Network.node_load,
+    its LoadIndexes and the global expiry heap in sync. A class (not a closure) so the
+    network can be pickled into a checkpoint.
+    """
+    def __init__(self, network, nodes):
+        self.network = network
+        self.nodes = nodes
+
+    def __call__(self, store, delta):
+        net = self.network
+        for n in self.nodes:
+            net.node_load[n] += delta
+            for idx in net.node_load_indexes.get(n, ()):
+                idx.update(n)
+        if delta > 0:
+            nf = store.next_finish
+            if store.scheduled_finish is None or nf < store.scheduled_finish:
+                store.scheduled_finish = nf
+                heapq.heappush(net.expiry, (nf, net._expiry_seq, store))
+                net._expiry_seq += 1
+
+
+class AccessReservations(dict):
+    # node -> ReservationStore of that node's device access link, created on first use
+    def __init__(self, listener_for):
+        super().__init__()
+        self.listener_for = listener_for
+
+    def __missing__(self, node_id):
+        store = ReservationStore(listener=self.listener_for((node_id,)))
+        self[node_id] = store
+        return store
+
 
 class Network:
-    def __init__(self, topology_path, default_link_bw_bps, device_access_bw_bytes_per_s, default_rtt_s):
+    def __init__(self, topology_path, default_link_bw_bps, device_access_bw_bytes_per_s, default_rtt_s, route_cache_size=65536,
+                 compact=False):
         """
-        topology_path: json file path (nodes, links)
+        topology_path: json file path (nodes, links), or the already parsed node-link dict
         default_link_bw_bps: bits/s for backbone links (1e9)
         device_access_bw_bytes_per_s: bytes/s for device->access link (e.g. 40e6 bytes/s)
         default_rtt_s: per-link rtt (seconds)
+        route_cache_size: max cached (src, dst) routes, LRU evicted (0 disables caching)
+        compact: keep the graph in CSR arrays (adj: CSRAdjacency, nodes: NodeTable) and the links'
+            fields in a LinkTable, with LinkView handles as links (see load_topology_arrays)
         """
+        self.compact = compact
+        self.link_table = None   # LinkTable in compact mode
         self.nodes = {}         
         self.adj = defaultdict(list)   # node -> list of (neighbor, link_obj)
         self.links = []        
@@ -55,28 +340,93 @@ class Network:
         self.default_rtt_s = float(default_rtt_s)
 
  
-        self.access_reservations = defaultdict(list)
+        self.access_reservations = AccessReservations(self._reservation_listener)   # node -> access link reservations
+
+        # per-node load = active reservations on adjacent links + on the node's access link,
+        # maintained incrementally by the stores' listeners
+        self.node_load = defaultdict(int)
+        self.load_indexes = {}             # tuple(candidates) -> LoadIndex
+        self.node_load_indexes = defaultdict(list)   # node -> LoadIndex objects containing it
+        self.expiry = []                   # (next_finish, seq, store) for global expiry
+        self._expiry_seq = 0
+
+        self.route_cache_size = int(route_cache_size or 0)
+        self.route_cache = OrderedDict()   # (src, dst, weight) -> Route or None (unreachable)
+        self.ksp_cache = OrderedDict()     # (src, dst, k, weight) -> [Route, ...] (Yen), same LRU bound
+        self.dist_to_cache = {}            # (dst, weight) -> {node: distance to dst}, A* bound of Yen's spur searches
+        self.utilization = None            # NetworkUtilization time series, see enable_utilization()
 
         if topology_path:
             self.load_topology(topology_path)
 
     def load_topology(self, topology_path):
-        with open(topology_path, "r") as f:
-            topo = json.load(f)
+        """topology_path: json file, parsed node-link dict, or adjacency arrays (cache.topology_arrays)."""
+        if isinstance(topology_path, dict) and "indptr" in topology_path:
+            return self.load_topology_arrays(topology_path)
+        if isinstance(topology_path, dict):
+            topo = topology_path
+        else:
+            with open(topology_path, "r") as f:
+                topo = json.load(f)
+        if self.compact:
+            from .cache import topology_arrays
+            return self.load_topology_arrays(topology_arrays(topo))
 
         for n in topo.get("nodes", []):
             nid = int(n["id"])
             self.nodes[nid] = n
         self.node_count = len(self.nodes)
 
+        self.invalidate_routes()
         for l in topo.get("links", []):
             u = int(l["source"])
             v = int(l["target"])
-            link = Link(u, v, bw_bps=self.default_link_bw_bps, rtt_s=self.default_rtt_s)
-            self.links.append(link)
+            link = self._new_link(u, v)
             self.adj[u].append((v, link))
             self.adj[v].append((u, link))
 
+    def load_topology_arrays(self, arrays):
+        """
+        Same network as load_topology from the precomputed arrays of cache.topology_arrays.
+        In compact mode the arrays are kept as they are instead of being expanded into
+        per-node dicts and adjacency lists.
+        """
+        attrs = json.loads(str(arrays["node_attrs"]))
+        if self.compact:
+            if self.links:
+                raise RuntimeError("a compact network holds a single topology")
+            self.invalidate_routes()
+            self.nodes = NodeTable(arrays["node_id"], {int(k): a for k, a in attrs.items()})
+            self.node_count = len(self.nodes)
+            self.link_table = LinkTable(self, arrays["link_u"], arrays["link_v"], self.default_link_bw_bps, self.default_rtt_s)
+            self.links = [LinkView(self.link_table, i) for i in range(len(self.link_table))]
+            self.adj = CSRAdjacency(arrays["node_id"], arrays["indptr"], arrays["nbr"], arrays["nbr_link"], self.links)
+            return
+        node_ids = arrays["node_id"].tolist()
+        for nid in node_ids:
+            self.nodes[nid] = {"id": nid, **attrs.get(str(nid), {})}
+        self.node_count = len(self.nodes)
+
+        self.invalidate_routes()
+        base = len(self.links)
+        for u, v in zip(arrays["link_u"].tolist(), arrays["link_v"].tolist()):
+            self._new_link(u, v)
+        links = self.links
+        indptr = arrays["indptr"].tolist()
+        nbr = arrays["nbr"].tolist()
+        nbr_link = arrays["nbr_link"].tolist()
+        for i, nid in enumerate(node_ids):
+            lo, hi = indptr[i], indptr[i + 1]
+            if hi > lo:
+                self.adj[nid].extend((nbr[j], links[base + nbr_link[j]]) for j in range(lo, hi))
+
+    def _new_link(self, u, v):
+        link = Link(u, v, bw_bps=self.default_link_bw_bps, rtt_s=self.default_rtt_s)
+        link.on_change = self._on_link_change
+        link.reservations.listener = self._reservation_listener((u, v))
+        self.links.append(link)
+        return link
+
     def attach_devices(self, num_devices):
         """
         Attach devices to nodes deterministically: dev_i -> node (i % node_count).
@@ -86,11 +436,211 @@ class Network:
         for i in range(num_devices):
             self.device_to_node[f"dev_{i}"] = i % self.node_count
 
+    def _reservation_listener(self, nodes):
+        return LoadListener(self, nodes)
+
+    def expire(self, now):
+        """
+        Drop every reservation (on any link or access link) finished by `now`,
+        so node loads reflect the active reservations at `now`.
+        """
+        expiry = self.expiry
+        while expiry and expiry[0][0] <= now:
+            _, _, store = heapq.heappop(expiry)
+            store.scheduled_finish = None
+            store.cleanup(now)
+            if store:
+                store.scheduled_finish = store.next_finish
+                heapq.heappush(expiry, (store.scheduled_finish, self._expiry_seq, store))
+                self._expiry_seq += 1
+
+    def load_index(self, candidate_nodes):
+        key = tuple(candidate_nodes)
+        idx = self.load_indexes.get(key)
+        if idx is None:
+            idx = LoadIndex(key, self.node_load)
+            self.load_indexes[key] = idx
+            for n in idx.rank:
+                self.node_load_indexes[n].append(idx)
+        return idx
+
+    def enable_utilization(self, bucket_s=1.0, max_buckets=4096, horizon_s=None):
+        """Start accumulating per-link / per-access-node reserved bits in time buckets."""
+        self.utilization = NetworkUtilization(self, bucket_s, max_buckets, horizon_s)
+        return self.utilization
+
+    def _on_link_change(self, link):
+        self.invalidate_routes()
+
+    def invalidate_routes(self):
+        self.route_cache.clear()
+        self.ksp_cache.clear()
+        self.dist_to_cache.clear()
+
+    def get_route(self, src_node, dst_node, weight="rtt"):
+        """
+        Cached shortest path: Route (nodes, links, rtt_s, bottleneck_bps, tx_s_per_bit) or None if no path.
+        Link RTTs/bandwidths are static during a run, so each (src, dst) pair runs
+        Dijkstra once; any mutation of a link's rtt_s / bw_bps clears the cache.
+        """
+        key = (src_node, dst_node, weight)
+        cache = self.route_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        path_nodes, path_links = self._dijkstra(src_node, dst_node, weight=weight)
+        route = Route(path_nodes, path_links) if path_nodes is not None else None
+        if self.route_cache_size > 0:
+            cache[key] = route
+            if len(cache) > self.route_cache_size:
+                cache.popitem(last=False)
+        return route
+
     def find_path(self, src_node, dst_node, weight="rtt"):
         """
-        Dijkstra on nodes using link.rtt_s as weight (can be extended).
         Returns (path_nodes_list, path_links_list) or (None, None) if no path.
+        Served from the route cache; the returned lists are shared, do not mutate them.
+        """
+        route = self.get_route(src_node, dst_node, weight=weight)
+        if route is None:
+            return None, None
+        return route.nodes, route.links
+
+    def k_shortest_routes(self, src_node, dst_node, k=3, weight="rtt"):
+        """
+        Up to k loopless shortest paths src -> dst as Routes, shortest first (Yen's algorithm).
+        Computed once per (src, dst, k, weight) and cached like get_route; the first entry is
+        get_route's path.
         """
+        key = (src_node, dst_node, k, weight)
+        cache = self.ksp_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        routes = [Route(n, l) for n, l in self._yen(src_node, dst_node, k, weight)]
+        if self.route_cache_size > 0:
+            cache[key] = routes
+            if len(cache) > self.route_cache_size:
+                cache.popitem(last=False)
+        return routes
+
+    def _yen(self, src_node, dst_node, k, weight="rtt"):
+        first = self.get_route(src_node, dst_node, weight=weight)
+        if first is None:
+            return []
+        w = LINK_WEIGHTS[weight]
+        dist_to = self.dist_to(dst_node, weight)
+        found = [(first.nodes, first.links)]
+        seen = {tuple(map(id, first.links))}
+        candidates = []     # heap of (cost, seq, nodes, links)
+        seq = 0
+        while len(found) < k:
+            prev_nodes, prev_links = found[-1]
+            for j in range(len(prev_nodes) - 1):
+                root_nodes, root_links = prev_nodes[:j + 1], prev_links[:j]
+                # links leaving the spur node along already found paths sharing this root
+                banned_links = {id(links[j]) for nodes, links in found if nodes[:j + 1] == root_nodes}
+                spur_nodes, spur_links = self._spur_path(prev_nodes[j], dst_node, dist_to, weight=weight,
+                                                         banned_nodes=set(root_nodes[:-1]),
+                                                         banned_links=banned_links)
+                if spur_nodes is None:
+                    continue
+                links = root_links + spur_links
+                ident = tuple(map(id, links))
+                if ident in seen:
+                    continue
+                seen.add(ident)
+                heapq.heappush(candidates, (sum(w(l) for l in links), seq, root_nodes[:-1] + spur_nodes, links))
+                seq += 1
+            if not candidates:
+                break
+            _, _, nodes, links = heapq.heappop(candidates)
+            found.append((nodes, links))
+        return found
+
+    def dist_to(self, dst_node, weight="rtt"):
+        """{node: shortest distance to dst_node} (links are undirected), computed once per (dst, weight)."""
+        key = (dst_node, weight)
+        dist = self.dist_to_cache.get(key)
+        if dist is None:
+            w = LINK_WEIGHTS[weight]
+            adj = self.adj
+            dist = {dst_node: 0.0}
+            pq = [(0.0, dst_node)]
+            done = set()
+            while pq:
+                d, u = heapq.heappop(pq)
+                if u in done:
+                    continue
+                done.add(u)
+                for v, link in adj[u]:
+                    nd = d + w(link)
+                    if nd < dist.get(v, float("inf")):
+                        dist[v] = nd
+                        heapq.heappush(pq, (nd, v))
+            self.dist_to_cache[key] = dist
+        return dist
+
+    def _spur_path(self, src_node, dst_node, dist_to, weight="rtt", banned_nodes=None, banned_links=None):
+        """
+        Shortest src -> dst path avoiding banned_nodes / banned_links, as _dijkstra, but A*
+        guided by the exact unbanned distances dist_to (see dist_to): with few bans it walks
+        almost straight down the path instead of settling a whole ball of nodes, and nodes
+        that cannot reach dst at all are never expanded. Equal-cost ties prefer the deeper node.
+        """
+        w = LINK_WEIGHTS[weight]
+        inf = float("inf")
+        if src_node not in dist_to:
+            return None, None
+        dist = {src_node: 0.0}
+        prev = {}
+        prev_link = {}
+        pq = [(dist_to[src_node], -0.0, src_node)]
+        visited = set()
+        while pq:
+            _, neg_d, u = heapq.heappop(pq)
+            if u in visited:
+                continue
+            visited.add(u)
+            if u == dst_node:
+                break
+            d = -neg_d
+            for v, link in self.adj[u]:
+                if banned_nodes and v in banned_nodes:
+                    continue
+                if banned_links and id(link) in banned_links:
+                    continue
+                h = dist_to.get(v)
+                if h is None:
+                    continue
+                nd = d + w(link)
+                if nd < dist.get(v, inf):
+                    dist[v] = nd
+                    prev[v] = u
+                    prev_link[v] = link
+                    heapq.heappush(pq, (nd + h, -nd, v))
+        if dst_node not in visited:
+            return None, None
+        path_nodes = [dst_node]
+        path_links = []
+        cur = dst_node
+        while cur in prev:
+            path_links.append(prev_link[cur])
+            cur = prev[cur]
+            path_nodes.append(cur)
+        path_nodes.reverse()
+        path_links.reverse()
+        return path_nodes, path_links
+
+    def _dijkstra(self, src_node, dst_node, weight="rtt", banned_nodes=None, banned_links=None):
+        """
+        Dijkstra on nodes using LINK_WEIGHTS[weight] (link.rtt_s by default), skipping
+        banned_nodes and links whose id() is in banned_links.
+        Returns (path_nodes_list, path_links_list) or (None, None) if no path.
+        """
+        if self.compact:
+            return self._dijkstra_csr(src_node, dst_node, weight, banned_nodes, banned_links)
+        w = LINK_WEIGHTS[weight]
         dist = {n: float("inf") for n in self.nodes}
         prev = {n: None for n in self.nodes}
         prev_link = {n: None for n in self.nodes}
@@ -105,8 +655,11 @@ class Network:
             if u == dst_node:
                 break
             for v, link in self.adj[u]:
-                w = link.rtt_s
-                nd = d + w
+                if banned_nodes and v in banned_nodes:
+                    continue
+                if banned_links and id(link) in banned_links:
+                    continue
+                nd = d + w(link)
                 if nd < dist[v]:
                     dist[v] = nd
                     prev[v] = u
@@ -127,10 +680,70 @@ class Network:
         path_links.reverse()
         return path_nodes, path_links
 
-    def clean_all_links(self, now):
-        for link in self.links:
+    def _dijkstra_csr(self, src_node, dst_node, weight="rtt", banned_nodes=None, banned_links=None):
+        """_dijkstra over the CSR arrays and the LinkTable columns of a compact network (same paths)."""
+        adj, table, links = self.adj, self.link_table, self.links
+        indptr, nbr, nbr_link = adj._indptr, adj._nbr, adj._nbr_link
+        rows = adj.rows
+        n_rows = len(adj.node_ids)
+        if weight == "rtt":
+            wcol = table.rtt_s
+            w = wcol.__getitem__
+        elif weight == "hops":
+            w = lambda l: 1.0
+        else:
+            bw = table.bw_bps
+            w = lambda l: 1.0 / bw[l]
+        inf = float("inf")
+        dist = {src_node: 0.0}
+        prev = {}
+        prev_link = {}
+        pq = [(0.0, src_node)]
+        visited = set()
+        while pq:
+            d, u = heapq.heappop(pq)
+            if u in visited:
+                continue
+            visited.add(u)
+            if u == dst_node:
+                break
+            i = rows.get(u) if rows is not None else (u if 0 <= u < n_rows else None)
+            if i is None:
+                continue
+            for j in range(indptr[i], indptr[i + 1]):
+                v = nbr[j]
+                if banned_nodes and v in banned_nodes:
+                    continue
+                l = nbr_link[j]
+                if banned_links and id(links[l]) in banned_links:
+                    continue
+                nd = d + w(l)
+                if nd < dist.get(v, inf):
+                    dist[v] = nd
+                    prev[v] = u
+                    prev_link[v] = links[l]
+                    heapq.heappush(pq, (nd, v))
+        if dst_node not in self.nodes or dist.get(dst_node, inf) == inf:
+            return None, None
+
+        path_nodes = [dst_node]
+        path_links = []
+        cur = dst_node
+        while cur in prev:
+            path_links.append(prev_link[cur])
+            cur = prev[cur]
+            path_nodes.append(cur)
+        path_nodes.reverse()
+        path_links.reverse()
+        return path_nodes, path_links
+
+    def cleanup_links(self, links, now):
+        for link in links:
             link.cleanup(now)
 
+    def clean_all_links(self, now):
+        self.cleanup_links(self.links, now)
+
     def can_reserve_on_path(self, path_links, size_kb, now, safety_factor=0.95):
         """
         window reservation check for each link: if reserved + this task bits > capacity_in_window * safety_factor -> fail
@@ -140,8 +753,7 @@ class Network:
         size_bytes = size_kb * 1024.0
         size_bits = size_bytes * 8.0
         # cleanup old reservations
-        for link in path_links:
-            link.cleanup(now)
+        self.cleanup_links(path_links, now)
 
         for link in path_links:
             transfer_time = size_bits / link.bw_bps
@@ -167,6 +779,8 @@ class Network:
             start = now
             finish = now + transfer_time
             link.add_reservation(start, finish, size_bits, task_id=task_id)
+            if self.utilization is not None:
+                self.utilization.add_link(link, start, finish, size_bits)
             reservations.append({"link": link, "start": start, "finish": finish, "bits": size_bits})
         return reservations
 
@@ -178,7 +792,7 @@ class Network:
                 "u": link.u,
                 "v": link.v,
                 "bw_bps": link.bw_bps,
-                "active_reservations": len(link.reservations),
+                "active_reservations": link.active_count(),
                 "total_reserved_bits": link.total_reserved_bits,
                 "total_dropped_bits": link.total_dropped_bits,
                 "drop_count": link.drop_count
@@ -188,41 +802,31 @@ class Network:
     def device_to_node_id(self, dev_id):
         return self.device_to_node.get(dev_id, None)
 
-    def get_least_loaded_node(self, candidate_nodes):
-        best = None
-        best_load = float("inf")
-        for n in candidate_nodes:
-            load = 0
-            for nbr, link in self.adj[n]:
-                load += len(link.reservations)
-            load += len(self.access_reservations.get(n, []))
-            if load < best_load:
-                best_load = load
-                best = n
-        return best
+    def get_least_loaded_node(self, candidate_nodes, now=None):
+        """
+        Candidate with the fewest active reservations on its adjacent links + access link
+        (ties -> earliest candidate). O(log S) via a LoadIndex kept per candidate set.
+        """
+        if now is not None:
+            self.expire(now)
+        return self.load_index(candidate_nodes).least_loaded()
 
     def shortest_path_with_links(self, src_node, dst_node, weight="rtt"):
-        path_nodes, path_links = self.find_path(src_node, dst_node, weight=weight)
-        if path_nodes is None:
+        route = self.get_route(src_node, dst_node, weight=weight)
+        if route is None:
             return None, None, None
-        total_rtt = sum(l.rtt_s for l in path_links)
-        return path_nodes, path_links, total_rtt
+        return route.nodes, route.links, route.rtt_s
 
     def access_cleanup(self, node_id, now):
-        before = len(self.access_reservations[node_id])
-        self.access_reservations[node_id] = [r for r in self.access_reservations[node_id] if r["finish"] > now]
-        return before - len(self.access_reservations[node_id])
+        return self.access_reservations[node_id].cleanup(now)
 
     def access_reserved_bits_in_window(self, node_id, window_start, window_end):
-        s = 0.0
-        for r in self.access_reservations[node_id]:
-            if r["finish"] <= window_start or r["start"] >= window_end:
-                continue
-            s += r["bits"]
-        return s
+        return self.access_reservations[node_id].bits_in_window(window_start, window_end)
 
     def add_access_reservation(self, node_id, start, finish, bits, task_id=None):
-        self.access_reservations[node_id].append({"start": start, "finish": finish, "bits": bits, "task_id": task_id})
+        self.access_reservations[node_id].add(start, finish, bits, task_id=task_id)
+        if self.utilization is not None:
+            self.utilization.add_access(node_id, start, finish, bits)
 
     def can_transmit(self, path_links, size_bits, src_node=None, now=0.0, safety_factor=0.95): 
         if src_node is not None:
@@ -0,0 +1,404 @@
+import copy, csv, math, os
+import numpy as np
+from .tasklog import CATEGORIES, CODES
+
+# task log column -> summary column stem (avg_<stem>, p50_<stem>, ...), as in metrics.MEAN_COLS
+SERIES = {
+    "total_latency_ms": "latency_ms",
+    "queue_delay_ms": "queue_delay_ms",
+    "proc_delay_ms": "proc_delay_ms",
+    "tx_delay_ms": "tx_delay_ms",
+    "energy_j": "energy_j",
+}
+QUANTILES = (0.50, 0.95, 0.99)
+DIMENSIONS = ("decision", "server", "device")
+SUMMARY_COLUMNS = ["num_tasks", "avg_latency_ms", "std_latency_ms", "sla_violation_rate", "drop_rate", "hit_rate",
+                   "avg_queue_delay_ms", "avg_proc_delay_ms", "avg_tx_delay_ms", "avg_energy_j"]
+PERCENTILE_COLUMNS = [f"p{round(q * 100)}_{stem}" for stem in SERIES.values() for q in QUANTILES]
+
+_HIT, _DROP = CODES["status"]["hit"], CODES["status"]["drop"]
+_KEY_OFFSET = 1 << 31                 # LogSketch key layout: group << 32 | (bucket + _KEY_OFFSET)
+_KEY_MASK = (1 << 32) - 1
+
+
+class Moments:
+    """Per-group count / mean / M2 / min / max, merged block by block (Welford / Chan)."""
+    def __init__(self):
+        self.n = np.zeros(0)
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+        self.lo = np.zeros(0)
+        self.hi = np.zeros(0)
+
+    def grow(self, n_groups):
+        k = n_groups - len(self.n)
+        if k > 0:
+            self.n = np.concatenate([self.n, np.zeros(k)])
+            self.mean = np.concatenate([self.mean, np.zeros(k)])
+            self.m2 = np.concatenate([self.m2, np.zeros(k)])
+            self.lo = np.concatenate([self.lo, np.full(k, np.inf)])
+            self.hi = np.concatenate([self.hi, np.full(k, -np.inf)])
+
+    def _combine(self, idx, n, mean, m2, lo, hi):
+        tot = self.n[idx] + n
+        delta = mean - self.mean[idx]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.mean[idx] += np.where(tot > 0, delta * n / tot, 0.0)
+            self.m2[idx] += m2 + np.where(tot > 0, delta * delta * self.n[idx] * n / tot, 0.0)
+        self.n[idx] = tot
+        self.lo[idx] = np.minimum(self.lo[idx], lo)
+        self.hi[idx] = np.maximum(self.hi[idx], hi)
+
+    def add(self, groups, values, n_groups):
+        self.grow(n_groups)
+        n_groups = len(self.n)
+        cnt = np.bincount(groups, minlength=n_groups).astype(np.float64)
+        idx = np.flatnonzero(cnt)
+        bmean = np.bincount(groups, weights=values, minlength=n_groups)[idx] / cnt[idx]
+        full_mean = np.zeros(n_groups)
+        full_mean[idx] = bmean
+        dev = values - full_mean[groups]
+        bm2 = np.bincount(groups, weights=dev * dev, minlength=n_groups)[idx]
+        lo = np.full(n_groups, np.inf)
+        hi = np.full(n_groups, -np.inf)
+        np.minimum.at(lo, groups, values)
+        np.maximum.at(hi, groups, values)
+        self._combine(idx, cnt[idx], bmean, bm2, lo[idx], hi[idx])
+
+    def merge(self, other, index):
+        """Fold other's group i into group index[i]."""
+        self.grow(int(index.max()) + 1 if len(index) else 0)
+        self._combine(index, other.n, other.mean, other.m2, other.lo, other.hi)
+
+    def std(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.n > 1, np.sqrt(np.maximum(self.m2, 0.0) / (self.n - 1)), np.nan)
+
+
+class LogSketch:
+    """
+    Per-group log-bucket histogram (DDSketch style): values in (gamma^(k-1), gamma^k] share
+    bucket k, gamma = (1 + alpha) / (1 - alpha), so any quantile comes back within relative
+    error alpha. Values <= min_value are counted apart (as 0). Counts are sparse: one
+    (group, bucket) entry per bucket a group has actually hit, kept sorted by group then
+    bucket, so memory is bounded by min(values seen, ~ln(max / min) / ln(gamma)) per group
+    (about 350 for three decades at alpha 0.01) and many small groups (devices) stay cheap.
+    Mergeable by adding counts.
+    """
+    def __init__(self, alpha=0.01, min_value=1e-9):
+        self.gamma = (1.0 + alpha) / (1.0 - alpha)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.zeros = np.zeros(0, dtype=np.int64)
+        self.keys = np.zeros(0, dtype=np.int64)     # group << 32 | (bucket + 2^31), sorted
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.pending = []                           # (keys, counts) not yet folded into keys / counts
+        self.pending_n = 0
+
+    def grow(self, n_groups):
+        k = n_groups - len(self.zeros)
+        if k > 0:
+            self.zeros = np.concatenate([self.zeros, np.zeros(k, dtype=np.int64)])
+
+    def _add_keys(self, keys, counts):
+        # batches are folded in once they outgrow the sorted entries (amortized O(log n) per value)
+        self.pending.append((keys, counts))
+        self.pending_n += len(keys)
+        if self.pending_n > max(len(self.keys), 65536):
+            self._compact()
+
+    def _compact(self):
+        if not self.pending:
+            return
+        keys = np.concatenate([self.keys] + [k for k, _ in self.pending])
+        counts = np.concatenate([self.counts] + [np.asarray(c, dtype=np.int64) for _, c in self.pending])
+        self.keys, inv = np.unique(keys, return_inverse=True)
+        self.counts = np.bincount(inv.ravel(), weights=counts, minlength=len(self.keys)).astype(np.int64)
+        self.pending, self.pending_n = [], 0
+
+    def add(self, groups, values, n_groups):
+        self.grow(n_groups)
+        small = values <= self.min_value
+        if small.any():
+            np.add.at(self.zeros, groups[small], 1)
+            groups, values = groups[~small], values[~small]
+        if len(values):
+            k = np.ceil(np.log(values) / self.log_gamma).astype(np.int64)
+            self._add_keys((groups.astype(np.int64) << 32) | (k + _KEY_OFFSET), np.ones(len(k), dtype=np.int64))
+
+    def merge(self, other, index):
+        self.grow(int(index.max()) + 1 if len(index) else 0)
+        np.add.at(self.zeros, index, other.zeros)
+        other._compact()
+        if len(other.keys):
+            groups = index[other.keys >> 32]
+            self._add_keys((groups << 32) | (other.keys & _KEY_MASK), other.counts)
+
+    def quantiles(self, qs):
+        """groups x len(qs) bucket values at the nearest-rank quantiles (NaN for empty groups)."""
+        self._compact()
+        n = len(self.zeros)
+        groups = self.keys >> 32
+        values = 2.0 * self.gamma ** ((self.keys & _KEY_MASK) - _KEY_OFFSET) / (self.gamma + 1.0)
+        cum = np.cumsum(self.counts)
+        total = self.zeros + np.bincount(groups, weights=self.counts, minlength=n).astype(np.int64)
+        # counts of the groups before each group, as an offset into cum
+        before = np.concatenate([[0], np.cumsum(total - self.zeros)[:-1]]) if n else np.zeros(0, dtype=np.int64)
+        out = np.full((n, len(qs)), np.nan)
+        has = total > 0
+        for j, q in enumerate(qs):
+            target = np.maximum(np.ceil(q * total[has]), 1)
+            rank = target - self.zeros[has]
+            col = np.zeros(len(rank))
+            bucket = rank > 0
+            idx = np.searchsorted(cum, before[has][bucket] + rank[bucket])
+            col[bucket] = values[idx]
+            out[has, j] = col
+        return out
+
+
+class GroupStats:
+    """Moments + sketch per series, SLA moments and status counts for the groups of one dimension."""
+    def __init__(self, alpha):
+        self.alpha = alpha
+        self.tasks = np.zeros(0, dtype=np.int64)
+        self.status = np.zeros((0, len(CATEGORIES["status"])), dtype=np.int64)
+        self.sla = Moments()
+        self.moments = {c: Moments() for c in SERIES}
+        self.sketches = {c: LogSketch(alpha) for c in SERIES}
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def grow(self, n_groups):
+        k = n_groups - len(self.tasks)
+        if k > 0:
+            self.tasks = np.concatenate([self.tasks, np.zeros(k, dtype=np.int64)])
+            self.status = np.concatenate([self.status, np.zeros((k, self.status.shape[1]), dtype=np.int64)])
+
+    def add(self, groups, cols, n_groups):
+        """groups: group index per row; cols: column -> values of the same rows."""
+        self.grow(n_groups)
+        n_groups = len(self.tasks)
+        self.tasks += np.bincount(groups, minlength=n_groups)
+        status = cols["status"].astype(np.int64)
+        ok = status >= 0
+        self.status += np.bincount(groups[ok] * self.status.shape[1] + status[ok],
+                                   minlength=self.status.size).reshape(self.status.shape)
+        v = cols["sla_violation"]
+        ok = ~np.isnan(v)
+        if ok.any():
+            self.sla.add(groups[ok], v[ok], n_groups)
+        for c in SERIES:
+            v = cols[c]
+            ok = ~np.isnan(v)
+            if ok.any():
+                self.moments[c].add(groups[ok], v[ok], n_groups)
+                self.sketches[c].add(groups[ok], v[ok], n_groups)
+
+    def merge(self, other, index):
+        if not len(other):
+            return
+        self.grow(int(index.max()) + 1)
+        np.add.at(self.tasks, index, other.tasks)
+        np.add.at(self.status, index, other.status)
+        self.sla.merge(other.sla, index[:len(other.sla.n)])
+        for c in SERIES:
+            self.moments[c].merge(other.moments[c], index[:len(other.moments[c].n)])
+            self.sketches[c].merge(other.sketches[c], index[:len(other.sketches[c].zeros)])
+
+    def summary(self):
+        """List of per-group dicts with the sim_metrics_summary.csv columns + percentiles."""
+        n = len(self)
+        tasks = self.tasks.astype(np.float64)
+
+        def per_group(a, fill=np.nan):
+            out = np.full(n, fill)
+            out[:len(a)] = a
+            return out
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cols = {
+                "num_tasks": self.tasks,
+                "sla_violation_rate": np.where(per_group(self.sla.n, 0.0) > 0, per_group(self.sla.mean), np.nan),
+                "drop_rate": np.where(tasks > 0, self.status[:, _DROP] / tasks, 0.0),
+                "hit_rate": np.where(tasks > 0, self.status[:, _HIT] / tasks, 0.0),
+            }
+            for c, stem in SERIES.items():
+                m = self.moments[c]
+                cols[f"avg_{stem}"] = np.where(per_group(m.n, 0.0) > 0, per_group(m.mean), np.nan)
+                if c == "total_latency_ms":
+                    cols["std_latency_ms"] = per_group(m.std())
+                qv = self.sketches[c].quantiles(QUANTILES)
+                lo, hi = per_group(m.lo, np.inf), per_group(m.hi, -np.inf)
+                for j, q in enumerate(QUANTILES):
+                    # the bucket value, clamped to the exact range seen
+                    cols[f"p{round(q * 100)}_{stem}"] = np.clip(per_group(qv[:, j]), lo, hi)
+        order = SUMMARY_COLUMNS + PERCENTILE_COLUMNS
+        return [{k: cols[k][g].item() for k in order} for g in range(n)]
+
+
+class OnlineMetrics:
+    """
+    Streaming summary metrics over the task log. feed() consumes the rows appended since
+    the last call, vectorized per block, into O(1)-memory-per-group statistics (Welford
+    moments + LogSketch quantiles within relative error alpha) for the whole run and per
+    decision type, server node and device (config metrics_groups).
+    With metrics_interval_s > 0 the rows fed since the last emission are also summarized
+    as one interval row at the first feed at or after each interval boundary (feeds happen
+    at controller round boundaries); metrics_interval_path streams those rows to a CSV.
+    """
+    def __init__(self, config):
+        self.alpha = float(config.get("metrics_alpha", 0.01))
+        self.dimensions = tuple(d for d in config.get("metrics_groups", DIMENSIONS) if d in DIMENSIONS)
+        self.feed_rows = int(config.get("metrics_feed_rows", 4096))
+        self.interval_s = float(config.get("metrics_interval_s") or 0)
+        self.interval_path = config.get("metrics_interval_path")
+        self.next_emit = self.interval_s if self.interval_s else math.inf
+        self.last_emit = 0.0
+        self.fed = 0                # task log rows consumed
+        self.total = GroupStats(self.alpha)
+        self.groups = {d: GroupStats(self.alpha) for d in self.dimensions}
+        self.servers = {}           # server node -> group index
+        self.window = GroupStats(self.alpha)
+        self.intervals = []
+
+    def maybe_feed(self, log, now, flush_rows=None):
+        """feed() once feed_rows rows are pending, an interval is due or the log is about to flush."""
+        if (len(log) - self.fed >= self.feed_rows or now >= self.next_emit
+                or (log.flush_path is not None and flush_rows is not None and log.n >= flush_rows)):
+            self.feed(log, now)
+
+    def feed(self, log, now):
+        """Consume the log rows appended since the last feed (they must still be in memory)."""
+        if len(log) > self.fed:
+            self.add(self._pending(log), log.device_numbers(self.fed))
+            self.fed = len(log)
+        if now >= self.next_emit:
+            self.emit(now)
+            self.next_emit = (now // self.interval_s + 1) * self.interval_s
+
+    def _pending(self, log):
+        return {c: log.codes(c, self.fed) for c in ("status", "sla_violation", "decision", "server_node", *SERIES)}
+
+    def add(self, cols, devices):
+        n = len(cols["status"])
+        zeros = np.zeros(n, dtype=np.int64)
+        self.total.add(zeros, cols, 1)
+        if self.interval_s:
+            self.window.add(zeros, cols, 1)
+        for d, stats in self.groups.items():
+            if d == "decision":
+                g = cols["decision"].astype(np.int64)
+                ok = g >= 0
+                k = len(CATEGORIES["decision"])
+            elif d == "server":
+                srv = cols["server_node"]
+                ok = ~np.isnan(srv)
+                g = np.zeros(n, dtype=np.int64)
+                if ok.any():
+                    uniq, inv = np.unique(srv[ok], return_inverse=True)
+                    g[ok] = np.array([self.servers.setdefault(s, len(self.servers)) for s in uniq.tolist()])[inv]
+                k = len(self.servers)
+            else:
+                g = devices
+                ok = g >= 0
+                k = int(g.max()) + 1 if ok.any() else 0
+            if ok.any():
+                stats.add(g[ok], {c: a[ok] for c, a in cols.items()}, max(k, len(stats)))
+
+    def emit(self, now):
+        """Close the current interval: summary row of the rows fed since the last emission."""
+        if not len(self.window):
+            self.last_emit = now
+            return None
+        row = dict(interval_start_s=self.last_emit, interval_end_s=now, **self.window.summary()[0])
+        self.intervals.append(row)
+        if self.interval_path:
+            new = not os.path.exists(self.interval_path) or os.path.getsize(self.interval_path) == 0
+            with open(self.interval_path, "a", newline="") as f:
+                w = csv.DictWriter(f, fieldnames=list(row))
+                if new:
+                    w.writeheader()
+                w.writerow(row)
+        self.window = GroupStats(self.alpha)
+        self.last_emit = now
+        return row
+
+    def close(self, log, now):
+        """Final feed; the rows fed since the last emission become the last interval."""
+        self.feed(log, now)
+        if self.interval_s:
+            self.emit(now)
+
+    def summary(self):
+        """Whole-run dict: the sim_metrics_summary.csv columns + p50/p95/p99 of each series."""
+        rows = self.total.summary()
+        return rows[0] if rows else dict.fromkeys(SUMMARY_COLUMNS + PERCENTILE_COLUMNS, np.nan)
+
+    def percentiles(self, log=None):
+        """Whole-run percentiles; with log, the rows not fed yet are included without consuming them."""
+        total = self.total
+        if log is not None and len(log) > self.fed:
+            total = copy.deepcopy(total)
+            total.add(np.zeros(len(log) - self.fed, dtype=np.int64), self._pending(log), 1)
+        rows = total.summary()
+        s = rows[0] if rows else dict.fromkeys(PERCENTILE_COLUMNS, np.nan)
+        return {k: s[k] for k in PERCENTILE_COLUMNS}
+
+    def labels(self, dimension):
+        if dimension == "decision":
+            return list(CATEGORIES["decision"])
+        if dimension == "server":
+            return [k for k, _ in sorted(self.servers.items(), key=lambda kv: kv[1])]
+        return [f"dev_{i}" for i in range(len(self.groups[dimension]))]
+
+    def group_rows(self):
+        rows = [dict(dimension="all", group="all", **self.summary())]
+        for d, stats in self.groups.items():
+            rows.extend(dict(dimension=d, group=label, **r)
+                        for label, r in zip(self.labels(d), stats.summary()) if r["num_tasks"])
+        return rows
+
+    def merge(self, other):
+        """Fold another run's statistics in (e.g. a shard's); intervals are not merged."""
+        self.total.merge(other.total, np.zeros(1, dtype=np.int64))
+        for d, stats in self.groups.items():
+            theirs = other.groups.get(d)
+            if theirs is None:
+                continue
+            if d == "server":
+                index = np.array([self.servers.setdefault(s, len(self.servers)) for s in other.labels(d)], dtype=np.int64)
+            else:
+                index = np.arange(len(theirs), dtype=np.int64)
+            stats.merge(theirs, index)
+        self.fed += other.fed
+        return self
+
+    def save(self, outdir, intervals=True):
+        """sim_metrics_groups.csv (per decision / server / device) and metrics_intervals.csv."""
+        _write_csv(os.path.join(outdir, "sim_metrics_groups.csv"), self.group_rows())
+        if intervals and self.interval_s:
+            _write_csv(os.path.join(outdir, "metrics_intervals.csv"), self.intervals)
+
+    def __getstate__(self):
+        # checkpoints remember how much of the interval file belongs to this state
+        state = dict(self.__dict__)
+        path = self.interval_path
+        state["interval_bytes"] = os.path.getsize(path) if path and os.path.exists(path) else None
+        return state
+
+    def truncate_intervals(self):
+        """Cut the interval file back to the rows this (restored) state had written when it was pickled."""
+        size = self.__dict__.pop("interval_bytes", None)
+        if self.interval_path and os.path.exists(self.interval_path):
+            with open(self.interval_path, "r+b") as f:
+                f.truncate(size or 0)
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        if rows:
+            w = csv.DictWriter(f, fieldnames=list(rows[0]))
+            w.writeheader()
+            w.writerows(rows)
@@ -0,0 +1,127 @@
+import contextlib, cProfile, functools, os, time, tracemalloc
+
+# phase -> (attribute of Simulator holding the object, method names)
+PHASES = {
+    "decide": ("scheduler", ["decide", "decide_batch"]),
+    "find_path": ("network", ["get_route", "k_shortest_routes"]),   # Yen calls get_route inside: timed once
+    "can_transmit": ("network", ["can_transmit"]),
+    "reserve": ("network", ["reserve_access_and_path"]),
+    "cleanup": ("network", ["expire", "access_cleanup", "cleanup_links"]),
+    "fog_dispatch": (None, ["run_offload", "run_cloud"]),
+    "logging": ("task_log", ["append"]),
+    "controller_update": ("controller", ["update_round"]),
+}
+
+PROFILE_COLUMNS = ["name", "kind", "count", "total_s", "mean_us", "share"]
+
+class Profiler:
+    """
+    Cumulative wall time and call count per phase of a Simulator run.
+    Phases are instrumented by replacing the bound methods of one simulator's objects with
+    timed wrappers, so nothing is added to the hot path unless a Profiler is attached.
+    Timers are inclusive (can_transmit also contains the link cleanup it triggers); a phase
+    re-entered from itself is counted once.
+    """
+    def __init__(self):
+        self.time_s = {}
+        self.calls = {}
+        self.counters = {}
+        self.wall_s = 0.0
+        self._depth = {}
+        self._wrapped = []
+
+    def wrap(self, obj, method, phase):
+        fn = getattr(obj, method)
+        time_s, calls, depth = self.time_s, self.calls, self._depth
+        time_s.setdefault(phase, 0.0)
+        calls.setdefault(phase, 0)
+        depth.setdefault(phase, 0)
+        clock = time.perf_counter
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            if depth[phase]:
+                # nested call of the same phase (decide_batch -> decide): already being timed
+                return fn(*args, **kwargs)
+            depth[phase] = 1
+            t0 = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                time_s[phase] += clock() - t0
+                calls[phase] += 1
+                depth[phase] = 0
+        setattr(obj, method, timed)
+        self._wrapped.append((obj, method))
+
+    def attach(self, sim):
+        for phase, (attr, methods) in PHASES.items():
+            obj = getattr(sim, attr) if attr else sim
+            for m in methods:
+                self.wrap(obj, m, phase)
+        return self
+
+    def detach(self):
+        """Remove the wrappers again (the accumulated timings are kept)."""
+        for obj, method in self._wrapped:
+            delattr(obj, method)
+        self._wrapped = []
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def rows(self):
+        rows = [{"name": "run", "kind": "timer", "count": 1, "total_s": self.wall_s,
+                 "mean_us": self.wall_s * 1e6, "share": 1.0}]
+        for phase, t in self.time_s.items():
+            n = self.calls[phase]
+            rows.append({"name": phase, "kind": "timer", "count": n, "total_s": t,
+                         "mean_us": t / n * 1e6 if n else 0.0,
+                         "share": t / self.wall_s if self.wall_s > 0 else 0.0})
+        for name, v in self.counters.items():
+            rows.append({"name": name, "kind": "counter", "count": v, "total_s": None,
+                         "mean_us": None, "share": None})
+        return rows
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.rows(), columns=PROFILE_COLUMNS)
+
+    def save(self, outdir="Results"):
+        path = os.path.join(outdir, "profile.csv")
+        self.to_frame().to_csv(path, index=False)
+        return path
+
+
+@contextlib.contextmanager
+def profiled(profiler=None, cprofile_path=None, trace_memory=False):
+    """
+    Wrap a run: measures its wall time into profiler.wall_s, optionally dumps cProfile
+    stats to cprofile_path (open with pstats / snakeviz) and records the tracemalloc
+    peak as the counter tracemalloc_peak_bytes.
+    """
+    prof = cProfile.Profile() if cprofile_path else None
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    if prof is not None:
+        prof.enable()
+    try:
+        yield profiler
+    finally:
+        if prof is not None:
+            prof.disable()
+        wall = time.perf_counter() - t0
+        if profiler is not None:
+            profiler.wall_s += wall
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            if profiler is not None:
+                prev = profiler.counters.get("tracemalloc_peak_bytes", 0)
+                profiler.counters["tracemalloc_peak_bytes"] = max(prev, peak)
+            if started_tracing:
+                tracemalloc.stop()
+        if prof is not None:
+            os.makedirs(os.path.dirname(cprofile_path) or ".", exist_ok=True)
+            prof.dump_stats(cprofile_path)
@@ -0,0 +1,124 @@
+import heapq
+import math
+from bisect import bisect_left
+
+SMALL_STORE = 16   # below this many entries a plain scan is as fast and sums bits in insertion order
+
+class ReservationStore:
+    """
+    Active bandwidth reservations of one link (or one device access link).
+    - expiry: min-heap keyed by finish time, so cleanup(now) only touches expired entries
+    - window queries: starts kept sorted with running bit sums, plus a running total of
+      active bits, so the usual admission check (cleanup at `now`, window starting at `now`)
+      is O(log n) instead of a scan over every reservation.
+    Same semantics as the old list of dicts: a reservation counts in [window_start, window_end)
+    unless finish <= window_start or start >= window_end.
+    """
+    def __init__(self, listener=None):
+        self.listener = listener   # callback(store, delta) on every add (+1) and expiry (-n)
+        self.scheduled_finish = None   # finish time this store is queued under in Network's expiry heap
+        self._heap = []          # (finish, seq, start, bits, task_id)
+        self._starts = []        # sorted start times (may still hold expired entries until compaction)
+        self._cum = [0.0]        # _cum[i] = sum of bits of _starts[:i]
+        self._start_bits = []    # bits aligned with _starts
+        self._seq = 0
+        self.active_bits = 0.0
+        self.last_cleanup = float("-inf")
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+    def __iter__(self):
+        for finish, _, start, bits, task_id in sorted(self._heap, key=lambda e: e[1]):
+            yield {"start": start, "finish": finish, "bits": bits, "task_id": task_id}
+
+    @property
+    def next_finish(self):
+        return self._heap[0][0] if self._heap else None
+
+    def add(self, start, finish, bits, task_id=None):
+        heapq.heappush(self._heap, (finish, self._seq, start, bits, task_id))
+        self._seq += 1
+        self.active_bits += bits
+        if not self._starts or start >= self._starts[-1]:
+            self._starts.append(start)
+            self._start_bits.append(bits)
+            self._cum.append(self._cum[-1] + bits)
+        else:
+            i = bisect_left(self._starts, start)
+            self._starts.insert(i, start)
+            self._start_bits.insert(i, bits)
+            self._rebuild_cum(i)
+        if self.listener is not None:
+            self.listener(self, 1)
+
+    def cleanup(self, now):
+        heap = self._heap
+        removed = 0
+        while heap and heap[0][0] <= now:
+            self.active_bits -= heapq.heappop(heap)[3]
+            removed += 1
+        if now > self.last_cleanup:
+            self.last_cleanup = now
+        if not heap:
+            self.active_bits = 0.0
+            self._starts, self._start_bits, self._cum = [], [], [0.0]
+        elif len(self._starts) > 2 * len(heap) + 64:
+            self._compact()
+        if removed and self.listener is not None:
+            self.listener(self, -removed)
+        return removed
+
+    def bits_in_window(self, window_start, window_end):
+        heap = self._heap
+        if not heap:
+            return 0.0
+        if len(heap) <= SMALL_STORE or window_end <= window_start or window_end <= self.last_cleanup:
+            # small store, or expired-but-uncompacted starts could fall in the window: answer exactly
+            return self._scan(window_start, window_end)
+        # starting at/after the window end (no expired entry can: its start <= finish <= last_cleanup)
+        late = self._cum[-1] - self._cum[bisect_left(self._starts, window_end)]
+        early = 0.0
+        if heap[0][0] <= window_start:
+            early = self._bits_finished_by(window_start)
+        if late == 0.0 and early == 0.0:
+            return self.active_bits
+        return self.active_bits - late - early
+
+    def _bits_finished_by(self, t):
+        heap = self._heap
+        s = 0.0
+        stack = [0]
+        while stack:
+            i = stack.pop()
+            if i < len(heap) and heap[i][0] <= t:
+                s += heap[i][3]
+                stack.append(2 * i + 1)
+                stack.append(2 * i + 2)
+        return s
+
+    def _scan(self, window_start, window_end):
+        s = 0.0
+        for finish, _, start, bits, _ in sorted(self._heap, key=lambda e: e[1]):
+            if finish <= window_start or start >= window_end:
+                continue
+            s += bits
+        return s
+
+    def _rebuild_cum(self, i):
+        cum = self._cum[:i + 1]
+        acc = cum[-1]
+        for b in self._start_bits[i:]:
+            acc += b
+            cum.append(acc)
+        self._cum = cum
+
+    def _compact(self):
+        active = sorted((start, bits) for _, _, start, bits, _ in self._heap)
+        self._starts = [a[0] for a in active]
+        self._start_bits = [a[1] for a in active]
+        self._rebuild_cum(0)
+        self.active_bits = math.fsum(self._start_bits)
@@ -1,71 +1,171 @@
 # Modules/scheduler.py
-from .maths import processing_time_ms
-from .utils import snap_time
+import logging
+import numpy as np
+from .utils import device_index
+from .simlog import get_logger
+
+log = get_logger("scheduler")
+
+BATCH_MIN = 8   # below this many same-tick tasks the per-task path is cheaper than NumPy set-up
 
 class Scheduler:
     def __init__(self, device_weights, config, network):
         self.device_weights = device_weights
         self.config = config
         self.network = network
-        self.server_nodes = [nid for nid, n in network.nodes.items() if n.get("color") == "blue"]
-
-    def pick_destination_server(self):
-        best = None
-        best_load = float("inf")
-        for s in self.server_nodes:
-            load = 0
-            for nbr, link in self.network.adj[s]:
-                load += len(link.reservations)
-            load += len(self.network.access_reservations.get(s, []))
-            if load < best_load:
-                best_load = load
-                best = s
-        return best
+        self.set_server_nodes([nid for nid, n in network.nodes.items() if n.get("color") == "blue"])
+        self.debug = log.isEnabledFor(logging.DEBUG)
+        # offload admission: "shortest" (only the shortest path), "first_fit" (first of the
+        # k shortest paths with capacity) or "least_loaded" (k paths by load-adjusted cost)
+        self.routing = config.get("routing", "shortest")
+        self.k_paths = config.get("k_paths", 3)
+        if self.routing not in ("shortest", "first_fit", "least_loaded"):
+            raise ValueError(f"unknown routing {self.routing!r}")
+
+    def set_server_nodes(self, server_nodes):
+        """Offload destinations; their least-loaded LoadIndex is built once here, not per decision."""
+        self.server_nodes = list(server_nodes)
+        self.server_index = self.network.load_index(self.server_nodes)
+
+    def pick_destination_server(self, now=None):
+        if now is not None:
+            self.network.expire(now)
+        return self.server_index.least_loaded()
+
+    def device_node(self, dev):
+        dev_node = self.network.device_to_node.get(dev)
+        if dev_node is None:
+            dev_node = int(dev.split("_")[1]) % self.network.node_count
+        return dev_node
 
     def decide(self, task, time_now):
         """
         Return (decision, path_nodes, path_links, meta)
         decision in {'local', 'offload', 'drop_by_capacity'}
+        task must carry the costs.CostModel columns (size_bits, local_norm, fog_ms).
         """
         dev = task["device_id"]
-        w = self.device_weights.get(dev, self.config["initial_weights"])
-        local_time_ms, _ = processing_time_ms(task["size_kb"], self.config["device_cpu_hz"], self.config["cycles_per_byte"])
-        local_norm = local_time_ms / task["deadline_ms"] if task["deadline_ms"]>0 else float('inf')
+        w_local, w_offload = self.device_weights.get(dev)
 
-        dest = self.pick_destination_server()
+        dest = self.pick_destination_server(now=time_now)
         if dest is None:
             return "local", None, None, {"reason":"no_server"}
 
-        dev_node = self.network.device_to_node.get(dev)
-        if dev_node is None:
-            dev_node = int(dev.split("_")[1]) % self.network.node_count
+        dev_node = self.device_node(dev)
 
-        path_nodes, path_links = self.network.find_path(dev_node, dest, weight="rtt")
-    
-        if path_nodes is None:
+        route = self.network.get_route(dev_node, dest, weight="rtt")
+        if route is None:
             return "local", None, None, {"reason":"no_path"}
 
         # estimate offload time
-        size_bytes = task["size_kb"] * 1024.0
-        size_bits = size_bytes * 8.0
-        tx_s = 0.0
-        for link in path_links:
-            tx_s += size_bits / link.bw_bps
-        fog_proc_ms, _ = processing_time_ms(task["size_kb"], self.config["fog_cpu_hz"], self.config["cycles_per_byte"])
-        offload_time_ms = (tx_s * 1000.0) + fog_proc_ms
+        size_bits = task["size_bits"]
+        offload_time_ms = size_bits * route.tx_s_per_bit * 1000.0 + task["fog_ms"]
         offload_norm = offload_time_ms / task["deadline_ms"] if task["deadline_ms"]>0 else float('inf')
 
-        score_local = w["w_local"] * local_norm
-        score_offload = w["w_offload"] * offload_norm
+        score_local = w_local * task["local_norm"]
+        score_offload = w_offload * offload_norm
 
         if score_local <= score_offload:
             return "local", None, None, {"reason":"score_local"}
         
         # else try offload -> check capacity including device access
-        ok, blocking = self.network.can_transmit(path_links, size_bits, src_node=dev_node, now=time_now, safety_factor=1)
-        if ok:
-            reservations = self.network.reserve_access_and_path(path_links, size_bits, src_node=dev_node, now=time_now, task_id=task["task_id"])
-            print("dfas")
-            return "offload", path_nodes, path_links, {"reservations": reservations}
-        else:
-            return "drop_by_capacity", None, [blocking], {"reason":"link_capacity","blocking":blocking}
+        return self.admit(task["task_id"], dev_node, dest, route, size_bits, time_now)
+
+    def candidate_routes(self, dev_node, dest, route, size_bits, time_now):
+        """
+        Routes to try in order for an offload (route = the shortest one), per self.routing.
+        first_fit is lazy: the k shortest paths are only computed once the shortest is blocked.
+        """
+        if self.routing == "shortest":
+            return [route]
+        if self.routing == "first_fit":
+            return self._first_fit_routes(dev_node, dest, route)
+        routes = self.network.k_shortest_routes(dev_node, dest, self.k_paths, weight="rtt")
+        if self.routing == "least_loaded":
+            def cost(route):
+                # propagation + time to push the already reserved bits and this task through each link
+                self.network.cleanup_links(route.links, time_now)
+                c = 0.0
+                for link in route.links:
+                    c += link.rtt_s + (link.reservations.active_bits + size_bits) / link.bw_bps
+                return c
+            routes = sorted(routes, key=cost)
+        return routes
+
+    def _first_fit_routes(self, dev_node, dest, route):
+        yield route
+        yield from self.network.k_shortest_routes(dev_node, dest, self.k_paths, weight="rtt")[1:]
+
+    def admit(self, task_id, dev_node, dest, route, size_bits, time_now):
+        """
+        Reserve the device access link and the first candidate path with capacity.
+        Returns an offload decision (meta tx_ms: transmit time over the chosen path), or
+        drop_by_capacity with the shortest path's blocking link (or the access link, which
+        no alternative path avoids).
+        """
+        first_blocking = None
+        for r in self.candidate_routes(dev_node, dest, route, size_bits, time_now):
+            ok, blocking = self.network.can_transmit(r.links, size_bits, src_node=dev_node, now=time_now, safety_factor=1)
+            if ok:
+                reservations = self.network.reserve_access_and_path(r.links, size_bits, src_node=dev_node, now=time_now, task_id=task_id)
+                if self.debug:
+                    log.debug("task %s offload %s -> %s", task_id, dev_node, dest)
+                return "offload", r.nodes, r.links, {"reservations": reservations, "tx_ms": size_bits * r.tx_s_per_bit * 1000.0}
+            if first_blocking is None:
+                first_blocking = blocking
+            if blocking[0] == "access_link":
+                break
+        return "drop_by_capacity", None, [first_blocking], {"reason":"link_capacity","blocking":first_blocking}
+
+    def decide_batch(self, tasks, time_now):
+        """
+        decide() for all tasks arriving at the same tick, in order; returns the list of
+        (decision, path_nodes, path_links, meta). Local/offload scores are computed as arrays
+        per candidate server (lazily, once per server actually picked); offloads are then
+        admitted one by one and the least-loaded server re-picked after each admission, so the
+        result equals calling decide() task by task.
+        """
+        if len(tasks) < BATCH_MIN:
+            return [self.decide(t, time_now) for t in tasks]
+        n = len(tasks)
+        deadline = np.fromiter((t["deadline_ms"] for t in tasks), dtype=np.float64, count=n)
+        size_bits = np.fromiter((t["size_bits"] for t in tasks), dtype=np.float64, count=n)
+        fog_ms = np.fromiter((t["fog_ms"] for t in tasks), dtype=np.float64, count=n)
+        devs = [t["device_id"] for t in tasks]
+        w_local, w_offload = self.device_weights.lookup([device_index(d) for d in devs])
+        positive = deadline > 0
+        safe_deadline = np.where(positive, deadline, 1.0)
+        score_local = w_local * np.fromiter((t["local_norm"] for t in tasks), dtype=np.float64, count=n)
+        dev_nodes = [self.device_node(d) for d in devs]
+
+        scored = {}
+
+        def score(dest):
+            # routes and "local wins" flags of the whole batch when offloading to dest;
+            # weights and clock are fixed within the batch, so each server is scored once
+            if dest in scored:
+                return scored[dest]
+            routes = [self.network.get_route(dn, dest, weight="rtt") for dn in dev_nodes]
+            per_bit = np.fromiter((r.tx_s_per_bit if r is not None else 0.0 for r in routes), dtype=np.float64, count=n)
+            offload_ms = size_bits * per_bit * 1000.0 + fog_ms
+            score_offload = w_offload * np.where(positive, offload_ms / safe_deadline, np.inf)
+            scored[dest] = routes, score_local <= score_offload
+            return scored[dest]
+
+        results = []
+        dest = self.pick_destination_server(now=time_now)
+        for i, task in enumerate(tasks):
+            if dest is None:
+                results.append(("local", None, None, {"reason":"no_server"}))
+                continue
+            routes, local_wins = score(dest)
+            route = routes[i]
+            if route is None:
+                results.append(("local", None, None, {"reason":"no_path"}))
+                continue
+            if local_wins[i]:
+                results.append(("local", None, None, {"reason":"score_local"}))
+                continue
+            results.append(self.admit(task["task_id"], dev_nodes[i], dest, route, task["size_bits"], time_now))
+            dest = self.pick_destination_server()
+        return results
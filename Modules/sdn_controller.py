@@ -1,4 +1,41 @@
-import pandas as pd
+import numpy as np
+from .utils import device_index
+from .tasklog import CODES
+
+DECISION_LOCAL = CODES["decision"]["local"]
+DECISION_OFFLOAD = CODES["decision"]["offload"]
+STATUS_HIT = CODES["status"]["hit"]
+
+
+class DeviceWeights:
+    """
+    Per-device scheduling weights as NumPy arrays indexed by device number (dev_i -> i).
+    Devices outside the array fall back to the initial weights.
+    """
+    def __init__(self, num_devices, initial_weights):
+        self.initial = {"w_local": initial_weights["w_local"], "w_offload": initial_weights["w_offload"]}
+        self.w_local = np.full(num_devices, initial_weights["w_local"], dtype=np.float64)
+        self.w_offload = np.full(num_devices, initial_weights["w_offload"], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.w_local)
+
+    def get(self, dev):
+        """-> (w_local, w_offload) as python floats"""
+        i = device_index(dev)
+        if 0 <= i < len(self.w_local):
+            return float(self.w_local[i]), float(self.w_offload[i])
+        return self.initial["w_local"], self.initial["w_offload"]
+
+    def lookup(self, idx):
+        """Array version of get() for device numbers idx -> (w_local, w_offload) arrays."""
+        idx = np.asarray(idx, dtype=np.int64)
+        inside = (idx >= 0) & (idx < len(self.w_local))
+        safe = np.where(inside, idx, 0)
+        w_local = np.where(inside, self.w_local[safe], self.initial["w_local"])
+        w_offload = np.where(inside, self.w_offload[safe], self.initial["w_offload"])
+        return w_local, w_offload
+
 
 class SDNController:
     def __init__(self, device_weights, config):
@@ -6,29 +43,59 @@ class SDNController:
         self.lr = config["learning_rate"]
 
     def update_weights(self, recent_logs):
-        df = pd.DataFrame(recent_logs)
-        if df.empty:
+        """
+        recent_logs: list of per-task dicts or dict of columns with device_id / decision / status
+        (strings, as written to sim_task_logs.csv).
+        """
+        if isinstance(recent_logs, dict):
+            cols = recent_logs
+        else:
+            cols = {c: [row[c] for row in recent_logs] for c in ("device_id", "decision", "status")}
+        if not len(cols["device_id"]):
             return
+        devices = np.fromiter((device_index(d) for d in cols["device_id"]), dtype=np.int64, count=len(cols["device_id"]))
+        decisions = np.array([CODES["decision"].get(d, -1) for d in cols["decision"]], dtype=np.int8)
+        statuses = np.array([CODES["status"].get(s, -1) for s in cols["status"]], dtype=np.int8)
+        self.update_round(devices, decisions, statuses)
 
+    def update_round(self, devices, decisions, statuses):
+        """
+        Vectorized round update over one round of records (device numbers + TaskLog codes).
+        Matches the record-by-record rule: each offload record moves w_local by
+        +lr*0.05 when offloads violated SLA more often than local runs, each local record by
+        -lr*0.03 in the opposite case, clipping to [0, 1] after every step; every device in
+        the round then gets w_offload = 1 - w_local.
+        """
+        if len(devices) == 0:
+            return
+        devices = np.asarray(devices)
+        violation = np.asarray(statuses) != STATUS_HIT
+        off = np.asarray(decisions) == DECISION_OFFLOAD
+        loc = np.asarray(decisions) == DECISION_LOCAL
 
-        df["sla_violation"] = df["status"].apply(lambda x: 0 if x=="hit" else 1)
-
-        off_df = df[df.decision=="offload"]
-        loc_df = df[df.decision=="local"]
-
-        off_rate = off_df.sla_violation.mean() if not off_df.empty else 0.0
-        loc_rate = loc_df.sla_violation.mean() if not loc_df.empty else 0.0
+        off_rate = violation[off].mean() if off.any() else 0.0
+        loc_rate = violation[loc].mean() if loc.any() else 0.0
 
-        for _, rec in df.iterrows():
-            dev = rec.device_id
-            if rec.decision == "offload" and off_rate > loc_rate:
-                delta = 0.05
-            elif rec.decision == "local" and loc_rate > off_rate:
-                delta = -0.03
-            else:
-                delta = 0.0
+        # at most one of the two branches moves weights in a round, so all non-zero steps
+        # of a device are equal and can be applied as "k repeated clipped steps"
+        if off_rate > loc_rate:
+            step, movers = self.lr * 0.05, devices[off]
+        elif loc_rate > off_rate:
+            step, movers = self.lr * -0.03, devices[loc]
+        else:
+            step, movers = 0.0, devices[:0]
 
-            wold_local = self.device_weights[dev]["w_local"]
-            wnew_local = min(1.0, max(0.0, wold_local + self.lr*delta))
-            self.device_weights[dev]["w_local"] = wnew_local
-            self.device_weights[dev]["w_offload"] = 1.0 - wnew_local
+        w_local = self.device_weights.w_local
+        n = len(w_local)
+        if len(movers):
+            k = np.bincount(movers, minlength=n)[:n]
+            moved = np.flatnonzero(k)
+            w = w_local[moved]
+            k = k[moved]
+            for i in range(int(k.max())):
+                live = k > i
+                w[live] = np.minimum(1.0, np.maximum(0.0, w[live] + step))
+            w_local[moved] = w
+        touched = np.unique(devices)
+        touched = touched[(touched >= 0) & (touched < n)]
+        self.device_weights.w_offload[touched] = 1.0 - w_local[touched]
@@ -0,0 +1,186 @@
+import asyncio, json, time
+import numpy as np
+from .engine import Simulator, build_network
+from .sdn_controller import SDNController, DeviceWeights
+from .simlog import get_logger
+from .utils import to_ticks, RESOLUTION
+
+log = get_logger("service")
+
+REQUIRED_FIELDS = ("task_id", "device_id", "size_kb", "deadline_ms")
+
+class DecisionService:
+    """
+    Online offloading decisions over the offline model: a Simulator with no task stream
+    holds the network, scheduler, controller state and task log. Each request is decided
+    at the current wall clock mapped to simulation time
+    (sim_time = elapsed wall seconds * time_scale) and its outcome applied like an arrival,
+    so reservations, worker pools and the log evolve as in a run. Every round_size tasks
+    the controller update is computed on a copy of the weights in a worker thread and
+    swapped in when done; decisions keep using the previous weights meanwhile.
+    Memory stays bounded: once service_log_rows rows are held, the task log rows (already
+    fed to the online metrics and handed to the controller) are flushed to
+    task_log_flush_path, or dropped without one; only the last service_keep_intervals
+    interval rows are kept in memory.
+    """
+    def __init__(self, config, network=None, time_scale=None):
+        self.config = config
+        self.sim = Simulator(config, tasks=[], network=network if network is not None else build_network(config))
+        self.time_scale = float(time_scale or config.get("service_time_scale", 1.0))
+        self.log_rows = config.get("service_log_rows", 100000) or None
+        self.keep_intervals = int(config.get("service_keep_intervals", 100))
+        self.t0 = time.monotonic()
+        self.decided = 0
+        self.rounds = 0
+        self._rounds = asyncio.Queue()
+        self._updater = None
+
+    def sim_tick(self):
+        return max(to_ticks((time.monotonic() - self.t0) * self.time_scale), self.sim.tick)
+
+    def sim_time(self):
+        return self.sim_tick() * RESOLUTION
+
+    def decide(self, task):
+        """Decide one task descriptor now; returns the response dict (synchronous, no awaits)."""
+        missing = [f for f in REQUIRED_FIELDS if f not in task]
+        if missing:
+            return {"task_id": task.get("task_id"), "error": f"missing fields: {', '.join(missing)}"}
+        sim = self.sim
+        if task["device_id"] not in sim.device_busy_until:
+            return {"task_id": task["task_id"], "error": f"unknown device {task['device_id']}"}
+        sim.tick = self.sim_tick()
+        sim.now = sim.tick * RESOLUTION
+        task = sim.costs.annotate_one(dict(task, creation_time_s=sim.now))
+        decision = sim.scheduler.decide(task, sim.now)
+        sim.apply_decision(task, decision)
+        self.decided += 1
+        kind, path_nodes, _, meta = decision
+        out = {"task_id": task["task_id"], "decision": kind, "sim_time_s": sim.now,
+               "server_node": path_nodes[-1] if path_nodes else None, "path": path_nodes}
+        if "reason" in meta:
+            out["reason"] = meta["reason"]
+        self._maybe_end_round()
+        return out
+
+    def _maybe_end_round(self):
+        sim = self.sim
+        log_ = sim.task_log
+        if len(log_) - sim.round_start >= self.config["round_size"]:
+            # copies: the log keeps growing while the update runs
+            self._rounds.put_nowait((log_.device_numbers(sim.round_start).copy(),
+                                     log_.codes("decision", sim.round_start).copy(),
+                                     log_.codes("status", sim.round_start).copy()))
+            sim.round_start = len(log_)
+            sim.online.maybe_feed(log_, sim.now, sim.flush_rows)
+            if self.log_rows is not None and log_.n >= self.log_rows:
+                sim.online.feed(log_, sim.now)
+                if log_.flush_path is not None:
+                    log_.flush()
+                else:
+                    log_.discard()
+            else:
+                log_.maybe_flush(sim.flush_rows)
+            intervals = sim.online.intervals
+            if len(intervals) > self.keep_intervals:
+                del intervals[:len(intervals) - self.keep_intervals]
+
+    def _compute_round(self, devices, decisions, statuses):
+        dw = self.sim.device_weights
+        shadow = DeviceWeights(0, dw.initial)
+        shadow.w_local, shadow.w_offload = dw.w_local.copy(), dw.w_offload.copy()
+        SDNController(shadow, self.config).update_round(devices, decisions, statuses)
+        return shadow.w_local, shadow.w_offload
+
+    async def _update_rounds(self):
+        loop = asyncio.get_running_loop()
+        dw = self.sim.device_weights
+        while True:
+            devices, decisions, statuses = await self._rounds.get()
+            w_local, w_offload = await loop.run_in_executor(None, self._compute_round, devices, decisions, statuses)
+            # in-place swap on the loop thread, between two decisions
+            dw.w_local[:] = w_local
+            dw.w_offload[:] = w_offload
+            self.sim.weight_history.record()
+            self.rounds += 1
+
+    def start(self):
+        """Start the background controller task (needs a running event loop)."""
+        if self._updater is None:
+            self._updater = asyncio.get_running_loop().create_task(self._update_rounds())
+        return self
+
+    async def stop(self):
+        if self._updater is not None:
+            self._updater.cancel()
+            try:
+                await self._updater
+            except asyncio.CancelledError:
+                pass
+            self._updater = None
+
+    async def serve_queue(self, requests):
+        """In-process mode: consume (task, future) pairs from an asyncio.Queue; None stops."""
+        self.start()
+        while True:
+            item = await requests.get()
+            if item is None:
+                return
+            task, fut = item
+            if fut.cancelled():
+                continue
+            try:
+                fut.set_result(self.decide(task))
+            except Exception as e:
+                # fail this request only; the queue keeps being served
+                fut.set_exception(e)
+
+    async def handle_connection(self, reader, writer):
+        """Socket mode: newline-delimited JSON task descriptors in, one JSON response line each out."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    out = self.decide(json.loads(line))
+                except (ValueError, TypeError, KeyError) as e:
+                    out = {"error": f"bad request: {e}"}
+                writer.write(json.dumps(out).encode() + b"\n")
+                if writer.transport.get_write_buffer_size() > 65536:
+                    await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, unix_path=None, ready=None):
+        """Serve over TCP (host, port) or a Unix socket (unix_path) until cancelled."""
+        self.start()
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_connection, path=unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+        log.info("decision service listening on %s", unix_path or server.sockets[0].getsockname())
+        if ready is not None:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
+
+
+def latency_summary(latencies_s, wall_s):
+    """p50/p99/max decision latency (ms) and sustained requests/s of a load-generator run."""
+    lat = np.asarray(latencies_s, dtype=np.float64) * 1000.0
+    n = len(lat)
+    return {
+        "requests": n,
+        "wall_s": round(wall_s, 4),
+        "requests_per_s": round(n / wall_s, 1) if wall_s > 0 else float("inf"),
+        "p50_ms": round(float(np.percentile(lat, 50)), 4) if n else None,
+        "p99_ms": round(float(np.percentile(lat, 99)), 4) if n else None,
+        "max_ms": round(float(lat.max()), 4) if n else None,
+    }
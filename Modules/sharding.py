@@ -0,0 +1,258 @@
+import contextlib, multiprocessing, os, tempfile
+from collections import deque
+import numpy as np
+from .engine import Simulator, build_network, with_overrides
+from .metrics import summarize
+from .cache import build_workload, cached_workload, read_topology
+from .simlog import get_logger
+from .taskio import open_columnar, task_dicts
+from .utils import to_ticks
+
+log = get_logger("sharding")
+
+# Sharded mode: devices and topology regions are split across worker processes, one
+# Simulator each. Every fog server belongs to exactly one region and only serves that
+# region's devices, so server queues stay shard-local; links are shared, so the link
+# reservations each shard makes are exchanged at the end of every time window.
+# Windows are [t, t + lookahead) clock ticks from the earliest pending event over all shards, with
+# lookahead = default_rtt_s (the one-hop latency, i.e. how stale a remote reservation may be).
+#
+# With more than one shard this is a different, regional model (SHARDED_MODEL), not the
+# sequential one run in parallel:
+#   - a device only offloads to its own region's servers (the sequential scheduler picks the
+#     least-loaded server of the whole network), so decisions and server queues differ;
+#   - other shards' link reservations arrive at window end, so the sync is not conservative;
+#   - every shard runs its own SDN controller rounds over its own devices.
+# Merged outputs of such runs carry model / shards columns in sim_metrics_summary.csv.
+# The regional server choice dominates the deviation and it grows with the number of
+# regions: on the default config 2 shards lose ~9% of the queue delay and double the (small)
+# hit rate, 3 shards already fall outside SHARD_TOLERANCE and 4 halve the queue delay.
+# SHARD_TOLERANCE is the deviation from the sequential summary that benchmarks/check_sharded
+# and the tests accept for 2 shards on the default config; one shard is exact.
+SHARDED_MODEL = "regional_approximation"
+
+# summary metric -> (absolute tolerance, relative tolerance); a metric passes if either holds
+SHARD_TOLERANCE = {
+    "num_tasks": (0, 0.0),
+    "drop_rate": (0.0, 0.03),
+    "hit_rate": (0.025, 0.0),
+    "avg_latency_ms": (0.0, 0.01),
+    "avg_queue_delay_ms": (0.0, 0.12),
+}
+
+
+def shard_deviations(seq_metrics, metrics, tolerance=None):
+    """{metric: (sequential, sharded)} for the tolerance metrics outside their tolerance."""
+    out = {}
+    for k, (abs_tol, rel_tol) in (tolerance or SHARD_TOLERANCE).items():
+        a, b = seq_metrics[k], metrics[k]
+        if a != a and b != b:
+            continue
+        if not (abs(a - b) <= abs_tol or abs(a - b) <= rel_tol * abs(a)):
+            out[k] = (a, b)
+    return out
+
+def partition_regions(network, n_shards, servers):
+    """
+    Split the topology into n_shards connected regions, each grown by BFS from one fog
+    server (seeds picked farthest-first by hop count). Returns dict node -> shard.
+    """
+    if not servers:
+        raise ValueError("sharded mode needs fog (blue) servers")
+    n_shards = max(1, min(n_shards, len(servers)))
+
+    def hops_from(sources):
+        dist = {s: 0 for s in sources}
+        q = deque(sources)
+        while q:
+            u = q.popleft()
+            for v, _ in network.adj[u]:
+                if v not in dist:
+                    dist[v] = dist[u] + 1
+                    q.append(v)
+        return dist
+
+    seeds = [servers[0]]
+    while len(seeds) < n_shards:
+        dist = hops_from(seeds)
+        seeds.append(max((s for s in servers if s not in seeds),
+                         key=lambda s: dist.get(s, float("inf"))))
+
+    region = {s: k for k, s in enumerate(seeds)}
+    q = deque(seeds)
+    while q:
+        u = q.popleft()
+        for v, _ in network.adj[u]:
+            if v not in region:
+                region[v] = region[u]
+                q.append(v)
+    for k, n in enumerate(n for n in network.nodes if n not in region):
+        region[n] = k % n_shards    # unreachable nodes
+    return region
+
+
+def shard_tasks(workload_path, device_shard, shard, positions, chunk_size=100000):
+    """Stream the shard's tasks from a columnar workload; their global stream positions go to positions."""
+    cols, meta = open_columnar(workload_path)
+    for lo in range(0, meta["n_rows"], chunk_size):
+        dev = np.asarray(cols["device"][lo:lo + chunk_size])
+        idx = np.flatnonzero(device_shard[dev] == shard)
+        if len(idx):
+            positions.append(idx + lo)
+            yield from task_dicts({c: np.asarray(a[lo:lo + chunk_size])[idx] for c, a in cols.items()})
+
+
+def _shard_worker(shard, conn, config, topology, region_nodes, workload_path, device_shard, outdir):
+    positions = []
+    sim = Simulator(config, tasks=shard_tasks(workload_path, device_shard, shard, positions),
+                    network=build_network(config, topology=topology))
+    network = sim.network
+    sim.scheduler.set_server_nodes([s for s in sim.scheduler.server_nodes if s in region_nodes])
+    link_index = {id(link): i for i, link in enumerate(network.links)}
+
+    outbox = []
+    reserve_on_path = network.reserve_on_path
+
+    def recording_reserve_on_path(path_links, size_kb, now, task_id=None):
+        reservations = reserve_on_path(path_links, size_kb, now, task_id=task_id)
+        outbox.extend((link_index[id(r["link"])], r["start"], r["finish"], r["bits"], task_id) for r in reservations)
+        return reservations
+    network.reserve_on_path = recording_reserve_on_path
+
+    conn.send(sim.peek_tick())
+    while True:
+        msg = conn.recv()
+        if msg[0] == "window":
+            _, end, inbox = msg
+            for idx, start, finish, bits, task_id in inbox:
+                # stats (total_reserved_bits) stay with the shard that made the reservation
+                network.links[idx].reservations.add(start, finish, bits, task_id=task_id)
+            sim._loop(end - 1)
+            conn.send((outbox, sim.peek_tick()))
+            outbox = []
+        else:
+            sim.save(outdir)
+            pos = np.concatenate(positions) if positions else np.empty(0, dtype=np.int64)
+            conn.send((pos, network.snapshot_link_stats(), sim.events_processed, sim.online))
+            conn.close()
+            return
+
+
+def _merge_link_stats(per_shard):
+    rows = []
+    for stats in zip(*per_shard):
+        row = dict(stats[0])
+        for key in ("total_reserved_bits", "total_dropped_bits", "drop_count"):
+            row[key] = sum(s[key] for s in stats)
+        # every shard also holds the (slightly stale) reservations of the others
+        row["active_reservations"] = max(s["active_reservations"] for s in stats)
+        rows.append(row)
+    return rows
+
+
+def _merge_weights(shard_dirs, device_shard, outdir):
+    import pandas as pd
+    # devices are disjoint across shards; rounds are numbered per shard
+    deltas, snaps = [], []
+    for k, d in enumerate(shard_dirs):
+        df = pd.read_csv(os.path.join(d, "weights.csv"))
+        deltas.append(df.assign(shard=k))
+        s = pd.read_csv(os.path.join(d, "weights_snapshots.csv"))
+        s = s[device_shard[s["device"].to_numpy(dtype=np.int64)] == k]
+        snaps.append(s.assign(shard=k))
+    deltas = pd.concat(deltas, ignore_index=True)
+    deltas.to_csv(os.path.join(outdir, "weights.csv"), index=False)
+    pd.concat(snaps, ignore_index=True).sort_values(["round", "device"], kind="stable").to_csv(
+        os.path.join(outdir, "weights_snapshots.csv"), index=False)
+    return deltas
+
+
+def run_sharded(config, n_shards, outdir="Results", workdir=None, lookahead_s=None):
+    """
+    Run config split over n_shards processes and write the merged outputs to outdir
+    (per-shard outputs under outdir/shards/shard_<k>). Returns the merged summary metrics
+    plus shards / windows / events.
+    The merged task log is in the sequential engine's order (global arrival order); with
+    n_shards=1 every output equals the sequential run's. More shards run the approximate
+    regional model (SHARDED_MODEL, see the module comment), labelled as such in the
+    summary.
+    """
+    config = with_overrides(config, {"checkpoint_path": None})
+    lookahead_s = lookahead_s or config.get("shard_lookahead_s") or config["default_rtt_s"]
+    topology = read_topology(config)
+    network = build_network(config, topology=topology)
+    network.attach_devices(config["num_devices"])
+    servers = [n for n, a in network.nodes.items() if a.get("color") == "blue"]
+    region = partition_regions(network, n_shards, servers)
+    n_shards = max(region.values()) + 1
+    if n_shards > 1:
+        log.warning("sharded run over %d regions is the approximate %s model, not the sequential one "
+                    "(devices offload within their region only)", n_shards, SHARDED_MODEL)
+    device_shard = np.array([region[network.device_to_node[f"dev_{i}"]] for i in range(config["num_devices"])],
+                            dtype=np.int32)
+
+    os.makedirs(outdir, exist_ok=True)
+    shard_dirs = [os.path.join(outdir, "shards", f"shard_{k}") for k in range(n_shards)]
+    for d in shard_dirs:
+        os.makedirs(d, exist_ok=True)
+    with contextlib.ExitStack() as stack:
+        if workdir is None:
+            workdir = stack.enter_context(tempfile.TemporaryDirectory(prefix="shards_"))
+        if config.get("cache_dir"):
+            workload = cached_workload(config)
+        else:
+            workload = build_workload(config, os.path.join(workdir, "workload"))
+
+        conns, procs = [], []
+        for k in range(n_shards):
+            shard_config = dict(config)
+            if config.get("task_log_flush_path"):
+                shard_config["task_log_flush_path"] = os.path.join(shard_dirs[k], "sim_task_logs.csv")
+            if config.get("metrics_interval_path"):
+                shard_config["metrics_interval_path"] = os.path.join(shard_dirs[k], "metrics_intervals_live.csv")
+            parent, child = multiprocessing.Pipe()
+            p = multiprocessing.Process(target=_shard_worker, daemon=True,
+                                        args=(k, child, shard_config, topology,
+                                              {n for n, s in region.items() if s == k},
+                                              workload, device_shard, shard_dirs[k]))
+            p.start()
+            conns.append(parent)
+            procs.append(p)
+
+        next_times = [c.recv() for c in conns]
+        outboxes = [[] for _ in conns]
+        windows = 0
+        while any(t is not None for t in next_times):
+            start = min(t for t in next_times if t is not None)
+            end = start + max(1, to_ticks(lookahead_s))
+            for k, c in enumerate(conns):
+                c.send(("window", end, [r for j, box in enumerate(outboxes) if j != k for r in box]))
+            replies = [c.recv() for c in conns]
+            outboxes = [box for box, _ in replies]
+            next_times = [t for _, t in replies]
+            windows += 1
+        for c in conns:
+            c.send(("finish",))
+        finished = [c.recv() for c in conns]
+        for p in procs:
+            p.join()
+
+    # merge the partitions back into one run's outputs
+    import pandas as pd
+    positions = np.concatenate([pos for pos, _, _, _ in finished])
+    frames = [pd.read_csv(os.path.join(d, "sim_task_logs.csv"), float_precision="round_trip") for d in shard_dirs]
+    logs = pd.concat(frames, ignore_index=True).iloc[np.argsort(positions, kind="stable")]
+    logs.to_csv(os.path.join(outdir, "sim_task_logs.csv"), index=False)
+    _, metrics = summarize(logs)
+    online = finished[0][3]
+    for _, _, _, other in finished[1:]:
+        online.merge(other)
+    metrics.update(online.percentiles())
+    if n_shards > 1:
+        metrics.update(model=SHARDED_MODEL, shards=n_shards)
+    online.save(outdir, intervals=False)   # interval rows stay per shard
+    pd.DataFrame([metrics]).to_csv(os.path.join(outdir, "sim_metrics_summary.csv"), index=False)
+    pd.DataFrame(_merge_link_stats([stats for _, stats, _, _ in finished])).to_csv(
+        os.path.join(outdir, "link_utilization.csv"), index=False)
+    _merge_weights(shard_dirs, device_shard, outdir)
+    return dict(metrics, shards=n_shards, windows=windows, events=sum(e for _, _, e, _ in finished))
@@ -0,0 +1,39 @@
+import logging
+
+LOGGER_NAME = "sim"
+
+class SampleFilter(logging.Filter):
+    """Pass every `every`-th record per call site (file, line); WARNING and above always pass."""
+    def __init__(self, every=1):
+        super().__init__()
+        self.every = max(1, int(every or 1))
+        self.seen = {}
+
+    def filter(self, record):
+        if self.every == 1 or record.levelno >= logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno)
+        n = self.seen.get(key, 0)
+        self.seen[key] = n + 1
+        return n % self.every == 0
+
+
+def get_logger(name=None):
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def configure_logging(config):
+    """
+    Set up the "sim" logger from config: log_level (DEBUG/INFO/WARNING/...) and
+    log_sample_every (keep 1 in N DEBUG/INFO records per call site).
+    """
+    logger = get_logger()
+    logger.setLevel(str(config.get("log_level", "WARNING")).upper())
+    for h in list(logger.handlers):
+        logger.removeHandler(h)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    handler.addFilter(SampleFilter(config.get("log_sample_every", 1)))
+    logger.addHandler(handler)
+    logger.propagate = False
+    return logger
@@ -0,0 +1,104 @@
+import contextlib, itertools, json, os, tempfile
+from concurrent.futures import ProcessPoolExecutor
+from .engine import Simulator, build_network, with_overrides
+from .cache import build_workload, cached_workload, read_topology, workload_key
+from .taskio import iter_tasks
+
+def expand_grid(grid=None, runs=None):
+    """
+    grid: {key: [values]} -> cartesian product of overrides; runs: explicit list of override dicts.
+    Both may be given; grid combinations come first.
+    """
+    out = []
+    if grid:
+        keys = list(grid)
+        for values in itertools.product(*(grid[k] for k in keys)):
+            out.append(dict(zip(keys, values)))
+    out.extend(dict(r) for r in (runs or []))
+    return out or [{}]
+
+
+# set once per worker process by _init_worker
+_BASE_CONFIG = None
+_TOPOLOGIES = None
+
+# output files a run writes; each run gets its own copy (<name>_run<index><ext>)
+PER_RUN_PATHS = ["task_log_flush_path", "checkpoint_path", "profile_cprofile", "metrics_interval_path"]
+
+def _init_worker(base_config, topologies):
+    global _BASE_CONFIG, _TOPOLOGIES
+    _BASE_CONFIG = base_config
+    _TOPOLOGIES = topologies
+
+
+def _topology_key(config):
+    path = config.get("topology_path")
+    return path if isinstance(path, str) or path is None else json.dumps(path, sort_keys=True)
+
+
+def run_path(path, index):
+    root, ext = os.path.splitext(path)
+    return f"{root}_run{index}{ext}"
+
+
+def _param_value(v):
+    return json.dumps(v, sort_keys=True) if isinstance(v, (dict, list)) else v
+
+
+def run_one(index, overrides, workload_path):
+    config = with_overrides(_BASE_CONFIG, overrides)
+    # concurrent runs must not share output files
+    config.update({k: run_path(config[k], index) for k in PER_RUN_PATHS if config.get(k)})
+    sim = Simulator(config, tasks=iter_tasks(workload_path, "columnar"),
+                    network=build_network(config, topology=_TOPOLOGIES[_topology_key(config)]))
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        metrics = sim.run()
+    row = {"run": index}
+    row.update({k: _param_value(v) for k, v in overrides.items()})
+    row.update(metrics)
+    return row
+
+
+def run_sweep(base_config, overrides_list, workers=None, workdir=None, out_path=None):
+    """
+    Run one simulation per overrides dict in a process pool and return the combined
+    sim_metrics_summary rows (one per run, keyed by the override values).
+    Workloads are generated once per distinct cache.workload_key (or taken from
+    cache_dir) and memory-mapped by the workers; each distinct topology_path is parsed once
+    and handed to every worker at start-up. Output files named in PER_RUN_PATHS get a
+    _run<index> suffix per run.
+    """
+    configs = [with_overrides(base_config, o) for o in overrides_list]
+    with contextlib.ExitStack() as stack:
+        if workdir is None:
+            workdir = stack.enter_context(tempfile.TemporaryDirectory(prefix="sweep_"))
+        os.makedirs(workdir, exist_ok=True)
+
+        workloads = {}
+        for cfg in configs:
+            key = workload_key(cfg)
+            if key in workloads:
+                continue
+            if cfg.get("cache_dir"):
+                workloads[key] = cached_workload(cfg)
+            else:
+                workloads[key] = build_workload(cfg, os.path.join(workdir, f"workload_{len(workloads)}"))
+
+        topologies = {}
+        for cfg in configs:
+            key = _topology_key(cfg)
+            if key not in topologies:
+                topologies[key] = read_topology(cfg)
+
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=min(workers, len(configs)), initializer=_init_worker,
+                                 initargs=(base_config, topologies)) as ex:
+            futures = [ex.submit(run_one, i, o, workloads[workload_key(cfg)])
+                       for i, (o, cfg) in enumerate(zip(overrides_list, configs))]
+            rows = [f.result() for f in futures]
+
+    import pandas as pd
+    df = pd.DataFrame(rows)
+    if out_path:
+        df.to_csv(out_path, index=False)
+    return df
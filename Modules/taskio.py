@@ -0,0 +1,123 @@
+import json, os
+import numpy as np
+from .utils import TIME_DECIMALS
+
+# on-disk task formats:
+# - jsonl: one task dict per line (same fields as generate_tasks output)
+# - columnar: directory with one raw little-endian file per column + meta.json,
+#   appended chunk by chunk and read back through np.memmap
+
+TASK_COLUMNS = {
+    "device": "<i4",
+    "seq": "<i4",
+    "creation_time_s": "<f8",
+    "size_kb": "<f8",
+    "deadline_ms": "<f8",
+    "priority": "<i1",
+}
+
+def task_dicts(chunk):
+    """Column chunk (dict of arrays) -> list of task dicts."""
+    devs = chunk["device"].tolist()
+    seqs = chunk["seq"].tolist()
+    return [{
+        "task_id": f"task_{d}_{s}",
+        "device_id": f"dev_{d}",
+        "creation_time_s": t,
+        "size_kb": kb,
+        "deadline_ms": dl,
+        "priority": p
+    } for d, s, t, kb, dl, p in zip(devs, seqs, chunk["creation_time_s"].tolist(), chunk["size_kb"].tolist(),
+                                     chunk["deadline_ms"].tolist(), chunk["priority"].tolist())]
+
+
+class JsonlTaskWriter:
+    def __init__(self, path):
+        self.f = open(path, "w", encoding="utf-8")
+        self.n_rows = 0
+
+    def write(self, chunk):
+        # tick-grid times written at the tick's decimal places (0.0445, not 0.044500000000000005)
+        chunk = dict(chunk, creation_time_s=np.round(chunk["creation_time_s"], TIME_DECIMALS),
+                     deadline_ms=np.round(chunk["deadline_ms"], TIME_DECIMALS - 3))
+        self.f.writelines(json.dumps(t) + "\n" for t in task_dicts(chunk))
+        self.n_rows += len(chunk["device"])
+
+    def close(self):
+        self.f.close()
+
+
+class ColumnarTaskWriter:
+    def __init__(self, path, meta=None):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.meta = dict(meta or {})
+        self.files = {c: open(os.path.join(path, c + ".bin"), "wb") for c in TASK_COLUMNS}
+        self.n_rows = 0
+
+    def write(self, chunk):
+        for c, dt in TASK_COLUMNS.items():
+            np.ascontiguousarray(chunk[c], dtype=dt).tofile(self.files[c])
+        self.n_rows += len(chunk["device"])
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        meta = dict(self.meta, n_rows=self.n_rows, columns=TASK_COLUMNS)
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=1)
+
+
+def open_columnar(path):
+    """Memory-map a columnar task directory -> (dict column -> array, meta)."""
+    with open(os.path.join(path, "meta.json"), "r") as f:
+        meta = json.load(f)
+    n = meta["n_rows"]
+    cols = {}
+    for c, dt in meta["columns"].items():
+        if n == 0:
+            cols[c] = np.empty(0, dtype=dt)
+        else:
+            cols[c] = np.memmap(os.path.join(path, c + ".bin"), dtype=dt, mode="r", shape=(n,))
+    return cols, meta
+
+
+def task_columns(tasks):
+    """List of task dicts (task_<dev>_<seq> ids) -> column chunk."""
+    ids = [t["task_id"].split("_") for t in tasks]
+    return {
+        "device": np.array([int(i[1]) for i in ids], dtype=np.int32),
+        "seq": np.array([int(i[2]) for i in ids], dtype=np.int32),
+        "creation_time_s": np.array([t["creation_time_s"] for t in tasks], dtype=np.float64),
+        "size_kb": np.array([t["size_kb"] for t in tasks], dtype=np.float64),
+        "deadline_ms": np.array([t["deadline_ms"] for t in tasks], dtype=np.float64),
+        "priority": np.array([t["priority"] for t in tasks], dtype=np.int8),
+    }
+
+
+def task_writer(path, fmt):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if fmt == "jsonl":
+        return JsonlTaskWriter(path)
+    if fmt == "columnar":
+        return ColumnarTaskWriter(path)
+    raise ValueError(f"unknown task format: {fmt}")
+
+
+def iter_tasks(path, fmt="jsonl", chunk_size=100000):
+    """Stream task dicts from a jsonl file or columnar directory, in file order."""
+    if fmt == "jsonl":
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif fmt == "columnar":
+        cols, meta = open_columnar(path)
+        # small first chunks so the first task is ready at once, doubling up to chunk_size
+        i, step = 0, min(1024, chunk_size)
+        while i < meta["n_rows"]:
+            yield from task_dicts({c: a[i:i + step] for c, a in cols.items()})
+            i += step
+            step = min(2 * step, chunk_size)
+    else:
+        raise ValueError(f"unknown task format: {fmt}")
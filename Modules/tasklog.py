@@ -0,0 +1,217 @@
+import os
+import numpy as np
+from .utils import device_index
+
+# column -> kind; order is the sim_task_logs.csv column order
+# "f": float64 (None -> NaN), "cat": int8 code into CATEGORIES (-1 = missing),
+# "dict": int32 code into a per-log vocabulary, "str": object
+COLUMNS = {
+    "task_id": "str",
+    "device_id": "dict",
+    "decision": "cat",
+    "arrival_time_s": "f",
+    "queue_enter_time_s": "f",
+    "start_time_s": "f",
+    "end_time_s": "f",
+    "queue_delay_ms": "f",
+    "proc_delay_ms": "f",
+    "tx_delay_ms": "f",
+    "total_latency_ms": "f",
+    "energy_j": "f",
+    "deadline_ms": "f",
+    "status": "cat",
+    "drop_reason": "cat",
+    "sla_violation": "f",
+    "tier": "cat",
+    "server_node": "f",
+}
+
+CATEGORIES = {
+    "decision": ("local", "offload", "drop"),
+    "status": ("hit", "miss", "drop"),
+    "drop_reason": ("deadline_miss", "link_capacity"),
+    "tier": ("local", "fog", "cloud"),
+}
+
+CODES = {col: {v: i for i, v in enumerate(vals)} for col, vals in CATEGORIES.items()}
+
+_DTYPES = {"f": np.float64, "cat": np.int8, "dict": np.int32, "str": object}
+
+
+def parquet_schema():
+    """pyarrow schema of the task log, fixed up front so all-missing columns of a chunk keep their type."""
+    import pyarrow as pa
+    return pa.schema([(c, pa.float64() if kind == "f" else pa.string()) for c, kind in COLUMNS.items()])
+
+
+def has_pyarrow():
+    try:
+        import pyarrow
+        return True
+    except ImportError:
+        return False
+
+
+class TaskLog:
+    """
+    Struct-of-arrays task log: one growable NumPy column per field, categorical codes for
+    decision/status/drop_reason. With flush_path set, flush() appends the in-memory rows
+    to disk (CSV, or Parquet when the path ends in .parquet and pyarrow is installed,
+    otherwise the same path with a .csv suffix) and frees them, so memory stays bounded.
+    """
+    def __init__(self, capacity=4096, flush_path=None):
+        self.capacity = capacity
+        self.cols = {c: np.empty(capacity, dtype=_DTYPES[k]) for c, k in COLUMNS.items()}
+        self.n = 0                 # rows held in memory
+        self.offset = 0            # rows already flushed to disk
+        self.vocab = []            # device_id vocabulary
+        self.vocab_codes = {}
+        self.vocab_numbers = []    # device number per vocabulary entry (-1 if not "dev_<i>")
+        if flush_path is not None and flush_path.endswith(".parquet") and not has_pyarrow():
+            flush_path = flush_path[:-len(".parquet")] + ".csv"
+        self.flush_path = flush_path
+        self._parquet_writer = None
+
+    def __len__(self):
+        return self.offset + self.n
+
+    def _grow(self):
+        self.capacity *= 2
+        for c, a in self.cols.items():
+            b = np.empty(self.capacity, dtype=a.dtype)
+            b[:self.n] = a[:self.n]
+            self.cols[c] = b
+
+    def append(self, task_id, device_id, decision, arrival_time_s, queue_enter_time_s,
+               start_time_s=None, end_time_s=None, queue_delay_ms=None, proc_delay_ms=None,
+               tx_delay_ms=None, total_latency_ms=None, energy_j=None, deadline_ms=None,
+               status=None, drop_reason=None, tier=None, server_node=None):
+        if self.n == self.capacity:
+            self._grow()
+        i = self.n
+        cols = self.cols
+        code = self.vocab_codes.get(device_id)
+        if code is None:
+            code = self.vocab_codes[device_id] = len(self.vocab)
+            self.vocab.append(device_id)
+            try:
+                self.vocab_numbers.append(device_index(device_id))
+            except (ValueError, IndexError):
+                self.vocab_numbers.append(-1)
+        cols["task_id"][i] = task_id
+        cols["device_id"][i] = code
+        cols["decision"][i] = CODES["decision"][decision]
+        cols["status"][i] = -1 if status is None else CODES["status"][status]
+        cols["drop_reason"][i] = -1 if drop_reason is None else CODES["drop_reason"][drop_reason]
+        cols["tier"][i] = -1 if tier is None else CODES["tier"][tier]
+        for c, v in (("arrival_time_s", arrival_time_s), ("queue_enter_time_s", queue_enter_time_s),
+                     ("start_time_s", start_time_s), ("end_time_s", end_time_s),
+                     ("queue_delay_ms", queue_delay_ms), ("proc_delay_ms", proc_delay_ms),
+                     ("tx_delay_ms", tx_delay_ms), ("total_latency_ms", total_latency_ms),
+                     ("energy_j", energy_j), ("deadline_ms", deadline_ms), ("sla_violation", None),
+                     ("server_node", server_node)):
+            cols[c][i] = np.nan if v is None else v
+        self.n += 1
+
+    def codes(self, column, start=0):
+        """Raw code/float column for the in-memory rows from absolute index start (a view)."""
+        return self.cols[column][start - self.offset:self.n]
+
+    def device_numbers(self, start=0):
+        """Device number (dev_i -> i) of the in-memory rows from absolute index start."""
+        return np.asarray(self.vocab_numbers, dtype=np.int64)[self.codes("device_id", start)]
+
+    def columns(self, start=0, decode=True):
+        """
+        In-memory rows from absolute index start as dict column -> array.
+        decode=True maps codes back to strings (None for missing).
+        """
+        lo = start - self.offset
+        if lo < 0:
+            raise IndexError(f"rows before {self.offset} were flushed to {self.flush_path}")
+        out = {}
+        for c, kind in COLUMNS.items():
+            a = self.cols[c][lo:self.n]
+            if decode and kind == "cat":
+                a = np.array(CATEGORIES[c] + (None,), dtype=object)[a]
+            elif decode and kind == "dict":
+                a = np.array(self.vocab + [None], dtype=object)[a]
+            out[c] = a
+        return out
+
+    def _frame(self, start=0):
+        import pandas as pd
+        return pd.DataFrame(self.columns(start))
+
+    def flush(self):
+        """Append in-memory rows to flush_path and drop them from memory."""
+        if self.flush_path is None or (self.n == 0 and self.offset > 0):
+            return
+        df = self._frame(self.offset)
+        if self.flush_path.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            schema = parquet_schema()
+            table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.flush_path, schema)
+            self._parquet_writer.write_table(table)
+        else:
+            df.to_csv(self.flush_path, mode="w" if self.offset == 0 else "a", header=self.offset == 0, index=False)
+        self.offset += self.n
+        self.n = 0
+
+    def discard(self):
+        """Drop the in-memory rows without writing them anywhere (len() still counts them)."""
+        self.offset += self.n
+        self.n = 0
+
+    def maybe_flush(self, max_rows):
+        if self.flush_path is not None and self.n >= max_rows:
+            self.flush()
+
+    @property
+    def flushed(self):
+        return self.flush_path is not None and self.offset > 0
+
+    def close(self):
+        if self.flushed:
+            self.flush()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __getstate__(self):
+        # checkpoints remember how much of the flush file belongs to this state
+        if self._parquet_writer is not None:
+            raise ValueError("cannot checkpoint a task log that is streaming to parquet; use a .csv flush_path")
+        state = dict(self.__dict__)
+        state["flushed_bytes"] = os.path.getsize(self.flush_path) if self.flushed else None
+        return state
+
+    def truncate_flushed(self):
+        """Cut the flush file back to the rows this (restored) log had flushed when it was pickled."""
+        size = self.__dict__.pop("flushed_bytes", None)
+        if size is not None and self.flush_path is not None and os.path.exists(self.flush_path):
+            with open(self.flush_path, "r+b") as f:
+                f.truncate(size)
+
+    def iter_frames(self, chunksize=500000):
+        """All rows as DataFrame chunks: flushed ones read back from disk, then the in-memory tail."""
+        if self.flushed:
+            self.close()
+            if self.flush_path.endswith(".parquet"):
+                import pyarrow.parquet as pq
+                for batch in pq.ParquetFile(self.flush_path).iter_batches(batch_size=chunksize):
+                    yield batch.to_pandas()
+            else:
+                import pandas as pd
+                yield from pd.read_csv(self.flush_path, chunksize=chunksize)
+        elif self.n or not self.offset:
+            yield self._frame(self.offset)
+
+    def to_frame(self):
+        if not self.flushed:
+            return self._frame(self.offset)
+        import pandas as pd
+        return pd.concat(list(self.iter_frames()), ignore_index=True)
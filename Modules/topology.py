@@ -0,0 +1,166 @@
+import json
+import numpy as np
+
+GENERATORS = ("waxman", "barabasi_albert", "fat_tree")
+
+def node_link(n_nodes, edges, blue_fraction=0.25, seed=0, blue_nodes=None):
+    """
+    networkx-style node-link dict (the Data/topology.json format) for nodes 0..n_nodes-1.
+    max(1, round(blue_fraction * n_nodes)) random nodes (or the given blue_nodes) get color "blue".
+    """
+    if blue_nodes is None:
+        rng = np.random.default_rng(seed)
+        n_blue = max(1, int(round(blue_fraction * n_nodes)))
+        blue_nodes = rng.choice(n_nodes, size=min(n_blue, n_nodes), replace=False)
+    blue = set(int(b) for b in blue_nodes)
+    nodes = [{"id": i, "color": "blue"} if i in blue else {"id": i} for i in range(n_nodes)]
+    links = [{"source": int(u), "target": int(v)} for u, v in sorted(edges)]
+    return {"directed": False, "multigraph": False, "graph": {}, "nodes": nodes, "links": links}
+
+
+def _connect(n_nodes, edges, pos=None):
+    """Join every connected component to the first one with one edge (closest pair when pos is given)."""
+    parent = list(range(n_nodes))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for u, v in edges:
+        parent[find(u)] = find(v)
+    comps = {}
+    for i in range(n_nodes):
+        comps.setdefault(find(i), []).append(i)
+    comps = sorted(comps.values(), key=lambda c: c[0])
+    main = list(comps[0])
+    for comp in comps[1:]:
+        if pos is None:
+            u, v = main[0], comp[0]
+        else:
+            a, b = pos[np.asarray(main)], pos[np.asarray(comp)]
+            d = ((a[:, None, :] - b[None, :, :]) ** 2).sum(-1)
+            i, j = np.unravel_index(np.argmin(d), d.shape)
+            u, v = main[i], comp[j]
+        edges.add((min(u, v), max(u, v)))
+        main.extend(comp)
+    return edges
+
+
+def waxman(n_nodes, mean_degree=4.0, alpha=0.1, seed=0):
+    """
+    Waxman graph on the unit square: P(u~v) = beta * exp(-d / (alpha * L)), with beta chosen
+    so the expected degree is mean_degree; disconnected parts are joined at their closest nodes.
+    When even beta = 1 is too sparse for mean_degree (small graphs), alpha is raised instead.
+    """
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n_nodes, 2))
+    L = np.sqrt(2.0)
+    # distances of distinct node pairs: all of them for small graphs, a sample otherwise
+    if n_nodes * (n_nodes - 1) // 2 <= 500000:
+        u, v = np.triu_indices(n_nodes, k=1)
+    else:
+        u = rng.integers(0, n_nodes, size=100000)
+        v = (u + rng.integers(1, n_nodes, size=100000)) % n_nodes
+    pair_d = np.sqrt(((pos[u] - pos[v]) ** 2).sum(-1))
+    need = mean_degree / max(n_nodes - 1, 1)     # required mean of beta * exp(-d / (alpha L))
+    mean_w = lambda a: np.exp(-pair_d / (a * L)).mean() if len(pair_d) else 1.0
+    if mean_w(alpha) < need <= 1.0:
+        lo, hi = alpha, alpha
+        while mean_w(hi) < need:
+            hi *= 2.0
+        for _ in range(50):
+            mid = 0.5 * (lo + hi)
+            lo, hi = (mid, hi) if mean_w(mid) < need else (lo, mid)
+        alpha = hi
+    beta = min(1.0, need / max(mean_w(alpha), 1e-12))
+
+    edges = set()
+    block = max(1, 4000000 // max(n_nodes, 1))   # rows per block, bounds the pairwise matrix
+    for lo in range(0, n_nodes, block):
+        hi = min(n_nodes, lo + block)
+        d = np.sqrt(((pos[lo:hi, None, :] - pos[None, :, :]) ** 2).sum(-1))
+        p = beta * np.exp(-d / (alpha * L))
+        hit = rng.random(p.shape) < p
+        us, vs = np.nonzero(hit)
+        us = us + lo
+        keep = us < vs
+        edges.update(zip(us[keep].tolist(), vs[keep].tolist()))
+    return _connect(n_nodes, edges, pos)
+
+
+def barabasi_albert(n_nodes, m=2, seed=0):
+    """Barabási–Albert preferential attachment: each new node links to m existing nodes."""
+    rng = np.random.default_rng(seed)
+    m = max(1, min(m, n_nodes - 1))
+    edges = set()
+    targets = list(range(m))
+    repeated = []      # every node once per incident edge: uniform picks are degree-proportional
+    for new in range(m, n_nodes):
+        for t in set(targets):
+            edges.add((min(t, new), max(t, new)))
+        repeated.extend(targets)
+        repeated.extend([new] * m)
+        chosen = set()
+        while len(chosen) < m:
+            chosen.add(repeated[int(rng.integers(len(repeated)))])
+        targets = list(chosen)
+    return _connect(n_nodes, edges)
+
+
+def fat_tree(k=4):
+    """
+    k-ary fat-tree switches: (k/2)^2 core, then per pod k/2 aggregation + k/2 edge switches
+    (5k^2/4 nodes). Returns (n_nodes, edges, edge_switch_ids).
+    """
+    if k % 2:
+        raise ValueError("fat-tree k must be even")
+    half = k // 2
+    n_core = half * half
+    edges = set()
+    edge_switches = []
+    nid = n_core
+    for pod in range(k):
+        aggs = list(range(nid, nid + half))
+        edgs = list(range(nid + half, nid + k))
+        nid += k
+        edge_switches.extend(edgs)
+        for a_i, a in enumerate(aggs):
+            for c in range(a_i * half, (a_i + 1) * half):
+                edges.add((c, a))
+            for e in edgs:
+                edges.add((a, e))
+    return nid, edges, edge_switches
+
+
+def fat_tree_k(n_nodes):
+    """Smallest even k whose fat-tree has at least n_nodes switches."""
+    k = 2
+    while 5 * k * k // 4 < n_nodes:
+        k += 2
+    return k
+
+
+def generate_topology(kind="waxman", n_nodes=20, blue_fraction=0.25, seed=0, **params):
+    """
+    Synthetic topology as a node-link dict Network accepts directly.
+    kind: waxman (params mean_degree, alpha), barabasi_albert (m) or fat_tree
+    (k derived from n_nodes unless given; blue servers are drawn from the edge switches).
+    """
+    if kind == "waxman":
+        return node_link(n_nodes, waxman(n_nodes, seed=seed, **params), blue_fraction, seed)
+    if kind == "barabasi_albert":
+        return node_link(n_nodes, barabasi_albert(n_nodes, seed=seed, **params), blue_fraction, seed)
+    if kind == "fat_tree":
+        n, edges, edge_switches = fat_tree(params.get("k") or fat_tree_k(n_nodes))
+        rng = np.random.default_rng(seed)
+        n_blue = min(len(edge_switches), max(1, int(round(blue_fraction * n))))
+        return node_link(n, edges, blue_nodes=rng.choice(edge_switches, size=n_blue, replace=False))
+    raise ValueError(f"unknown topology generator {kind!r}; expected one of {GENERATORS}")
+
+
+def save_topology(topo, path):
+    with open(path, "w") as f:
+        json.dump(topo, f)
+    return path
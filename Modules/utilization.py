@@ -0,0 +1,134 @@
+import math, os
+import numpy as np
+
+class UtilizationSeries:
+    """
+    Reserved bits per row (link or access node) in fixed-width time buckets, in a
+    preallocated rows x buckets array. A reservation is two rate-change events (+r at start,
+    -r at finish, r = bits / duration), each O(1):
+        partial[row, b] += dr * (end of bucket b - t)      b = bucket of t
+        diff[row, b + 1] += dr                             rate carried into later buckets
+    so bits[:, b] = partial[:, b] + bucket_s * cumsum(diff)[:, b].
+    When an event falls past the last bucket the width doubles and neighbouring buckets are
+    merged (exact), so memory stays rows x max_buckets whatever the horizon.
+    Reservations are buffered and folded into the arrays FLUSH_EVENTS at a time with np.add.at.
+    """
+    FLUSH_EVENTS = 65536
+
+    def __init__(self, n_rows, bucket_s=1.0, max_buckets=4096, horizon_s=None):
+        self.bucket_s = float(bucket_s)
+        n = max_buckets
+        if horizon_s:
+            n = min(max_buckets, int(math.ceil(horizon_s / self.bucket_s)) + 1)
+        self.n_buckets = max(2, n + (n % 2))   # even, so buckets merge in pairs
+        self.partial = np.zeros((n_rows, self.n_buckets))
+        self.diff = np.zeros((n_rows, self.n_buckets + 1))
+        self.downsamples = 0
+        self._pending = []   # (row, start, finish, bits) not yet folded in
+
+    def _downsample(self):
+        p, d = self.partial, self.diff
+        # merged bucket: p[2b] + p[2b+1] + w*(C[2b] + C[2b+1]) == new_p + 2w*C[2b+1]
+        new_p = p[:, 0::2] + p[:, 1::2] - self.bucket_s * d[:, 1:-1:2]
+        new_d = d[:, :-1:2] + d[:, 1::2]
+        self.partial = np.zeros_like(p)
+        self.diff = np.zeros_like(d)
+        half = self.n_buckets // 2
+        self.partial[:, :half] = new_p
+        self.diff[:, :half] = new_d
+        self.diff[:, half] = d[:, -1]
+        self.bucket_s *= 2.0
+        self.downsamples += 1
+
+    def flush(self):
+        if not self._pending:
+            return
+        ev = np.array(self._pending, dtype=np.float64)
+        self._pending = []
+        rate = ev[:, 3] / (ev[:, 2] - ev[:, 1])
+        rows = np.concatenate([ev[:, 0], ev[:, 0]]).astype(np.int64)
+        t = np.concatenate([ev[:, 1], ev[:, 2]])
+        dr = np.concatenate([rate, -rate])
+        while t.max() // self.bucket_s >= self.n_buckets:
+            self._downsample()
+        b = (t // self.bucket_s).astype(np.int64)
+        np.add.at(self.partial, (rows, b), dr * ((b + 1) * self.bucket_s - t))
+        np.add.at(self.diff, (rows, b + 1), dr)
+
+    def add(self, row, start, finish, bits):
+        if finish > start:
+            self._pending.append((row, start, finish, bits))
+            if len(self._pending) >= self.FLUSH_EVENTS:
+                self.flush()
+
+    def bits(self):
+        """rows x buckets array of reserved bits per bucket."""
+        self.flush()
+        return self.partial + self.bucket_s * np.cumsum(self.diff[:, :-1], axis=1)
+
+
+class NetworkUtilization:
+    """UtilizationSeries over a Network: rows are its links (in Network.links order) then its nodes' access links."""
+    def __init__(self, network, bucket_s=1.0, max_buckets=4096, horizon_s=None):
+        self.links = network.links
+        self.link_row = {id(link): i for i, link in enumerate(self.links)}
+        self.nodes = list(network.nodes)
+        self.node_row = {n: len(self.links) + i for i, n in enumerate(self.nodes)}
+        self.labels = [("link", l.u, l.v, l.bw_bps) for l in network.links] + \
+                      [("access", n, -1, network.device_access_bw_bps) for n in self.nodes]
+        self.series = UtilizationSeries(len(self.labels), bucket_s, max_buckets, horizon_s)
+
+    def __setstate__(self, state):
+        # restored from a checkpoint: link objects are new, re-key the rows
+        self.__dict__.update(state)
+        self.link_row = {id(link): i for i, link in enumerate(self.links)}
+
+    def add_link(self, link, start, finish, bits):
+        self.series.add(self.link_row[id(link)], start, finish, bits)
+
+    def add_access(self, node, start, finish, bits):
+        row = self.node_row.get(node)
+        if row is not None:
+            self.series.add(row, start, finish, bits)
+
+    def utilization(self):
+        """rows x buckets fraction of capacity reserved."""
+        cap = np.array([c for _, _, _, c in self.labels], dtype=np.float64) * self.series.bucket_s
+        return self.series.bits() / np.where(cap > 0, cap, np.inf)[:, None]
+
+    def save(self, outdir):
+        """
+        link_utilization_ts.npz: bits (rows x buckets, float32), bucket_s and the row labels;
+        link_utilization_summary.csv: per row mean / p95 / peak utilization and the peak time.
+        """
+        import pandas as pd
+        bits = self.series.bits()
+        util = self.utilization()
+        kinds, u, v, cap = zip(*self.labels) if self.labels else ((), (), (), ())
+        np.savez_compressed(os.path.join(outdir, "link_utilization_ts.npz"),
+                            bits=bits.astype(np.float32), bucket_s=self.series.bucket_s,
+                            kind=np.array(kinds), u=np.array(u), v=np.array(v), capacity_bps=np.array(cap))
+        last = np.flatnonzero(bits.any(axis=0))
+        used = int(last[-1]) + 1 if len(last) else 0
+        util = util[:, :used]
+        peak_b = util.argmax(axis=1) if used else np.zeros(len(self.labels), dtype=np.int64)
+        df = pd.DataFrame({
+            "row": np.arange(len(self.labels)),
+            "kind": kinds, "u": u, "v": v, "capacity_bps": cap,
+            "mean_util": util.mean(axis=1) if used else 0.0,
+            "p95_util": np.percentile(util, 95, axis=1) if used else 0.0,
+            "peak_util": util.max(axis=1) if used else 0.0,
+            "peak_time_s": peak_b * self.series.bucket_s,
+            "busy_buckets": (util > 0).sum(axis=1) if used else 0,
+            "bucket_s": self.series.bucket_s,
+        })
+        df.to_csv(os.path.join(outdir, "link_utilization_summary.csv"), index=False)
+        return df
+
+
+def load_utilization(path):
+    """Read a link_utilization_ts.npz back -> (bits array, bucket_s, labels DataFrame)."""
+    import pandas as pd
+    with np.load(path) as z:
+        labels = pd.DataFrame({"kind": z["kind"], "u": z["u"], "v": z["v"], "capacity_bps": z["capacity_bps"]})
+        return z["bits"], float(z["bucket_s"]), labels
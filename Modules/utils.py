@@ -1,4 +1,15 @@
 RESOLUTION = 0.0001  # 0.1 ms
+TIME_DECIMALS = 4    # decimal places of a RESOLUTION tick (tick times are written rounded to these)
 
 def snap_time(t: float) -> float:
-    return round(t / RESOLUTION) * RESOLUTION
\ No newline at end of file
+    return round(t / RESOLUTION) * RESOLUTION
+
+def to_ticks(t: float) -> int:
+    # seconds -> integer clock ticks of RESOLUTION; to_ticks(t) * RESOLUTION == snap_time(t)
+    return round(t / RESOLUTION)
+
+def device_index(dev_id) -> int:
+    # "dev_17" -> 17 (ints pass through)
+    if isinstance(dev_id, str):
+        return int(dev_id.split("_")[1])
+    return int(dev_id)
@@ -0,0 +1,75 @@
+import os
+import numpy as np
+
+class WeightHistory:
+    """
+    Long-format weight history: after each controller round only the devices whose
+    weights changed are recorded as (round, device, w_local, w_offload).
+    Round 0 (initial weights) is always kept as a full snapshot; snapshot_every=N > 0
+    also keeps a full snapshot every N rounds so reconstruction never replays far.
+    Written as weights.csv (deltas) + weights_snapshots.csv (full snapshots).
+    """
+    def __init__(self, device_weights, snapshot_every=0):
+        self.device_weights = device_weights
+        self.snapshot_every = int(snapshot_every or 0)
+        self.rounds = 0
+        self.prev_local = device_weights.w_local.copy()
+        self.prev_offload = device_weights.w_offload.copy()
+        self.deltas = []       # (round, devices, w_local, w_offload) per round with changes
+        self.snapshots = [(0, self.prev_local.copy(), self.prev_offload.copy())]
+
+    def __len__(self):
+        return self.rounds
+
+    def record(self):
+        self.rounds += 1
+        wl = self.device_weights.w_local
+        wo = self.device_weights.w_offload
+        changed = np.flatnonzero((wl != self.prev_local) | (wo != self.prev_offload))
+        if len(changed):
+            self.deltas.append((self.rounds, changed, wl[changed].copy(), wo[changed].copy()))
+            self.prev_local[changed] = wl[changed]
+            self.prev_offload[changed] = wo[changed]
+        if self.snapshot_every and self.rounds % self.snapshot_every == 0:
+            self.snapshots.append((self.rounds, wl.copy(), wo.copy()))
+
+    @staticmethod
+    def _frame(rows):
+        import pandas as pd
+        if not rows:
+            return pd.DataFrame({"round": [], "device": [], "w_local": [], "w_offload": []})
+        return pd.DataFrame({
+            "round": np.concatenate([np.full(len(d), r) for r, d, _, _ in rows]),
+            "device": np.concatenate([d for _, d, _, _ in rows]),
+            "w_local": np.concatenate([wl for _, _, wl, _ in rows]),
+            "w_offload": np.concatenate([wo for _, _, _, wo in rows]),
+        })
+
+    def save(self, outdir):
+        deltas_df = self._frame(self.deltas)
+        deltas_df.to_csv(os.path.join(outdir, "weights.csv"), index=False)
+        snaps = [(r, np.arange(len(wl)), wl, wo) for r, wl, wo in self.snapshots]
+        self._frame(snaps).to_csv(os.path.join(outdir, "weights_snapshots.csv"), index=False)
+        return deltas_df
+
+
+def weights_at_round(outdir, round_no):
+    """
+    Rebuild the full weight matrix after round `round_no` from a saved WeightHistory.
+    Returns DataFrame(device, w_local, w_offload) with one row per device.
+    """
+    import pandas as pd
+    snaps = pd.read_csv(os.path.join(outdir, "weights_snapshots.csv"))
+    base_round = snaps.loc[snaps["round"] <= round_no, "round"].max()
+    base = snaps[snaps["round"] == base_round].sort_values("device")
+    w_local = base["w_local"].to_numpy(dtype=np.float64).copy()
+    w_offload = base["w_offload"].to_numpy(dtype=np.float64).copy()
+
+    deltas = pd.read_csv(os.path.join(outdir, "weights.csv"))
+    deltas = deltas[(deltas["round"] > base_round) & (deltas["round"] <= round_no)]
+    # rows are in round order: keep the latest value per device
+    deltas = deltas.drop_duplicates("device", keep="last")
+    dev = deltas["device"].to_numpy(dtype=np.int64)
+    w_local[dev] = deltas["w_local"].to_numpy()
+    w_offload[dev] = deltas["w_offload"].to_numpy()
+    return pd.DataFrame({"device": np.arange(len(w_local)), "w_local": w_local, "w_offload": w_offload})
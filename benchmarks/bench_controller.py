@@ -0,0 +1,99 @@
+"""
+SDNController round update: vectorized update_round vs the previous DataFrame/iterrows
+implementation. Asserts both give bit-identical weights (tests/test_controller.py checks the
+same on several sizes), then reports time per round.
+Run from the repo root:  python -m benchmarks.bench_controller [--devices 200 --round-size 100]
+"""
+import argparse, random, time
+import numpy as np
+import pandas as pd
+from Modules.sdn_controller import SDNController, DeviceWeights
+from Modules.tasklog import CODES
+
+class LegacySDNController:
+    # previous implementation, kept here as the parity reference
+    def __init__(self, device_weights, config):
+        self.device_weights = device_weights
+        self.lr = config["learning_rate"]
+
+    def update_weights(self, recent_logs):
+        df = pd.DataFrame(recent_logs)
+        if df.empty:
+            return
+        df["sla_violation"] = df["status"].apply(lambda x: 0 if x=="hit" else 1)
+        off_df = df[df.decision=="offload"]
+        loc_df = df[df.decision=="local"]
+        off_rate = off_df.sla_violation.mean() if not off_df.empty else 0.0
+        loc_rate = loc_df.sla_violation.mean() if not loc_df.empty else 0.0
+        for _, rec in df.iterrows():
+            dev = rec.device_id
+            if rec.decision == "offload" and off_rate > loc_rate:
+                delta = 0.05
+            elif rec.decision == "local" and loc_rate > off_rate:
+                delta = -0.03
+            else:
+                delta = 0.0
+            wold_local = self.device_weights[dev]["w_local"]
+            wnew_local = min(1.0, max(0.0, wold_local + self.lr*delta))
+            self.device_weights[dev]["w_local"] = wnew_local
+            self.device_weights[dev]["w_offload"] = 1.0 - wnew_local
+
+
+def random_round(rng, num_devices, round_size):
+    # few hot devices so repeated (and clipped) steps per round are exercised
+    hot = max(1, num_devices // 20)
+    recs = []
+    for _ in range(round_size):
+        d = rng.randrange(hot) if rng.random() < 0.3 else rng.randrange(num_devices)
+        decision = rng.choice(["local", "offload", "drop"])
+        status = "drop" if decision == "drop" else rng.choice(["hit", "miss", "drop"])
+        recs.append({"device_id": f"dev_{d}", "decision": decision, "status": status})
+    return recs
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--devices", type=int, default=200)
+    ap.add_argument("--round-size", type=int, default=100)
+    ap.add_argument("--rounds", type=int, default=200)
+    ap.add_argument("--learning-rate", type=float, default=2.0)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    config = {"learning_rate": args.learning_rate}
+    initial = {"w_local": 0.7, "w_offload": 0.3}
+    rng = random.Random(args.seed)
+    rounds = [random_round(rng, args.devices, args.round_size) for _ in range(args.rounds)]
+    arrays = [(np.array([int(r["device_id"][4:]) for r in rs]),
+               np.array([CODES["decision"][r["decision"]] for r in rs], dtype=np.int8),
+               np.array([CODES["status"][r["status"]] for r in rs], dtype=np.int8)) for rs in rounds]
+
+    legacy_w = {f"dev_{i}": dict(initial) for i in range(args.devices)}
+    legacy = LegacySDNController(legacy_w, config)
+    t0 = time.perf_counter()
+    for rs in rounds:
+        legacy.update_weights(rs)
+    t_legacy = (time.perf_counter() - t0) / args.rounds
+
+    weights = DeviceWeights(args.devices, initial)
+    ctrl = SDNController(weights, config)
+    t0 = time.perf_counter()
+    for devs, dec, st in arrays:
+        ctrl.update_round(devs, dec, st)
+    t_vec = (time.perf_counter() - t0) / args.rounds
+
+    for i in range(args.devices):
+        ref = legacy_w[f"dev_{i}"]
+        assert ref["w_local"] == weights.w_local[i] and ref["w_offload"] == weights.w_offload[i], \
+            f"dev_{i}: legacy {ref} vs vectorized ({weights.w_local[i]}, {weights.w_offload[i]})"
+
+    # the dict-of-columns path must agree as well
+    weights2 = DeviceWeights(args.devices, initial)
+    ctrl2 = SDNController(weights2, config)
+    for rs in rounds:
+        ctrl2.update_weights(rs)
+    assert np.array_equal(weights2.w_local, weights.w_local) and np.array_equal(weights2.w_offload, weights.w_offload)
+
+    print(f"parity ok over {args.rounds} rounds x {args.round_size} records, {args.devices} devices")
+    print(f"legacy     {t_legacy * 1e3:9.3f} ms/round")
+    print(f"vectorized {t_vec * 1e3:9.3f} ms/round  ({t_legacy / t_vec:.0f}x)")
@@ -0,0 +1,68 @@
+"""
+Event-loop throughput of Modules.engine.Simulator.
+Each case runs in a fresh process and reports events/s and peak RSS.
+Run from the repo root:
+    python -m benchmarks.bench_engine --tasks 3000 30000 --devices 200 2000 [--csv out.csv]
+"""
+import argparse, contextlib, csv, itertools, os, resource, time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+def run_case(num_tasks, num_devices, config_path, overrides):
+    from Modules.engine import Simulator, load_config
+    from Modules.generator import iter_task_chunks_np
+    from Modules.taskio import task_dicts
+
+    config = load_config(config_path, dict(overrides, num_tasks=num_tasks, num_devices=num_devices))
+    # workload is generated in memory (no Data/ writes) and streamed into the engine
+    tasks = (t for chunk in iter_task_chunks_np(config, chunk_size=config.get("task_chunk_size", 100000))
+             for t in task_dicts(chunk))
+    sim = Simulator(config, tasks=tasks)
+    t0 = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        sim.run()
+    wall = time.perf_counter() - t0
+    return {
+        "num_tasks": num_tasks,
+        "num_devices": num_devices,
+        "events": sim.events_processed,
+        "wall_s": round(wall, 4),
+        "events_per_s": round(sim.events_processed / wall, 1) if wall > 0 else float("inf"),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tasks", type=int, nargs="+", default=[3000, 30000])
+    ap.add_argument("--devices", type=int, nargs="+", default=[200])
+    ap.add_argument("--config", default="config.yml")
+    ap.add_argument("--set", nargs="*", default=[], metavar="KEY=VALUE",
+                    help="config overrides, values parsed as YAML")
+    ap.add_argument("--csv", default=None, help="also write the result rows to this CSV")
+    args = ap.parse_args(argv)
+
+    import yaml
+    overrides = {}
+    for kv in args.set:
+        k, v = kv.split("=", 1)
+        overrides[k] = yaml.safe_load(v)
+
+    rows = []
+    for n_tasks, n_dev in itertools.product(args.tasks, args.devices):
+        # fresh process per case so peak RSS is not inherited from earlier cases
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as ex:
+            row = ex.submit(run_case, n_tasks, n_dev, args.config, overrides).result()
+        rows.append(row)
+        print(" ".join(f"{k}={v}" for k, v in row.items()), flush=True)
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=list(rows[0]))
+            w.writeheader()
+            w.writerows(rows)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
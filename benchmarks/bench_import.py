@@ -0,0 +1,48 @@
+"""
+Import cost of the simulator entry points, measured with `python -X importtime` in a fresh
+interpreter per module: cumulative import time of the module, the slowest packages it
+pulls in and whether pandas got loaded (the engine path should not need it; pandas is
+imported lazily by the CSV / DataFrame outputs).
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --modules Modules.engine pandas --repeat 5
+"""
+import argparse, statistics, subprocess, sys
+
+MODULES = ["Modules.engine", "Modules.sharding", "Modules.sweep", "Modules.service", "numpy", "pandas"]
+
+def import_times(module):
+    """{package: (self_us, cumulative_us)} from one `python -X importtime -c 'import module'`."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in out.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cum_us))
+    return times
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--modules", nargs="+", default=MODULES)
+    ap.add_argument("--repeat", type=int, default=3, help="fresh interpreters per module (median reported)")
+    ap.add_argument("--top", type=int, default=3, help="slowest top-level packages to list")
+    args = ap.parse_args(argv)
+
+    rows = []
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        last = runs[-1]
+        deps = sorted(((cum, name) for name, (_, cum) in last.items() if "." not in name and name != module), reverse=True)
+        rows.append({"module": module,
+                     "import_ms": round(statistics.median(r[module][1] for r in runs) / 1000, 1),
+                     "pandas": "pandas" in last,
+                     "slowest": ",".join(f"{name}:{cum / 1000:.0f}ms" for cum, name in deps[:args.top])})
+        print(" ".join(f"{k}={v}" for k, v in rows[-1].items()), flush=True)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Memory and speed of the default vs the compact network (config network_compact,
+Modules.network LinkTable / LinkView / CSRAdjacency) on a synthetic topology: traced memory
+of the built Network, build time, time for a batch of route queries and a short simulation,
+whose summary metrics must be identical in both modes.
+
+    python -m benchmarks.bench_network
+    python -m benchmarks.bench_network --nodes 25000 --m 4      # ~100k links
+"""
+import argparse, gc, time, tracemalloc
+
+def measure(config, topo, n_routes, seed):
+    import numpy as np
+    from Modules.engine import Simulator, build_network
+    from Modules.generator import iter_task_chunks_np
+    from Modules.taskio import task_dicts
+
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    net = build_network(config, topology=topo)
+    build_s = time.perf_counter() - t0
+    mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    rng = np.random.default_rng(seed)
+    nodes = list(net.nodes)
+    pairs = [(nodes[a], nodes[b]) for a, b in rng.integers(0, len(nodes), size=(n_routes, 2))]
+    t0 = time.perf_counter()
+    for a, b in pairs:
+        net.get_route(a, b)
+    route_s = time.perf_counter() - t0
+
+    tasks = (t for chunk in iter_task_chunks_np(config) for t in task_dicts(chunk))
+    sim = Simulator(config, tasks=tasks, network=net)
+    t0 = time.perf_counter()
+    metrics = sim.run()
+    sim_s = time.perf_counter() - t0
+    return {"links": len(net.links), "network_mb": round(mem / 2**20, 2), "build_s": round(build_s, 4),
+            "routes_s": round(route_s, 4), "sim_s": round(sim_s, 4), "events": sim.events_processed}, metrics
+
+
+def main(argv=None):
+    from Modules.engine import load_config
+    from Modules.topology import generate_topology
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default="config.yml")
+    ap.add_argument("--nodes", type=int, default=5000)
+    ap.add_argument("--m", type=int, default=4, help="barabasi_albert edges per new node")
+    ap.add_argument("--routes", type=int, default=200)
+    ap.add_argument("--tasks", type=int, default=5000)
+    ap.add_argument("--devices", type=int, default=200)
+    ap.add_argument("--servers", type=int, default=10)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args(argv)
+
+    topo = generate_topology("barabasi_albert", args.nodes, args.servers / args.nodes, args.seed, m=args.m)
+    rows, results = [], []
+    for compact in (False, True):
+        config = load_config(args.config, {"network_compact": compact, "num_tasks": args.tasks, "num_devices": args.devices,
+                                           "generator": "numpy", "routing": "shortest", "checkpoint_path": None, "cache_dir": None,
+                                           "task_log_flush_path": None})
+        row, metrics = measure(config, topo, args.routes, args.seed)
+        rows.append(dict(mode="compact" if compact else "default", **row))
+        results.append(metrics)
+        print(" ".join(f"{k}={v}" for k, v in rows[-1].items()), flush=True)
+    same = all(a == b or (a != a and b != b) for a, b in zip(results[0].values(), results[1].values()))
+    print("identical metrics:", same)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
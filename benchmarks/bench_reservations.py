@@ -0,0 +1,74 @@
+"""
+Microbenchmark: ReservationStore vs the old list-of-dicts reservations.
+Run from the repo root:  python -m benchmarks.bench_reservations [--sizes 1000 10000 ...]
+"""
+import argparse, random, time
+from Modules.reservations import ReservationStore
+
+class ListReservations:
+    # previous Link implementation, kept here as the reference
+    def __init__(self):
+        self.reservations = []
+
+    def add(self, start, finish, bits, task_id=None):
+        self.reservations.append({"start": start, "finish": finish, "bits": bits, "task_id": task_id})
+
+    def cleanup(self, now):
+        before = len(self.reservations)
+        self.reservations = [r for r in self.reservations if r["finish"] > now]
+        return before - len(self.reservations)
+
+    def bits_in_window(self, window_start, window_end):
+        s = 0.0
+        for r in self.reservations:
+            if r["finish"] <= window_start or r["start"] >= window_end:
+                continue
+            s += r["bits"]
+        return s
+
+
+def fill(store, n, rng):
+    # n active reservations started before t=0, all finishing after the measured window
+    for i in range(n):
+        start = -1.0 + i / n
+        store.add(start, 10.0 + rng.random(), 3.6e6 + rng.random() * 4e5, task_id=i)
+
+
+def admission_checks(store, queries, rng):
+    # per check: cleanup at now, window query, and one new reservation (as in can_transmit + reserve)
+    now = 0.0
+    total = 0.0
+    for _ in range(queries):
+        tt = 0.0036 + rng.random() * 0.0004
+        store.cleanup(now)
+        total += store.bits_in_window(now, now + tt)
+        store.add(now, now + tt, 3.6e6)
+        now += 0.0001
+    return total
+
+
+def bench(cls, n, queries, seed):
+    rng = random.Random(seed)
+    store = cls()
+    fill(store, n, rng)
+    t0 = time.perf_counter()
+    total = admission_checks(store, queries, rng)
+    return (time.perf_counter() - t0) / queries, total
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10**3, 10**4, 10**5, 10**6])
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    print(f"{'active':>9} {'list_us':>12} {'store_us':>10} {'speedup':>8}")
+    for n in args.sizes:
+        # the list scan is O(n) per check: keep its wall time bounded at 10^6
+        q = max(5, min(args.queries, args.queries * 10**4 // n))
+        t_list, s_list = bench(ListReservations, n, q, args.seed)
+        t_store, s_store = bench(ReservationStore, n, q, args.seed)
+        rel = abs(s_list - s_store) / max(abs(s_list), 1.0)
+        assert rel < 1e-9, f"window sums differ at n={n}: {s_list} vs {s_store}"
+        print(f"{n:>9} {t_list * 1e6:>12.1f} {t_store * 1e6:>10.1f} {t_list / t_store:>7.0f}x")
@@ -0,0 +1,134 @@
+"""
+Scaling matrix over topology size, device count and task count on synthetic topologies
+(Modules.topology). Each case runs in a fresh process and reports wall time, events/s,
+peak RSS and the share of the run spent in find_path and in reservation checks
+(can_transmit + reserve + cleanup, from Modules.profiling; timers are inclusive and add a
+little overhead to wall_s).
+
+    python -m benchmarks.bench_scaling                      # quick preset, prints rows
+    python -m benchmarks.bench_scaling --preset full --csv benchmarks/baseline_scaling.csv
+    python -m benchmarks.bench_scaling --compare benchmarks/baseline_scaling.csv
+
+The quick preset is the cartesian product of its axes; the full preset varies one axis at a
+time from the smallest case (20 -> 10k nodes, 200 -> 100k devices, 3k -> 10M tasks).
+--compare prints each case's wall time against the matching baseline row.
+"""
+import argparse, contextlib, csv, itertools, os, resource, tempfile, time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+PRESETS = {
+    "quick": {"nodes": [20, 200], "devices": [200, 2000], "tasks": [3000, 30000], "axes": False},
+    "full": {"nodes": [20, 200, 2000, 10000], "devices": [200, 2000, 20000, 100000],
+             "tasks": [3000, 30000, 300000, 3000000, 10000000], "axes": True},
+}
+KEY_COLUMNS = ["kind", "nodes", "devices", "tasks"]
+RESERVATION_PHASES = ["can_transmit", "reserve", "cleanup"]
+FLUSH_ABOVE = 1000000    # stream the task log to a temp file for cases with more tasks than this
+
+def run_case(kind, num_nodes, num_devices, num_tasks, blue_fraction, seed, config_path, overrides):
+    from Modules.engine import Simulator, build_network, load_config
+    from Modules.generator import iter_task_chunks_np
+    from Modules.profiling import Profiler
+    from Modules.taskio import task_dicts
+    from Modules.topology import generate_topology
+
+    with tempfile.TemporaryDirectory(prefix="bench_scaling_") as tmp:
+        config = load_config(config_path, dict(overrides, num_tasks=num_tasks, num_devices=num_devices,
+                                               task_seed=seed, checkpoint_path=None,
+                                               task_log_flush_path=os.path.join(tmp, "tasks.csv") if num_tasks > FLUSH_ABOVE else None))
+        topo = generate_topology(kind, num_nodes, blue_fraction, seed)
+        tasks = (t for chunk in iter_task_chunks_np(config, chunk_size=config.get("task_chunk_size", 100000))
+                 for t in task_dicts(chunk))
+        profiler = Profiler()
+        t0 = time.perf_counter()
+        sim = Simulator(config, tasks=tasks, network=build_network(config, topology=topo), profiler=profiler)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            sim.run()
+        wall = time.perf_counter() - t0
+
+    share = lambda phases: round(sum(profiler.time_s.get(p, 0.0) for p in phases) / wall, 4) if wall > 0 else 0.0
+    return {
+        "kind": kind,
+        "nodes": len(topo["nodes"]),
+        "devices": num_devices,
+        "tasks": num_tasks,
+        "links": len(topo["links"]),
+        "events": sim.events_processed,
+        "wall_s": round(wall, 4),
+        "events_per_s": round(sim.events_processed / wall, 1) if wall > 0 else float("inf"),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1),
+        "find_path_share": share(["find_path"]),
+        "reservation_share": share(RESERVATION_PHASES),
+    }
+
+
+def cases(nodes, devices, tasks, axes=False):
+    if not axes:
+        return list(itertools.product(nodes, devices, tasks))
+    base = (nodes[0], devices[0], tasks[0])
+    out = [base]
+    for axis, values in enumerate((nodes, devices, tasks)):
+        for v in values[1:]:
+            case = list(base)
+            case[axis] = v
+            out.append(tuple(case))
+    return out
+
+
+def load_baseline(path):
+    with open(path, newline="") as f:
+        return {tuple(str(r[k]) for k in KEY_COLUMNS): r for r in csv.DictReader(f)}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    ap.add_argument("--nodes", type=int, nargs="+", default=None)
+    ap.add_argument("--devices", type=int, nargs="+", default=None)
+    ap.add_argument("--tasks", type=int, nargs="+", default=None)
+    ap.add_argument("--axes", action="store_true", default=None,
+                    help="vary one axis at a time from the first values instead of the full product")
+    ap.add_argument("--kind", default="waxman", help="topology generator (waxman, barabasi_albert, fat_tree)")
+    ap.add_argument("--blue-fraction", type=float, default=0.25)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--config", default="config.yml")
+    ap.add_argument("--set", nargs="*", default=[], metavar="KEY=VALUE",
+                    help="config overrides, values parsed as YAML")
+    ap.add_argument("--csv", default=None, help="write the result rows to this CSV (e.g. a new baseline)")
+    ap.add_argument("--compare", default=None, help="baseline CSV to compare wall times against")
+    args = ap.parse_args(argv)
+
+    import yaml
+    overrides = {}
+    for kv in args.set:
+        k, v = kv.split("=", 1)
+        overrides[k] = yaml.safe_load(v)
+    preset = PRESETS[args.preset]
+    axes = preset["axes"] if args.axes is None else args.axes
+    matrix = cases(args.nodes or preset["nodes"], args.devices or preset["devices"], args.tasks or preset["tasks"], axes)
+    baseline = load_baseline(args.compare) if args.compare else {}
+
+    rows = []
+    for n_nodes, n_dev, n_tasks in matrix:
+        # fresh process per case so peak RSS is not inherited from earlier cases
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as ex:
+            row = ex.submit(run_case, args.kind, n_nodes, n_dev, n_tasks, args.blue_fraction,
+                            args.seed, args.config, overrides).result()
+        base = baseline.get(tuple(str(row[k]) for k in KEY_COLUMNS))
+        if base is not None:
+            row["baseline_wall_s"] = float(base["wall_s"])
+            row["speedup"] = round(float(base["wall_s"]) / row["wall_s"], 3) if row["wall_s"] > 0 else float("inf")
+        rows.append(row)
+        print(" ".join(f"{k}={v}" for k, v in row.items()), flush=True)
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=list(dict.fromkeys(k for r in rows for k in r)))
+            w.writeheader()
+            w.writerows(rows)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Load generator for the decision service (Modules.service / serve.py).
+Replays generated task descriptors over C concurrent connections and reports p50/p99
+decision latency and sustained requests/s.
+
+    python -m benchmarks.bench_service                          # starts a server in a child process
+    python -m benchmarks.bench_service --connect 127.0.0.1:8765 --connections 8 --rate 5000
+    python -m benchmarks.bench_service --inprocess              # asyncio.Queue, no sockets
+
+--rate 0 (default) is closed loop: each connection sends its next request when the previous
+answer arrives. --rate R paces the total offered load at R requests/s (open loop; latency
+includes queueing at the server).
+"""
+import argparse, asyncio, json, multiprocessing, time
+
+def _tasks(config, n):
+    """Exactly n generated task descriptors: the horizon (and num_tasks, same arrival rate) doubles until enough arrive."""
+    from Modules.generator import iter_task_chunks_np
+    from Modules.taskio import task_dicts
+    while True:
+        out = []
+        for chunk in iter_task_chunks_np(config, chunk_size=min(n, 100000)):
+            out.extend(task_dicts(chunk))
+            if len(out) >= n:
+                return out[:n]
+        config = dict(config, num_tasks=2 * config["num_tasks"], simulation_horizon_s=2 * config["simulation_horizon_s"])
+
+
+def _serve(config, port, ready):
+    from Modules.service import DecisionService
+    asyncio.run(DecisionService(config).serve("127.0.0.1", port, ready=lambda server: ready.set()))
+
+
+async def _connection(host, port, tasks, interval, t_start, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    for i, task in enumerate(tasks):
+        if interval:
+            delay = t_start + i * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        t0 = time.perf_counter()
+        writer.write(json.dumps(task).encode() + b"\n")
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - t0)
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+    writer.close()
+
+
+async def _socket_load(host, port, tasks, connections, rate):
+    latencies = []
+    parts = [tasks[k::connections] for k in range(connections)]
+    interval = connections / rate if rate else 0.0   # per-connection spacing
+    t_start = time.perf_counter()
+    await asyncio.gather(*(_connection(host, port, p, interval, t_start + k * interval / connections, latencies)
+                           for k, p in enumerate(parts)))
+    return latencies, time.perf_counter() - t_start
+
+
+async def _inprocess_load(config, tasks, connections, rate):
+    from Modules.service import DecisionService
+    service = DecisionService(config)
+    queue = asyncio.Queue()
+    server = asyncio.create_task(service.serve_queue(queue))
+    loop = asyncio.get_running_loop()
+    latencies = []
+    interval = connections / rate if rate else 0.0
+
+    async def client(part, t_first):
+        for i, task in enumerate(part):
+            if interval:
+                delay = t_first + i * interval - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            t0 = time.perf_counter()
+            fut = loop.create_future()
+            queue.put_nowait((task, fut))
+            await fut
+            latencies.append(time.perf_counter() - t0)
+
+    t_start = time.perf_counter()
+    await asyncio.gather(*(client(tasks[k::connections], t_start + k * interval / connections)
+                           for k in range(connections)))
+    wall = time.perf_counter() - t_start
+    queue.put_nowait(None)
+    await server
+    await service.stop()
+    return latencies, wall, service.rounds
+
+
+def main(argv=None):
+    from Modules.engine import load_config
+    from Modules.service import latency_summary
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default="config.yml")
+    ap.add_argument("--requests", type=int, default=20000)
+    ap.add_argument("--connections", type=int, default=4)
+    ap.add_argument("--rate", type=float, default=0.0, help="offered requests/s over all connections (0 = closed loop)")
+    ap.add_argument("--connect", default=None, metavar="HOST:PORT", help="load an already running serve.py")
+    ap.add_argument("--port", type=int, default=8799, help="port for the child-process server")
+    ap.add_argument("--inprocess", action="store_true", help="in-process queue instead of a socket")
+    args = ap.parse_args(argv)
+
+    config = load_config(args.config, {"checkpoint_path": None, "task_log_flush_path": None})
+    tasks = _tasks(dict(config, generator="numpy", num_tasks=max(args.requests, config["num_tasks"])), args.requests)
+
+    rounds = None
+    if args.inprocess:
+        latencies, wall, rounds = asyncio.run(_inprocess_load(config, tasks, args.connections, args.rate))
+    elif args.connect:
+        host, port = args.connect.rsplit(":", 1)
+        latencies, wall = asyncio.run(_socket_load(host, int(port), tasks, args.connections, args.rate))
+    else:
+        ready = multiprocessing.Event()
+        proc = multiprocessing.Process(target=_serve, args=(config, args.port, ready), daemon=True)
+        proc.start()
+        if not ready.wait(30):
+            raise RuntimeError("decision service did not start")
+        try:
+            latencies, wall = asyncio.run(_socket_load("127.0.0.1", args.port, tasks, args.connections, args.rate))
+        finally:
+            proc.terminate()
+            proc.join()
+
+    row = dict(latency_summary(latencies, wall), connections=args.connections, rate=args.rate,
+               mode="inprocess" if args.inprocess else "socket")
+    if rounds is not None:
+        row["controller_rounds"] = rounds
+    print(" ".join(f"{k}={v}" for k, v in row.items()))
+    return row
+
+
+if __name__ == "__main__":
+    main()
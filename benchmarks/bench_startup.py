@@ -0,0 +1,46 @@
+"""
+Start-up time with and without the workload / topology cache (config cache_dir,
+Modules.cache): time from config to the first arrival ready in a Simulator, for a cold
+run (empty cache: generate + write), a warm run (cache hit) and no cache at all.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --tasks 1000000 --nodes 2000 --generator numpy
+"""
+import argparse, os, tempfile, time
+
+def start(config):
+    from Modules.engine import Simulator
+    t0 = time.perf_counter()
+    sim = Simulator(config)
+    assert sim.next_task is not None
+    return time.perf_counter() - t0
+
+
+def main(argv=None):
+    from Modules.engine import load_config
+    from Modules.topology import generate_topology, save_topology
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default="config.yml")
+    ap.add_argument("--tasks", type=int, default=300000)
+    ap.add_argument("--devices", type=int, default=2000)
+    ap.add_argument("--nodes", type=int, default=500, help="synthetic waxman topology size (0 = config topology)")
+    ap.add_argument("--generator", default="numpy", choices=["python", "numpy"])
+    args = ap.parse_args(argv)
+
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="bench_startup_") as tmp:
+        overrides = {"num_tasks": args.tasks, "num_devices": args.devices, "generator": args.generator,
+                     "tasks_path": os.path.join(tmp, "tasks.json"), "checkpoint_path": None}
+        if args.nodes:
+            overrides["topology_path"] = os.path.join(tmp, "topology.json")
+            save_topology(generate_topology("waxman", args.nodes, 0.25, 42), overrides["topology_path"])
+        for run, cache_dir in (("no_cache", None), ("cold", os.path.join(tmp, "cache")), ("warm", os.path.join(tmp, "cache"))):
+            config = load_config(args.config, dict(overrides, cache_dir=cache_dir))
+            rows.append({"run": run, "tasks": args.tasks, "nodes": args.nodes, "startup_s": round(start(config), 4)})
+            print(" ".join(f"{k}={v}" for k, v in rows[-1].items()), flush=True)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
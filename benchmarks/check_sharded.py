@@ -0,0 +1,73 @@
+"""
+Validate the sharded engine (Modules.sharding) against the sequential one on small configs.
+With one shard the merged outputs must equal the sequential run's exactly. More shards run
+the approximate regional model (Modules.sharding.SHARDED_MODEL), not the sequential one:
+every task must still be logged exactly once and the summary metrics must stay within
+Modules.sharding.SHARD_TOLERANCE of the sequential run's (printed side by side); that holds
+for 2 shards on the default config, 3 or more fail it.
+    python -m benchmarks.check_sharded --shards 1 2 [--set num_tasks=20000 ...]
+"""
+import argparse, os, tempfile, time
+import pandas as pd
+
+def main(argv=None):
+    from Modules.engine import Simulator, load_config
+    from Modules.sharding import run_sharded, shard_deviations
+    from Modules.cache import build_workload
+    from Modules.taskio import iter_tasks
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--shards", type=int, nargs="+", default=[1, 2])
+    ap.add_argument("--config", default="config.yml")
+    ap.add_argument("--set", nargs="*", default=[], metavar="KEY=VALUE",
+                    help="config overrides, values parsed as YAML")
+    args = ap.parse_args(argv)
+
+    import yaml
+    overrides = {"task_log_flush_path": None, "checkpoint_path": None}
+    for kv in args.set:
+        k, v = kv.split("=", 1)
+        overrides[k] = yaml.safe_load(v)
+    config = load_config(args.config, overrides)
+
+    with tempfile.TemporaryDirectory(prefix="check_sharded_") as tmp:
+        seq_dir = os.path.join(tmp, "sequential")
+        os.makedirs(seq_dir)
+        t0 = time.perf_counter()
+        sim = Simulator(config, tasks=iter_tasks(build_workload(config, os.path.join(tmp, "workload")), "columnar"))
+        seq_metrics = sim.run()
+        sim.save(seq_dir)
+        rows = [dict(seq_metrics, run="sequential", wall_s=round(time.perf_counter() - t0, 3))]
+        seq_logs = pd.read_csv(os.path.join(seq_dir, "sim_task_logs.csv"))
+
+        ok = True
+        for n in args.shards:
+            out = os.path.join(tmp, f"shards_{n}")
+            t0 = time.perf_counter()
+            metrics = run_sharded(config, n, outdir=out)
+            rows.append(dict(metrics, run=f"{metrics['shards']} shards", wall_s=round(time.perf_counter() - t0, 3)))
+            logs = pd.read_csv(os.path.join(out, "sim_task_logs.csv"))
+            once = logs["task_id"].is_unique and set(logs["task_id"]) == set(seq_logs["task_id"])
+            ok &= once
+            if metrics["shards"] == 1:
+                for f in ("sim_task_logs.csv", "sim_metrics_summary.csv", "link_utilization.csv"):
+                    with open(os.path.join(seq_dir, f), "rb") as a, open(os.path.join(out, f), "rb") as b:
+                        same = a.read() == b.read()
+                    print(f"1 shard {f}: {'identical' if same else 'DIFFERENT'}")
+                    ok &= same
+                same = pd.read_csv(os.path.join(out, "weights.csv")).drop(columns="shard").equals(
+                    pd.read_csv(os.path.join(seq_dir, "weights.csv")))
+                print(f"1 shard weights.csv: {'identical' if same else 'DIFFERENT'}")
+                ok &= same
+            print(f"{metrics['shards']} shards: every task logged once: {once}")
+            off = shard_deviations(seq_metrics, metrics)
+            for k, (a, b) in off.items():
+                print(f"{metrics['shards']} shards: {k} {b:.6g} outside tolerance of sequential {a:.6g}")
+            ok &= not off
+
+    print(pd.DataFrame(rows).set_index("run").T.to_string())
+    return ok
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
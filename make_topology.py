@@ -0,0 +1,30 @@
+"""
+Write a synthetic topology in the Data/topology.json (node-link) format.
+
+    python make_topology.py --kind waxman --nodes 2000 --blue-fraction 0.1 --out Data/topology_2000.json
+    python make_topology.py --kind fat_tree --nodes 500     # smallest k-ary fat-tree with >= 500 switches
+
+Point topology_path in config.yml at the output to simulate on it.
+"""
+import argparse
+from Modules.topology import GENERATORS, generate_topology, save_topology
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--kind", choices=GENERATORS, default="waxman")
+    ap.add_argument("--nodes", type=int, default=20)
+    ap.add_argument("--blue-fraction", type=float, default=0.25, help="share of nodes that are fog servers")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--mean-degree", type=float, default=None, help="waxman")
+    ap.add_argument("--alpha", type=float, default=None, help="waxman")
+    ap.add_argument("--m", type=int, default=None, help="barabasi_albert: links per new node")
+    ap.add_argument("--k", type=int, default=None, help="fat_tree arity (overrides --nodes)")
+    ap.add_argument("--out", default="Data/topology_generated.json")
+    args = ap.parse_args()
+
+    params = {k: v for k, v in (("mean_degree", args.mean_degree), ("alpha", args.alpha),
+                                ("m", args.m), ("k", args.k)) if v is not None}
+    topo = generate_topology(args.kind, args.nodes, args.blue_fraction, args.seed, **params)
+    save_topology(topo, args.out)
+    n_blue = sum(1 for n in topo["nodes"] if n.get("color") == "blue")
+    print(f"{args.kind}: {len(topo['nodes'])} nodes ({n_blue} blue), {len(topo['links'])} links -> {args.out}")
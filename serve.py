@@ -0,0 +1,32 @@
+"""
+Online offloading decision service (Modules.service).
+
+    python serve.py --port 8765            # TCP, newline-delimited JSON
+    python serve.py --unix /tmp/offload.sock
+
+Send one task descriptor per line (task_id, device_id, size_kb, deadline_ms, ... as in
+Data/tasks.json); each gets a JSON line back: task_id, decision, server_node, path, sim_time_s.
+Load-test with: python -m benchmarks.bench_service --connect 127.0.0.1:8765
+"""
+import argparse, asyncio
+from Modules.engine import load_config
+from Modules.service import DecisionService
+from Modules.simlog import configure_logging
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default="config.yml")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--unix", default=None, help="serve on this Unix socket path instead of TCP")
+    ap.add_argument("--time-scale", type=float, default=None, help="simulated seconds per wall second")
+    args = ap.parse_args()
+
+    config = load_config(args.config, {"checkpoint_path": None})
+    configure_logging(config)
+    service = DecisionService(config, time_scale=args.time_scale)
+    ready = lambda server: print("listening on", args.unix or server.sockets[0].getsockname(), flush=True)
+    try:
+        asyncio.run(service.serve(args.host, args.port, unix_path=args.unix, ready=ready))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,38 @@
+"""
+Parallel parameter sweep over config.yml overrides.
+
+    python sweep.py --grid "learning_rate=[0.05, 0.1]" "fog_workers=[5, 10]" --workers 4
+    python sweep.py --spec sweep.yml
+
+A spec file may hold `grid: {key: [values]}` and/or `runs: [{key: value}, ...]`.
+Values are YAML, so dicts work too: --grid "initial_weights=[{w_local: 0.5, w_offload: 0.5}]"
+"""
+import argparse, os, yaml
+from Modules.engine import load_config
+from Modules.sweep import expand_grid, run_sweep
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default="config.yml")
+    ap.add_argument("--spec", default=None, help="YAML file with grid and/or runs")
+    ap.add_argument("--grid", nargs="*", default=[], metavar="KEY=[V1, V2]")
+    ap.add_argument("--workers", type=int, default=None, help="default: one per core")
+    ap.add_argument("--workdir", default=None, help="keep generated workloads here (default: temp dir)")
+    ap.add_argument("--out", default=os.path.join("Results", "sweep_summary.csv"))
+    args = ap.parse_args()
+
+    grid, runs = {}, []
+    if args.spec:
+        with open(args.spec, "r", encoding="utf-8") as f:
+            spec = yaml.safe_load(f) or {}
+        grid.update(spec.get("grid") or {})
+        runs.extend(spec.get("runs") or [])
+    for kv in args.grid:
+        k, v = kv.split("=", 1)
+        v = yaml.safe_load(v)
+        grid[k] = v if isinstance(v, list) else [v]
+
+    config = load_config(args.config)
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    df = run_sweep(config, expand_grid(grid, runs), workers=args.workers, workdir=args.workdir, out_path=args.out)
+    print(df.to_string(index=False))
@@ -0,0 +1,38 @@
+import pytest
+from Modules.cache import WORKLOAD_KEYS, workload_path
+from Modules.engine import load_config
+
+CHANGED = {
+    "generator": "python",
+    "task_seed": 7,
+    "num_tasks": 3001,
+    "num_devices": 201,
+    "simulation_horizon_s": 301,
+    "mean_task_size_kb": 451.0,
+    "std_task_size_kb": 51.0,
+}
+
+
+def _config(tmp_path, **overrides):
+    return load_config("config.yml", dict({"cache_dir": str(tmp_path), "generator": "numpy"}, **overrides))
+
+
+def test_changed_keys_cover_workload_keys():
+    assert set(CHANGED) == set(WORKLOAD_KEYS)
+
+
+@pytest.mark.parametrize("key", WORKLOAD_KEYS)
+def test_workload_setting_changes_cache_path(key, tmp_path):
+    config = _config(tmp_path)
+    assert config.get(key) != CHANGED[key]
+    assert workload_path(dict(config, **{key: CHANGED[key]})) != workload_path(config)
+
+
+def test_unrelated_setting_keeps_cache_path(tmp_path):
+    config = _config(tmp_path)
+    assert workload_path(dict(config, fog_workers=99, routing="first_fit", task_chunk_size=500)) == workload_path(config)
+
+
+def test_python_generator_ignores_task_seed(tmp_path):
+    config = _config(tmp_path, generator="python")
+    assert workload_path(dict(config, task_seed=7)) == workload_path(config)
@@ -0,0 +1,23 @@
+import filecmp
+from Modules.engine import Simulator, load_config
+from Modules.cache import build_workload
+from Modules.taskio import iter_tasks
+
+
+def test_metrics_midway_and_resume_match_uninterrupted_run(tmp_path):
+    config = load_config("config.yml", {"task_log_flush_path": None, "checkpoint_path": None, "cache_dir": None,
+                                        "metrics_interval_path": None})
+    workload = build_workload(config, str(tmp_path / "workload"))
+    full = Simulator(config, tasks=iter_tasks(workload, "columnar"))
+    expected = full.run()
+    full.save(str(tmp_path / "full"))
+
+    sim = Simulator(config, tasks=iter_tasks(workload, "columnar"))
+    sim.run(until=config["simulation_horizon_s"] * 0.45)
+    sim.metrics()
+    sim.checkpoint(str(tmp_path / "ck.pkl"))
+    resumed = Simulator.resume(str(tmp_path / "ck.pkl"), tasks=iter_tasks(workload, "columnar"))
+    assert resumed.run() == expected
+    resumed.save(str(tmp_path / "resumed"))
+    for f in ("metrics_intervals.csv", "sim_metrics_summary.csv", "sim_metrics_groups.csv", "sim_task_logs.csv"):
+        assert filecmp.cmp(tmp_path / "full" / f, tmp_path / "resumed" / f, shallow=False), f
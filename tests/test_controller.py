@@ -0,0 +1,31 @@
+import random
+import numpy as np
+import pytest
+from Modules.sdn_controller import SDNController, DeviceWeights
+from Modules.tasklog import CODES
+from benchmarks.bench_controller import LegacySDNController, random_round
+
+
+@pytest.mark.parametrize("num_devices, round_size, learning_rate", [(200, 100, 2.0), (20, 500, 0.1), (1000, 50, 40.0)])
+def test_update_round_matches_legacy_controller(num_devices, round_size, learning_rate):
+    config = {"learning_rate": learning_rate}
+    initial = {"w_local": 0.7, "w_offload": 0.3}
+    rng = random.Random(num_devices)
+    rounds = [random_round(rng, num_devices, round_size) for _ in range(50)]
+
+    legacy_w = {f"dev_{i}": dict(initial) for i in range(num_devices)}
+    legacy = LegacySDNController(legacy_w, config)
+    weights = DeviceWeights(num_devices, initial)
+    ctrl = SDNController(weights, config)
+    weights2 = DeviceWeights(num_devices, initial)
+    ctrl2 = SDNController(weights2, config)
+    for rs in rounds:
+        legacy.update_weights(rs)
+        ctrl.update_round(np.array([int(r["device_id"][4:]) for r in rs]),
+                          np.array([CODES["decision"][r["decision"]] for r in rs], dtype=np.int8),
+                          np.array([CODES["status"][r["status"]] for r in rs], dtype=np.int8))
+        ctrl2.update_weights(rs)
+
+    assert np.array_equal(weights.w_local, [legacy_w[f"dev_{i}"]["w_local"] for i in range(num_devices)])
+    assert np.array_equal(weights.w_offload, [legacy_w[f"dev_{i}"]["w_offload"] for i in range(num_devices)])
+    assert np.array_equal(weights2.w_local, weights.w_local) and np.array_equal(weights2.w_offload, weights.w_offload)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from Modules.engine import load_config
+from Modules.generator import FIXTURE_PATH, generate_tasks, iter_task_chunks_np
+
+
+def _workload(config, chunk_size):
+    chunks = list(iter_task_chunks_np(config, chunk_size=chunk_size))
+    return {c: np.concatenate([ch[c] for ch in chunks]) for c in chunks[0]}
+
+
+def test_numpy_workload_independent_of_chunk_size():
+    config = load_config("config.yml", {"num_tasks": 3000, "num_devices": 50})
+    ref = _workload(config, 100000)
+    for chunk_size in (1, 37, 500):
+        out = _workload(config, chunk_size)
+        for c in ref:
+            np.testing.assert_array_equal(out[c], ref[c], err_msg=f"{c} differs at chunk_size={chunk_size}")
+
+
+def test_numpy_chunks_sorted_and_sized():
+    config = load_config("config.yml", {"num_tasks": 3000, "num_devices": 50})
+    chunks = list(iter_task_chunks_np(config, chunk_size=256))
+    assert all(len(ch["device"]) == 256 for ch in chunks[:-1])
+    t = np.concatenate([ch["creation_time_s"] for ch in chunks])
+    assert np.all(np.diff(t) >= 0)
+    np.testing.assert_array_equal(t, np.round(t, 4))
+
+
+@pytest.mark.parametrize("generator", ["python", "numpy"])
+def test_generators_never_overwrite_the_fixture(generator):
+    with open(FIXTURE_PATH, "rb") as f:
+        before = f.read()
+    config = load_config("config.yml", {"generator": generator, "num_tasks": 100, "num_devices": 10})
+    with pytest.raises(ValueError):
+        generate_tasks(config, out_path=FIXTURE_PATH)
+    with open(FIXTURE_PATH, "rb") as f:
+        assert f.read() == before
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+from Modules.metrics import _log_metrics, _streamed_metrics
+from Modules.tasklog import TaskLog
+
+
+def _log(latencies):
+    log = TaskLog()
+    for i, lat in enumerate(latencies):
+        log.append(f"t{i}", "dev_0", "local", 0.0, 0.0, total_latency_ms=lat, deadline_ms=5.0,
+                   status="hit" if i % 3 else "drop")
+    return log
+
+
+def test_streamed_matches_in_memory_metrics():
+    # large mean, small spread: a sum-of-squares std would lose every significant digit
+    latencies = 1e7 + np.random.default_rng(0).random(10000)
+    log = _log(latencies)
+    frame = log.to_frame()
+    streamed = _streamed_metrics(frame.iloc[i:i + 777] for i in range(0, len(frame), 777))
+    expected = _log_metrics(log)
+    assert streamed.keys() == expected.keys()
+    for k, v in expected.items():
+        assert streamed[k] == pytest.approx(v, rel=1e-9, nan_ok=True), k
+    assert streamed["std_latency_ms"] == pytest.approx(np.std(latencies, ddof=1), rel=1e-9)
+
+
+def test_empty_log_metrics_agree():
+    streamed = _streamed_metrics([pd.DataFrame(columns=TaskLog().to_frame().columns)])
+    expected = _log_metrics(TaskLog())
+    assert np.isnan(expected["drop_rate"]) and np.isnan(expected["hit_rate"])
+    for k, v in expected.items():
+        assert streamed[k] == pytest.approx(v, nan_ok=True), k
@@ -0,0 +1,40 @@
+import numpy as np
+from Modules.online_metrics import LogSketch
+
+
+def test_sketch_quantiles_within_alpha():
+    rng = np.random.default_rng(0)
+    groups = rng.integers(0, 5, 20000)
+    values = rng.lognormal(0.0, 2.0, 20000)
+    sketch = LogSketch(alpha=0.01)
+    for lo in range(0, len(values), 3000):
+        sketch.add(groups[lo:lo + 3000], values[lo:lo + 3000], 5)
+    got = sketch.quantiles((0.5, 0.99))
+    for g in range(5):
+        v = np.sort(values[groups == g])
+        for j, q in enumerate((0.5, 0.99)):
+            exact = v[int(np.ceil(q * len(v))) - 1]
+            assert abs(got[g, j] - exact) <= 0.01 * exact
+
+
+def test_sketch_memory_follows_buckets_hit():
+    # one value per device over a wide range: a dense groups x buckets matrix would hold ~10^8 counts
+    n = 100000
+    rng = np.random.default_rng(1)
+    sketch = LogSketch(alpha=0.01)
+    sketch.add(np.arange(n), rng.lognormal(0.0, 3.0, n), n)
+    sketch.quantiles((0.5,))
+    assert len(sketch.keys) == n
+
+
+def test_sketch_merge_equals_single_sketch():
+    rng = np.random.default_rng(2)
+    a, b, both = LogSketch(), LogSketch(), LogSketch()
+    ga, va = rng.integers(0, 4, 5000), rng.exponential(3.0, 5000)
+    gb, vb = rng.integers(0, 3, 5000), rng.exponential(30.0, 5000)
+    a.add(ga, va, 4)
+    b.add(gb, vb, 3)
+    index = np.array([2, 0, 3])
+    both.add(np.concatenate([ga, index[gb]]), np.concatenate([va, vb]), 4)
+    a.merge(b, index)
+    assert np.array_equal(a.quantiles((0.5, 0.95)), both.quantiles((0.5, 0.95)))
@@ -0,0 +1,13 @@
+from Modules.engine import Simulator, load_config
+from Modules.profiling import Profiler
+
+
+def test_find_path_times_k_shortest_routes_once():
+    config = load_config("config.yml", {"checkpoint_path": None, "task_log_flush_path": None,
+                                        "metrics_interval_path": None, "routing": "least_loaded"})
+    sim = Simulator(config, tasks=[])
+    profiler = Profiler().attach(sim)
+    sim.network.route_cache.clear()
+    sim.network.k_shortest_routes(0, 5, k=3)     # calls get_route inside
+    assert profiler.calls["find_path"] == 1
+    assert profiler.time_s["find_path"] > 0.0
@@ -0,0 +1,54 @@
+import heapq
+import random
+import pytest
+from Modules.network import Network
+from Modules.topology import generate_topology
+
+
+def _network(seed, compact=False):
+    net = Network(generate_topology("waxman", 60, 0.25, seed), 1e9, 40e6, 0.001, compact=compact)
+    rng = random.Random(seed)
+    for link in net.links:
+        link.rtt_s = rng.uniform(0.0005, 0.005)
+    return net
+
+
+def _reference_yen(net, src, dst, k):
+    # Yen's algorithm with a plain Dijkstra per spur node
+    first = net._dijkstra(src, dst)
+    if first[0] is None:
+        return []
+    found, seen, candidates = [first], {tuple(map(id, first[1]))}, []
+    while len(found) < k:
+        prev_nodes, prev_links = found[-1]
+        for j in range(len(prev_nodes) - 1):
+            root = prev_nodes[:j + 1]
+            banned = {id(links[j]) for nodes, links in found if nodes[:j + 1] == root}
+            nodes, links = net._dijkstra(prev_nodes[j], dst, banned_nodes=set(root[:-1]), banned_links=banned)
+            if nodes is None:
+                continue
+            links = prev_links[:j] + links
+            if tuple(map(id, links)) not in seen:
+                seen.add(tuple(map(id, links)))
+                heapq.heappush(candidates, (sum(l.rtt_s for l in links), len(seen), root[:-1] + nodes, links))
+        if not candidates:
+            break
+        _, _, nodes, links = heapq.heappop(candidates)
+        found.append((nodes, links))
+    return found
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_k_shortest_routes_match_reference_yen(compact):
+    for seed in range(4):
+        net = _network(seed, compact)
+        rng = random.Random(seed)
+        nodes = list(net.nodes)
+        for _ in range(15):
+            src, dst = rng.sample(nodes, 2)
+            routes = net.k_shortest_routes(src, dst, k=4)
+            ref = _reference_yen(net, src, dst, 4)
+            assert [r.nodes for r in routes] == [n for n, _ in ref]
+            assert [r.rtt_s for r in routes] == pytest.approx([sum(l.rtt_s for l in links) for _, links in ref])
+            for r in routes:
+                assert len(set(r.nodes)) == len(r.nodes)
@@ -0,0 +1,44 @@
+import asyncio
+import pytest
+from Modules.engine import load_config
+from Modules.service import DecisionService
+
+
+@pytest.fixture
+def service():
+    config = load_config("config.yml", {"checkpoint_path": None, "task_log_flush_path": None,
+                                        "metrics_interval_path": None})
+    return DecisionService(config, time_scale=1000.0)
+
+
+def test_serve_queue_fails_only_the_bad_request(service):
+    async def run():
+        queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        bad, good = loop.create_future(), loop.create_future()
+        # size_kb of the wrong type blows up inside decide()
+        queue.put_nowait(({"task_id": "t0", "device_id": "dev_0", "size_kb": "x", "deadline_ms": 5.0}, bad))
+        queue.put_nowait(({"task_id": "t1", "device_id": "dev_0", "size_kb": 10.0, "deadline_ms": 5.0}, good))
+        queue.put_nowait(None)
+        await service.serve_queue(queue)
+        await service.stop()
+        with pytest.raises(TypeError):
+            bad.result()
+        return good.result()
+
+    out = asyncio.run(run())
+    assert out["task_id"] == "t1" and "decision" in out
+
+
+def test_service_log_stays_bounded():
+    config = load_config("config.yml", {"checkpoint_path": None, "task_log_flush_path": None,
+                                        "metrics_interval_path": None, "round_size": 20,
+                                        "service_log_rows": 50, "service_keep_intervals": 2})
+    service = DecisionService(config, time_scale=1000.0)
+    for i in range(1000):
+        service.decide({"task_id": f"t{i}", "device_id": f"dev_{i % 200}", "size_kb": 10.0, "deadline_ms": 5.0})
+        assert service.sim.task_log.n < 50 + 20
+        assert len(service.sim.online.intervals) <= 2
+    service.sim.online.feed(service.sim.task_log, service.sim.now)
+    assert len(service.sim.task_log) == 1000
+    assert service.sim.online.summary()["num_tasks"] == 1000
@@ -0,0 +1,44 @@
+import os
+import pandas as pd
+import pytest
+from Modules.engine import Simulator, load_config
+from Modules.sharding import SHARDED_MODEL, run_sharded, shard_deviations
+from Modules.cache import build_workload
+from Modules.taskio import iter_tasks
+
+
+@pytest.fixture(scope="module")
+def sequential(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("sequential")
+    config = load_config("config.yml", {"task_log_flush_path": None, "checkpoint_path": None, "cache_dir": None,
+                                        "metrics_interval_path": None})
+    sim = Simulator(config, tasks=iter_tasks(build_workload(config, str(tmp / "workload")), "columnar"))
+    metrics = sim.run()
+    sim.save(str(tmp))
+    return config, metrics, tmp
+
+
+def test_one_shard_equals_sequential(sequential, tmp_path):
+    config, _, seq_dir = sequential
+    run_sharded(config, 1, outdir=str(tmp_path))
+    for f in ("sim_task_logs.csv", "sim_metrics_summary.csv", "link_utilization.csv"):
+        with open(seq_dir / f, "rb") as a, open(tmp_path / f, "rb") as b:
+            assert a.read() == b.read(), f
+
+
+def test_two_shards_within_tolerance(sequential, tmp_path):
+    config, seq_metrics, seq_dir = sequential
+    metrics = run_sharded(config, 2, outdir=str(tmp_path))
+    logs = pd.read_csv(os.path.join(tmp_path, "sim_task_logs.csv"))
+    seq_logs = pd.read_csv(seq_dir / "sim_task_logs.csv")
+    assert logs["task_id"].is_unique and set(logs["task_id"]) == set(seq_logs["task_id"])
+    assert shard_deviations(seq_metrics, metrics) == {}
+    assert pd.read_csv(tmp_path / "sim_metrics_summary.csv")["model"].tolist() == [SHARDED_MODEL]
+
+
+def test_four_shards_outside_tolerance(sequential, tmp_path):
+    # four regions are a different model: the check must catch it
+    config, seq_metrics, _ = sequential
+    metrics = run_sharded(config, 4, outdir=str(tmp_path))
+    assert metrics["model"] == SHARDED_MODEL
+    assert "avg_queue_delay_ms" in shard_deviations(seq_metrics, metrics)
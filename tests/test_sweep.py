@@ -0,0 +1,32 @@
+import json
+import pytest
+from Modules.engine import Simulator, load_config, with_overrides
+from Modules.sweep import run_path, run_sweep
+
+
+@pytest.fixture
+def chain_topology(tmp_path):
+    with open("Data/topology.json") as f:
+        topo = json.load(f)
+    ids = [n["id"] for n in topo["nodes"]]
+    topo["links"] = [{"source": a, "target": b} for a, b in zip(ids, ids[1:])]
+    path = tmp_path / "chain.json"
+    path.write_text(json.dumps(topo))
+    return str(path)
+
+
+def test_runs_use_their_own_topology_and_outputs(chain_topology, tmp_path):
+    config = load_config("config.yml", {"num_tasks": 500, "cache_dir": None, "task_log_flush_path": None,
+                                        "checkpoint_path": None,
+                                        "metrics_interval_path": str(tmp_path / "intervals.csv")})
+    runs = [{"topology_path": "Data/topology.json"}, {"topology_path": chain_topology}]
+    df = run_sweep(config, runs, workers=2, workdir=str(tmp_path / "work"))
+
+    for i, overrides in enumerate(runs):
+        cfg = with_overrides(config, dict(overrides, metrics_interval_path=None))
+        expected = Simulator(cfg).run()
+        row = df[df["run"] == i].iloc[0]
+        assert row["avg_tx_delay_ms"] == pytest.approx(expected["avg_tx_delay_ms"])
+        assert (tmp_path / f"intervals_run{i}.csv").exists()
+    assert df["avg_tx_delay_ms"].iloc[0] != df["avg_tx_delay_ms"].iloc[1]
+    assert run_path("Results/run.prof", 3) == "Results/run_run3.prof"
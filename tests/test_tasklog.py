@@ -0,0 +1,16 @@
+import pytest
+from Modules.tasklog import TaskLog
+
+
+def test_parquet_flush_keeps_types_of_missing_columns(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    log = TaskLog(flush_path=str(tmp_path / "log.parquet"))
+    # first chunk: drop_reason / tier / server_node all missing
+    log.append("t0", "dev_0", "local", 0.0, 0.0, status="hit")
+    log.flush()
+    log.append("t1", "dev_1", "offload", 0.1, 0.1, status="drop", drop_reason="deadline_miss", tier="fog", server_node=3)
+    log.flush()
+    log.close()
+    df = pq.read_table(log.flush_path).to_pandas()
+    assert df["drop_reason"].tolist()[1] == "deadline_miss" and df["tier"].tolist()[1] == "fog"
+    assert df["server_node"].tolist()[1] == 3.0
@@ -0,0 +1,14 @@
+import numpy as np
+import pytest
+from Modules.topology import generate_topology
+
+
+@pytest.mark.parametrize("n_nodes", [20, 50, 200, 1000])
+def test_waxman_mean_degree_calibrated(n_nodes):
+    degrees = [2 * len(generate_topology("waxman", n_nodes, 0.25, seed)["links"]) / n_nodes for seed in range(8)]
+    assert abs(np.mean(degrees) - 4.0) < 0.3
+
+
+def test_waxman_no_self_loops():
+    topo = generate_topology("waxman", 50, 0.25, 1)
+    assert all(l["source"] != l["target"] for l in topo["links"])